@@ -1,10 +1,10 @@
-"""
-Backend Package
-
-Semantic Search API Backend
-
-This package contains the complete backend implementation for the
-franchise semantic search API.
-"""
-
-__version__ = "3.0.0-gcp"
+"""
+Backend Package
+
+Semantic Search API Backend
+
+This package contains the complete backend implementation for the
+franchise semantic search API.
+"""
+
+__version__ = "3.0.0-gcp"
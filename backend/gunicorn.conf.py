@@ -0,0 +1,39 @@
+"""
+Gunicorn Configuration for the Franchise Search API
+
+Production server settings. The app is preloaded in the master process so the
+ModelManager (USE + FAISS + TF-IDF) is initialized once and shared copy-on-write
+with every forked worker. Workers use the threaded (gthread) class because a
+search request mixes blocking model calls with Python-level post-processing.
+
+A single worker is the default everywhere: admin listing mutations and the
+admin job registry live in the worker process that served the request, and
+other workers only re-read dataset.json after a model reload. Concurrency
+comes from threads; only raise GUNICORN_WORKERS for read-only deployments.
+
+Environment Variables:
+    PORT: Port to bind (default: 8080)
+    GUNICORN_WORKERS: Number of worker processes (default: 1)
+    GUNICORN_THREADS: Threads per worker (default: 16 on Cloud Run, otherwise 8)
+    GUNICORN_TIMEOUT: Worker timeout in seconds (default: 300, as before;
+        covers the first request on a cold container)
+
+Example:
+    Run from the repository root:
+        $ gunicorn -c backend/gunicorn.conf.py backend.main:app
+"""
+
+import os
+
+# Cloud Run containers get a single vCPU by default: more threads per worker
+_is_cloud_run = os.getenv('DEPLOYMENT_ENV') == 'cloud-run' or os.getenv('K_SERVICE') is not None
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = 'gthread'
+# Admin mutations and job status are per process, see the module docstring
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16 if _is_cloud_run else 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+
+# Load models once in the master; workers inherit them via fork
+preload_app = True
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Out-of-process model retraining.
+
+Runs next to the API (sidecar process, cron, or Cloud Run Job) so that
+retraining never stalls request threads:
+- Reload dataset.json when it changes
+- Retrain models when the data differs from what they were trained on
+- Save them to MODELS_DIR (each file replaced atomically, metadata.json last)
+  and upload to GCS if enabled
+
+API workers notice the new metadata.json within MODEL_RELOAD_INTERVAL
+seconds and swap the models in (ModelManager.reload_if_updated).
+
+Usage:
+  python -m backend.scripts.retrain_worker            # poll every CHECK_INTERVAL seconds
+  python -m backend.scripts.retrain_worker --once     # single check (cron / Cloud Run Job)
+  python -m backend.scripts.retrain_worker --force --once
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a script from repo root
+THIS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = THIS_DIR.parent
+if str(BACKEND_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR.parent))
+
+from backend.src.core.config import config
+from backend.src.models.model_manager import ModelManager
+from backend.src.services.data_service import DataService
+from backend.src.utils.logging import setup_logging
+
+logger = logging.getLogger("retrain_worker")
+
+
+def trained_data_hash() -> str:
+    """Data hash recorded with the models currently saved in MODELS_DIR."""
+    try:
+        with open(config.METADATA_PATH, 'r') as f:
+            return json.load(f).get('data_hash')
+    except (OSError, ValueError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Retrain models when the dataset changes")
+    parser.add_argument("--once", action="store_true", help="check once and exit")
+    parser.add_argument("--force", action="store_true", help="retrain on the first check even if unchanged")
+    parser.add_argument("--interval", type=int, default=config.CHECK_INTERVAL,
+                        help="seconds between checks (default: CHECK_INTERVAL)")
+    args = parser.parse_args()
+
+    setup_logging(level=logging.DEBUG if config.DEBUG else logging.INFO)
+
+    ds = DataService(config.DATA_PATH)
+    if not ds.load_data():
+        raise SystemExit("Failed to load dataset")
+
+    mm = ModelManager()
+    force = args.force
+
+    while True:
+        if ds.has_changed():
+            logger.info("Dataset changed, reloading...")
+            ds.load_data()
+
+        if force or ds.data_hash != trained_data_hash():
+            logger.info(f"Retraining models on {len(ds.listings)} listings...")
+            mm.metadata['data_hash'] = ds.data_hash
+            mm.initialize_models(ds.get_all_texts())
+            force = False
+        else:
+            logger.info("Models are up to date")
+
+        if args.once:
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,15 @@
-"""
-Backend Source Package
-
-This package contains the core backend implementation for the Semantic Search API.
-
-Modules:
-    api: API routes and endpoints
-    core: Core configuration and utilities
-    models: Machine learning model management
-    services: Business logic services
-    utils: Utility functions and helpers
-"""
-
-__version__ = "3.0.0-gcp"
-__author__ = "Anand"
+"""
+Backend Source Package
+
+This package contains the core backend implementation for the Semantic Search API.
+
+Modules:
+    api: API routes and endpoints
+    core: Core configuration and utilities
+    models: Machine learning model management
+    services: Business logic services
+    utils: Utility functions and helpers
+"""
+
+__version__ = "3.0.0-gcp"
+__author__ = "Anand"
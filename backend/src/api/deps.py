@@ -1,131 +1,226 @@
-"""
-API Dependencies Module
-
-This module contains shared dependencies, decorators, and middleware
-used across API routes.
-
-Functions:
-    timing_decorator: Decorator to measure endpoint execution time.
-    error_handler: Decorator for consistent error handling.
-    require_ready: Decorator to check system initialization status.
-
-Example:
-    >>> from backend.src.api.deps import require_ready, error_handler
-    >>> @require_ready
-    ... @error_handler
-    ... def my_endpoint():
-    ...     return {"status": "ok"}
-"""
-
-import logging
-from functools import wraps
-from flask import jsonify, request
-from typing import Callable, Any
-
-from ..core.config import config
-
-logger = logging.getLogger(__name__)
-
-# Global state (will be set by main.py)
-system_ready = False
-initialization_error = None
-
-
-def error_handler(f: Callable) -> Callable:
-    """
-    Decorator for consistent error handling across API endpoints.
-    
-    This decorator wraps endpoint functions to catch and handle exceptions,
-    returning appropriate HTTP error responses with consistent formatting.
-    
-    Args:
-        f (Callable): The endpoint function to wrap.
-    
-    Returns:
-        Callable: Wrapped function with error handling.
-        
-    Example:
-        >>> @error_handler
-        ... def my_endpoint():
-        ...     raise ValueError("Invalid input")
-        # Returns: ({"error": "Invalid input", "type": "validation"}, 400)
-    """
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        try:
-            return f(*args, **kwargs)
-        except ValueError as e:
-            logger.error(f"ValueError: {e}")
-            return jsonify({"error": str(e), "type": "validation"}), 400
-        except Exception as e:
-            logger.error(f"Error: {e}", exc_info=True)
-            return jsonify({"error": "Internal server error", "details": str(e)}), 500
-    return wrapper
-
-
-def require_ready(f: Callable) -> Callable:
-    """
-    Decorator to ensure system is initialized before processing requests.
-    
-    This decorator checks if the system has completed initialization before
-    allowing the endpoint to execute. Returns 503 Service Unavailable if
-    the system is still initializing or if initialization failed.
-    
-    Args:
-        f (Callable): The endpoint function to wrap.
-    
-    Returns:
-        Callable: Wrapped function with readiness check.
-        
-    Example:
-        >>> @require_ready
-        ... def search_endpoint():
-        ...     return {"results": [...]}
-        # Returns 503 if system not ready, otherwise executes normally
-    """
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        if not system_ready:
-            msg = "System initializing. Please retry in a few seconds."
-            if initialization_error:
-                msg = f"System initialization failed: {initialization_error}"
-            return jsonify({"error": msg}), 503
-        return f(*args, **kwargs)
-    return wrapper
-
-
-def require_admin(f: Callable) -> Callable:
-    """
-    Decorator to require an admin API key for sensitive endpoints.
-
-    Uses header: X-Admin-API-Key
-    Configured via env var: ADMIN_API_KEY
-    """
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        if not config.ADMIN_API_KEY:
-            return jsonify({"error": "Admin endpoints are disabled"}), 401
-
-        provided = request.headers.get('X-Admin-API-Key', '')
-        if provided != config.ADMIN_API_KEY:
-            return jsonify({"error": "Unauthorized"}), 401
-
-        return f(*args, **kwargs)
-
-    return wrapper
-
-
-def set_system_state(ready: bool, error: str = None) -> None:
-    """
-    Set the global system state.
-    
-    This function is called by the main application to update the system
-    readiness status and any initialization errors.
-    
-    Args:
-        ready (bool): Whether the system is ready to serve requests.
-        error (str, optional): Error message if initialization failed.
-    """
-    global system_ready, initialization_error
-    system_ready = ready
-    initialization_error = error
+"""
+API Dependencies Module
+
+This module contains shared dependencies, decorators, and middleware
+used across API routes.
+
+Functions:
+    timing_decorator: Decorator to measure endpoint execution time.
+    error_handler: Decorator for consistent error handling.
+    require_ready: Decorator to check system initialization status.
+    require_admin: Decorator to require the admin API key.
+    endpoint: Fused admin/readiness checks, timing and error handling in one wrapper.
+
+Example:
+    >>> from backend.src.api.deps import require_ready, error_handler
+    >>> @require_ready
+    ... @error_handler
+    ... def my_endpoint():
+    ...     return {"status": "ok"}
+"""
+
+import hmac
+import time
+import logging
+import orjson
+from functools import wraps
+from flask import request, Response
+from typing import Callable, Any, Optional
+
+from ..core.config import config
+from ..utils.serialization import ojsonify
+
+logger = logging.getLogger(__name__)
+
+# Global state (will be set by main.py)
+system_ready = False
+initialization_error = None
+
+
+def _not_ready_payload(error: Optional[str]) -> bytes:
+    """Serialized 503 body for the current initialization state."""
+    msg = "System initializing. Please retry in a few seconds."
+    if error:
+        msg = f"System initialization failed: {error}"
+    return orjson.dumps({"error": msg})
+
+
+# 503 body, re-serialized only when the system state changes
+_not_ready_body = _not_ready_payload(None)
+
+
+def _admin_denied() -> Optional[tuple]:
+    """
+    Check the X-Admin-API-Key header against ADMIN_API_KEY.
+    
+    The comparison is constant-time (hmac.compare_digest), so response
+    timing does not reveal how much of a guessed key was right.
+    
+    Returns:
+        Optional[tuple]: A 401 response if the request is not authorized, else None.
+    """
+    if not config.ADMIN_API_KEY:
+        return ojsonify({"error": "Admin endpoints are disabled"}), 401
+    
+    provided = request.headers.get('X-Admin-API-Key', '')
+    if not hmac.compare_digest(provided.encode(), config.ADMIN_API_KEY.encode()):
+        return ojsonify({"error": "Unauthorized"}), 401
+    return None
+
+
+def error_handler(f: Callable) -> Callable:
+    """
+    Decorator for consistent error handling across API endpoints.
+    
+    This decorator wraps endpoint functions to catch and handle exceptions,
+    returning appropriate HTTP error responses with consistent formatting.
+    
+    Args:
+        f (Callable): The endpoint function to wrap.
+    
+    Returns:
+        Callable: Wrapped function with error handling.
+        
+    Example:
+        >>> @error_handler
+        ... def my_endpoint():
+        ...     raise ValueError("Invalid input")
+        # Returns: ({"error": "Invalid input", "type": "validation"}, 400)
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except ValueError as e:
+            logger.error(f"ValueError: {e}")
+            return ojsonify({"error": str(e), "type": "validation"}), 400
+        except Exception as e:
+            logger.error(f"Error: {e}", exc_info=True)
+            return ojsonify({"error": "Internal server error", "details": str(e)}), 500
+    return wrapper
+
+
+def require_ready(f: Callable) -> Callable:
+    """
+    Decorator to ensure system is initialized before processing requests.
+    
+    This decorator checks if the system has completed initialization before
+    allowing the endpoint to execute. Returns 503 Service Unavailable if
+    the system is still initializing or if initialization failed.
+    
+    Args:
+        f (Callable): The endpoint function to wrap.
+    
+    Returns:
+        Callable: Wrapped function with readiness check.
+        
+    Example:
+        >>> @require_ready
+        ... def search_endpoint():
+        ...     return {"results": [...]}
+        # Returns 503 if system not ready, otherwise executes normally
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not system_ready:
+            return Response(_not_ready_body, status=503, mimetype='application/json')
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def endpoint(
+    f: Optional[Callable] = None,
+    *,
+    ready: bool = True,
+    admin: bool = False,
+    timed: bool = False
+) -> Callable:
+    """
+    Fused endpoint decorator: admin check, readiness check, optional timing
+    and error handling in a single wrapper frame.
+    
+    Equivalent to stacking @error_handler, @require_admin (if admin),
+    @timing_decorator (if timed) and @require_ready (if ready), without the
+    per-layer call overhead on every request. Checks run in that order: an
+    unauthorized request gets 401 even while the system is initializing.
+    
+    Args:
+        f (Callable, optional): The endpoint function (when used without arguments).
+        ready (bool, optional): Return 503 until the system is initialized. Defaults to True.
+        admin (bool, optional): Require the X-Admin-API-Key header. Defaults to False.
+        timed (bool, optional): Log the execution time (at INFO level; not
+            measured when INFO is disabled). Defaults to False.
+    
+    Returns:
+        Callable: Wrapped endpoint function.
+    
+    Example:
+        >>> @endpoint(timed=True)
+        ... def search_endpoint():
+        ...     return {"results": [...]}
+        >>> @endpoint(admin=True)
+        ... def admin_endpoint():
+        ...     return {"status": "ok"}
+    """
+    def decorate(func: Callable) -> Callable:
+        name = func.__name__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if admin:
+                denied = _admin_denied()
+                if denied is not None:
+                    return denied
+            if ready and not system_ready:
+                return Response(_not_ready_body, status=503, mimetype='application/json')
+            # Only timed while INFO logging is enabled, like timing_decorator
+            start = time.perf_counter_ns() if timed and logger.isEnabledFor(logging.INFO) else 0
+            try:
+                return func(*args, **kwargs)
+            except ValueError as e:
+                logger.error(f"ValueError: {e}")
+                return ojsonify({"error": str(e), "type": "validation"}), 400
+            except Exception as e:
+                logger.error(f"Error: {e}", exc_info=True)
+                return ojsonify({"error": "Internal server error", "details": str(e)}), 500
+            finally:
+                if start:
+                    logger.info("%s took %.3fs", name, (time.perf_counter_ns() - start) / 1e9)
+        return wrapper
+    
+    return decorate(f) if f is not None else decorate
+
+
+def require_admin(f: Callable) -> Callable:
+    """
+    Decorator to require an admin API key for sensitive endpoints.
+
+    Uses header: X-Admin-API-Key
+    Configured via env var: ADMIN_API_KEY
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        denied = _admin_denied()
+        if denied is not None:
+            return denied
+
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def set_system_state(ready: bool, error: str = None) -> None:
+    """
+    Set the global system state.
+    
+    This function is called by the main application to update the system
+    readiness status and any initialization errors.
+    
+    Args:
+        ready (bool): Whether the system is ready to serve requests.
+        error (str, optional): Error message if initialization failed.
+    """
+    global system_ready, initialization_error, _not_ready_body
+    _not_ready_body = _not_ready_payload(error)
+    system_ready = ready
+    initialization_error = error
@@ -1,531 +1,611 @@
-"""
-API Routes Module
-
-This module defines all API endpoints for the Semantic Search API.
-
-Endpoints:
-    GET /api/health - System health check
-    GET /api/search - Hybrid search
-    GET /api/recommend/<id> - Get recommendations
-    GET /api/autocomplete - Autocomplete suggestions
-    GET /api/filters - Get available filters
-    GET /api/listings - Get all listings with pagination
-    GET /api/admin/storage-info - Storage information
-    POST /api/admin/retrain - Trigger model retraining
-    GET / - API information
-
-Example:
-    >>> from backend.src.api.routes import create_routes
-    >>> app = Flask(__name__)
-    >>> create_routes(app, model_manager, data_service, search_service)
-"""
-
-import logging
-from datetime import datetime, UTC
-from flask import request, jsonify, Blueprint
-from typing import Any, Dict
-
-from ..core.config import config
-from ..utils.timing import timing_decorator
-from .deps import error_handler, require_ready, require_admin
-
-logger = logging.getLogger(__name__)
-
-# Create blueprint for API routes
-api_bp = Blueprint('api', __name__)
-
-# Global service instances (will be set by main.py)
-model_manager = None
-data_service = None
-search_service = None
-
-
-def init_routes(mm, ds, ss):
-    """
-    Initialize routes with service instances.
-    
-    Args:
-        mm: ModelManager instance
-        ds: DataService instance
-        ss: SearchService instance
-    """
-    global model_manager, data_service, search_service
-    model_manager = mm
-    data_service = ds
-    search_service = ss
-
-
-@api_bp.route('/health', methods=['GET'])
-@error_handler
-def health() -> tuple[Dict[str, Any], int]:
-    """
-    System health check endpoint.
-    
-    Returns system status, version information, deployment details,
-    model status, and data statistics.
-    
-    Returns:
-        tuple: JSON response and HTTP status code.
-        
-    Example Response:
-        {
-            "status": "healthy",
-            "timestamp": "2024-01-25T10:30:00Z",
-            "version": "3.0.0-gcp",
-            "deployment": {...},
-            "models": {...},
-            "data": {...}
-        }
-    """
-    from .deps import system_ready
-    
-    storage_info = model_manager.get_storage_info() if model_manager else {}
-    
-    return jsonify({
-        "status": "healthy" if system_ready else "initializing",
-        "timestamp": datetime.now(UTC).isoformat(),
-        "version": "3.0.0-gcp",
-        "deployment": {
-            "environment": config.DEPLOYMENT_ENV,
-            "is_cloud_run": config.is_cloud_run(),
-            "storage_type": config.STORAGE_TYPE
-        },
-        "models": {
-            "use": "loaded" if model_manager.use_model else "not loaded",
-            "tfidf": "loaded" if model_manager.tfidf_vectorizer else "not loaded",
-            "faiss": model_manager.faiss_index.ntotal if model_manager.faiss_index else 0
-        },
-        "data": {
-            "listings": len(data_service.listings),
-            "sectors": len(data_service.metadata['sectors']),
-            "tags": len(data_service.metadata['tags']),
-            "locations": len(data_service.metadata['locations'])
-        },
-        "storage": storage_info
-    })
-
-
-@api_bp.route('/search', methods=['GET'])
-@error_handler
-@timing_decorator
-@require_ready
-def search() -> tuple[Dict[str, Any], int]:
-    """
-    Hybrid search endpoint combining semantic and keyword search.
-    
-    Query Parameters:
-        q (str, required): Search query string.
-        top_n (int, optional): Number of results to return (default: 10, max: 50).
-        semantic_weight (float, optional): Weight for semantic search 0-1 (default: 0.6).
-        sector (str, optional): Filter by sector.
-        location (str, optional): Filter by location.
-        tags (str, optional): Comma-separated tags to filter by.
-    
-    Returns:
-        tuple: JSON response with search results and HTTP status code.
-        
-    Example Response:
-        {
-            "query": "coffee franchise",
-            "results": [{...}, {...}],
-            "total": 10,
-            "timestamp": "2024-01-25T10:30:00Z"
-        }
-    """
-    query = request.args.get('q', '').strip()
-    if not query:
-        return jsonify({"error": "Query 'q' required"}), 400
-    
-    top_n = min(int(request.args.get('top_n', config.DEFAULT_TOP_N)), config.MAX_TOP_N)
-    semantic_weight = float(request.args.get('semantic_weight', config.SEMANTIC_WEIGHT))
-    
-    results = search_service.hybrid_search(query, top_n * 2, semantic_weight)
-    
-    # Apply filters
-    sector = request.args.get('sector')
-    location = request.args.get('location')
-    tags = request.args.get('tags', '').split(',') if request.args.get('tags') else None
-    
-    if sector or location or tags:
-        filtered = []
-        for r in results:
-            if sector and r.get('sector', '').lower() != sector.lower():
-                continue
-            if location and location.lower() not in r.get('location', '').lower():
-                continue
-            if tags and not any(t.lower() in [x.lower() for x in r.get('tags', [])] for t in tags):
-                continue
-            filtered.append(r)
-        results = filtered[:top_n]
-    else:
-        results = results[:top_n]
-    
-    return jsonify({
-        "query": query,
-        "results": results,
-        "total": len(results),
-        "timestamp": datetime.now(UTC).isoformat()
-    })
-
-
-@api_bp.route('/recommend/<int:listing_id>', methods=['GET'])
-@error_handler
-@timing_decorator
-@require_ready
-def recommend(listing_id: int) -> tuple[Dict[str, Any], int]:
-    """
-    Get franchise recommendations based on a listing ID.
-    
-    Path Parameters:
-        listing_id (int): ID of the listing to get recommendations for.
-    
-    Query Parameters:
-        top_n (int, optional): Number of recommendations (default: 5, max: 20).
-        sector_filter (bool, optional): Filter to same sector (default: true).
-    
-    Returns:
-        tuple: JSON response with recommendations and HTTP status code.
-        
-    Example Response:
-        {
-            "listing_id": 42,
-            "recommendations": [{...}, {...}],
-            "total": 5,
-            "timestamp": "2024-01-25T10:30:00Z"
-        }
-    """
-    top_n = min(int(request.args.get('top_n', 5)), 20)
-    sector_filter = request.args.get('sector_filter', 'true').lower() == 'true'
-    
-    results = search_service.get_recommendations(listing_id, top_n, sector_filter)
-    
-    return jsonify({
-        "listing_id": listing_id,
-        "recommendations": results,
-        "total": len(results),
-        "timestamp": datetime.now(UTC).isoformat()
-    })
-
-
-@api_bp.route('/autocomplete', methods=['GET'])
-@error_handler
-@require_ready
-def autocomplete() -> tuple[Dict[str, Any], int]:
-    """
-    Autocomplete suggestions endpoint.
-    
-    Query Parameters:
-        q (str, required): Partial query string.
-        max (int, optional): Maximum suggestions to return (default: 8, max: 20).
-    
-    Returns:
-        tuple: JSON response with suggestions and HTTP status code.
-        
-    Example Response:
-        {
-            "query": "cof",
-            "suggestions": [
-                {"text": "Coffee Shop", "type": "title", "category": "Food & Beverage"},
-                ...
-            ],
-            "total": 5
-        }
-    """
-    query = request.args.get('q', '').strip()
-    if not query:
-        return jsonify([])
-    
-    max_suggestions = min(int(request.args.get('max', 8)), 20)
-    suggestions = search_service.autocomplete(query, max_suggestions)
-    
-    return jsonify({
-        "query": query,
-        "suggestions": suggestions,
-        "total": len(suggestions)
-    })
-
-
-@api_bp.route('/filters', methods=['GET'])
-@error_handler
-@require_ready
-def get_filters() -> tuple[Dict[str, Any], int]:
-    """
-    Get available filter options.
-    
-    Returns all unique sectors, locations, and tags from the dataset.
-    
-    Returns:
-        tuple: JSON response with filter options and HTTP status code.
-        
-    Example Response:
-        {
-            "sectors": ["Food & Beverage", "Retail", ...],
-            "locations": ["New York", "California", ...],
-            "tags": ["coffee", "fast-food", ...],
-            "total_listings": 150
-        }
-    """
-    return jsonify({
-        "sectors": sorted(list(data_service.metadata['sectors'])),
-        "locations": sorted(list(data_service.metadata['locations'])),
-        "tags": sorted(list(data_service.metadata['tags'])),
-        "total_listings": len(data_service.listings)
-    })
-
-
-@api_bp.route('/listings', methods=['GET'])
-@error_handler
-@require_ready
-def get_listings() -> tuple[Dict[str, Any], int]:
-    """
-    Get all listings with pagination.
-    
-    Query Parameters:
-        limit (int, optional): Number of listings per page (default: 100, max: 500).
-        offset (int, optional): Number of listings to skip (default: 0).
-    
-    Returns:
-        tuple: JSON response with paginated listings and HTTP status code.
-        
-    Example Response:
-        {
-            "listings": [{...}, {...}],
-            "total": 150,
-            "limit": 100,
-            "offset": 0,
-            "has_more": true
-        }
-    """
-    limit = min(int(request.args.get('limit', 100)), 500)
-    offset = int(request.args.get('offset', 0))
-    
-    paginated = data_service.listings[offset:offset + limit]
-    
-    return jsonify({
-        "listings": paginated,
-        "total": len(data_service.listings),
-        "limit": limit,
-        "offset": offset,
-        "has_more": (offset + limit) < len(data_service.listings)
-    })
-
-
-@api_bp.route('/admin/storage-info', methods=['GET'])
-@error_handler
-@require_ready
-def storage_info() -> tuple[Dict[str, Any], int]:
-    """
-    Get storage information (admin endpoint).
-    
-    Returns details about model storage configuration and status.
-    
-    Returns:
-        tuple: JSON response with storage info and HTTP status code.
-    """
-    return jsonify(model_manager.get_storage_info())
-
-
-@api_bp.route('/admin/retrain', methods=['POST'])
-@error_handler
-def retrain() -> tuple[Dict[str, Any], int]:
-    """
-    Manually trigger model retraining (admin endpoint).
-    
-    Note: Not recommended on Cloud Run due to ephemeral storage.
-    
-    Returns:
-        tuple: JSON response with retrain status and HTTP status code.
-    """
-    if config.is_cloud_run():
-        return jsonify({
-            "error": "Retraining not recommended on Cloud Run",
-            "suggestion": "Train locally and upload to GCS instead"
-        }), 400
-    
-    try:
-        logger.info("🔄 Manual retrain triggered...")
-        texts = data_service.get_all_texts()
-        model_manager.initialize_models(texts)
-        
-        return jsonify({
-            "status": "success",
-            "message": "Models retrained successfully"
-        })
-    except Exception as e:
-        logger.error(f"Retrain failed: {e}")
-        return jsonify({"error": str(e)}), 500
-
-
-@api_bp.route('/admin/retrain/status', methods=['GET'])
-@error_handler
-@require_admin
-@require_ready
-def retrain_status() -> tuple[Dict[str, Any], int]:
-    """
-    Retrain status endpoint (admin).
-
-    This project runs retraining synchronously today (no background worker),
-    so `is_retraining` is always False unless you later add async retraining.
-    """
-    meta = model_manager.metadata or {}
-    return jsonify({
-        "is_retraining": False,
-        "strategy": "manual_only",
-        "additions_since_retrain": 0,
-        "last_retrain_at": meta.get("saved_at"),
-        "trained_on_texts": meta.get("num_texts"),
-    })
-
-
-@api_bp.route('/admin/stats', methods=['GET'])
-@error_handler
-@require_admin
-@require_ready
-def admin_stats() -> tuple[Dict[str, Any], int]:
-    """
-    Simple admin stats endpoint used by test scripts.
-    """
-    return jsonify({
-        "data": {
-            "total_listings": len(data_service.listings),
-            "sectors": len(data_service.metadata.get("sectors", [])),
-            "tags": len(data_service.metadata.get("tags", [])),
-            "locations": len(data_service.metadata.get("locations", [])),
-        },
-        "models": {
-            "tfidf_loaded": bool(model_manager.tfidf_vectorizer),
-            "faiss_vectors": model_manager.faiss_index.ntotal if model_manager.faiss_index else 0,
-            "use_loaded": bool(model_manager.use_model),
-        },
-        "storage": model_manager.get_storage_info(),
-    })
-
-
-# ============================================================================
-# ADMIN + ADD LISTINGS
-# ============================================================================
-
-def _create_listing_from_request() -> Dict[str, Any]:
-    payload = request.get_json(silent=True)
-    if payload is None:
-        raise ValueError("JSON body required")
-
-    # Support either a single listing object or {\"listing\": {...}}
-    if isinstance(payload, dict) and "listing" in payload and isinstance(payload["listing"], dict):
-        return payload["listing"]
-
-    if isinstance(payload, dict):
-        return payload
-
-    raise ValueError("Invalid JSON body: expected an object")
-
-
-@api_bp.route('/admin/listings', methods=['POST'])
-@error_handler
-@require_admin
-@require_ready
-def admin_add_listing() -> tuple[Dict[str, Any], int]:
-    """
-    Add a new franchise listing (admin endpoint).
-
-    Persists to dataset.json and updates in-memory listings/metadata.
-    Does NOT retrain models by default; call POST /api/admin/retrain manually.
-    """
-    listing = _create_listing_from_request()
-    created = data_service.add_listing(listing)
-
-    # Refresh search service listings reference (SearchService holds a list reference)
-    search_service.listings = data_service.listings
-    search_service._build_tfidf_matrix()
-
-    return jsonify({
-        "status": "created",
-        "id": created.get("id"),
-        "listing": created,
-        "retrain_required": True,
-        "retrain_endpoint": "/api/admin/retrain",
-    }), 201
-
-
-@api_bp.route('/add/listings', methods=['POST'])
-@error_handler
-@require_ready
-def add_listing_alias() -> tuple[Dict[str, Any], int]:
-    """
-    Public alias endpoint to add a listing.
-
-    NOTE: This is intentionally NOT auto-retraining. If you need auth here,
-    switch this to @require_admin or set up a separate auth mechanism.
-    """
-    listing = _create_listing_from_request()
-    created = data_service.add_listing(listing)
-
-    search_service.listings = data_service.listings
-    search_service._build_tfidf_matrix()
-
-    return jsonify({
-        "status": "created",
-        "id": created.get("id"),
-        "listing": created,
-        "retrain_required": True,
-        "retrain_endpoint": "/api/admin/retrain",
-    }), 201
-
-
-@api_bp.route('/admin/listings', methods=['GET'])
-@error_handler
-@require_admin
-@require_ready
-def admin_list_listings() -> tuple[Dict[str, Any], int]:
-    """
-    List all listings (admin endpoint) with pagination.
-    """
-    limit = min(int(request.args.get('limit', 100)), 500)
-    offset = int(request.args.get('offset', 0))
-    paginated = data_service.listings[offset:offset + limit]
-
-    return jsonify({
-        "listings": paginated,
-        "total": len(data_service.listings),
-        "limit": limit,
-        "offset": offset,
-        "has_more": (offset + limit) < len(data_service.listings)
-    })
-
-
-@api_bp.route('/admin/listings/<int:listing_id>', methods=['PUT'])
-@error_handler
-@require_admin
-@require_ready
-def admin_update_listing(listing_id: int) -> tuple[Dict[str, Any], int]:
-    updates = request.get_json(silent=True) or {}
-    updated = data_service.update_listing(listing_id, updates)
-
-    search_service.listings = data_service.listings
-    search_service._build_tfidf_matrix()
-
-    return jsonify({
-        "status": "updated",
-        "id": updated.get("id"),
-        "listing": updated,
-        "retrain_required": True,
-        "retrain_endpoint": "/api/admin/retrain",
-    })
-
-
-@api_bp.route('/admin/listings/<int:listing_id>', methods=['DELETE'])
-@error_handler
-@require_admin
-@require_ready
-def admin_delete_listing(listing_id: int) -> tuple[Dict[str, Any], int]:
-    data_service.delete_listing(listing_id)
-
-    search_service.listings = data_service.listings
-    search_service._build_tfidf_matrix()
-
-    return jsonify({
-        "status": "deleted",
-        "id": listing_id,
-        "retrain_required": True,
-        "retrain_endpoint": "/api/admin/retrain",
-    })
+"""
+API Routes Module
+
+This module defines all API endpoints for the Semantic Search API.
+
+Endpoints:
+    GET /api/health - System health check
+    GET /api/search - Hybrid search
+    GET /api/recommend/<id> - Get recommendations
+    GET /api/autocomplete - Autocomplete suggestions
+    GET /api/filters - Get available filters
+    GET /api/listings - Get all listings with pagination
+    GET /api/admin/storage-info - Storage information
+    POST /api/admin/retrain - Trigger model retraining
+    POST /api/admin/listings/bulk - Add many listings at once
+    GET /api/admin/jobs/<id> - Status of a background admin job
+    GET / - API information
+
+Example:
+    >>> from backend.src.api.routes import create_routes
+    >>> app = Flask(__name__)
+    >>> create_routes(app, model_manager, data_service, search_service)
+"""
+
+import os
+import re
+import uuid
+import logging
+from flask import request, Blueprint, Response, stream_with_context
+from typing import Any, Callable, Dict
+
+from ..core.config import config, DEFAULT_TOP_N, MAX_TOP_N, SEMANTIC_WEIGHT, IS_CLOUD_RUN
+from ..utils.timing import now_iso
+from ..utils.serialization import ojsonify
+from ..services.job_runner import JobRunner
+from .deps import endpoint
+
+logger = logging.getLogger(__name__)
+
+# Splits the `tags` query parameter, dropping whitespace around commas
+_TAGS_SPLIT = re.compile(r'\s*,\s*').split
+
+# Browsers and CDNs may reuse /filters, /listings and /autocomplete responses this long
+CACHE_MAX_AGE = 60
+
+# (pid, random token) identifying this worker process in ETags
+_etag_token = (None, '')
+
+# Create blueprint for API routes
+api_bp = Blueprint('api', __name__)
+
+# Global service instances (will be set by main.py)
+model_manager = None
+data_service = None
+search_service = None
+
+# Persists and re-indexes admin listing mutations off the request thread
+admin_jobs = JobRunner()
+
+
+def init_routes(mm, ds, ss):
+    """
+    Initialize routes with service instances.
+    
+    Args:
+        mm: ModelManager instance
+        ds: DataService instance
+        ss: SearchService instance
+    """
+    global model_manager, data_service, search_service
+    model_manager = mm
+    data_service = ds
+    search_service = ss
+
+
+@api_bp.before_request
+def reload_updated_models() -> None:
+    """
+    Pick up models retrained out of process (see scripts/retrain_worker.py).
+    
+    ModelManager.reload_if_updated() is a throttled stat() check, so this
+    costs nothing on almost every request. After a reload, the dataset is
+    re-read if it changed and the search service is rebuilt against the
+    new TF-IDF model.
+    """
+    if model_manager is None or not model_manager.reload_if_updated():
+        return
+    
+    if data_service.has_changed():
+        data_service.load_data()
+    search_service.refresh(data_service.listings)
+
+
+def _save_and_reindex() -> None:
+    """Background job after a listing mutation: write dataset.json and refresh search."""
+    data_service.save()
+    search_service.refresh(data_service.listings)
+
+
+def _accepted(payload: Dict[str, Any]) -> tuple:
+    """Queue _save_and_reindex and build the 202 response for a listing mutation."""
+    job_id = admin_jobs.submit(_save_and_reindex)
+    payload.update({
+        "job_id": job_id,
+        "job_endpoint": f"/api/admin/jobs/{job_id}",
+        "retrain_required": True,
+        "retrain_endpoint": "/api/admin/retrain",
+    })
+    return ojsonify(payload), 202
+
+
+def _conditional(version: int, build: Callable[[], Response]) -> Response:
+    """
+    Serve a cacheable GET response with a weak ETag for the data `version`.
+    
+    Replies 304 Not Modified without calling `build` when the client's
+    If-None-Match matches. Data versions are counted per worker process, so
+    the ETag also carries a per-process token (computed after the fork).
+    """
+    global _etag_token
+    pid = os.getpid()
+    if _etag_token[0] != pid:
+        _etag_token = (pid, uuid.uuid4().hex[:12])
+    etag = f"{_etag_token[1]}-{version}"
+    
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    return response
+
+
+def _paginated_listings(public: bool = True) -> Response:
+    """
+    Stream the page of listings selected by the `limit` (default 100, max 500)
+    and `offset` query parameters. Public pages are cacheable (see _conditional).
+    """
+    args = request.args
+    limit = min(args.get('limit', 100, type=int), 500)
+    offset = max(args.get('offset', 0, type=int), 0)
+    
+    def build() -> Response:
+        return Response(
+            stream_with_context(data_service.iter_listings_json(offset, limit)),
+            mimetype='application/json'
+        )
+    
+    return _conditional(data_service.version, build) if public else build()
+
+
+@api_bp.route('/health', methods=['GET'])
+@endpoint(ready=False)
+def health() -> tuple[Dict[str, Any], int]:
+    """
+    System health check endpoint.
+    
+    Returns system status, version information, deployment details,
+    model status, and data statistics.
+    
+    Returns:
+        tuple: JSON response and HTTP status code.
+        
+    Example Response:
+        {
+            "status": "healthy",
+            "timestamp": "2024-01-25T10:30:00Z",
+            "version": "3.0.0-gcp",
+            "deployment": {...},
+            "models": {...},
+            "data": {...}
+        }
+    """
+    from .deps import system_ready
+    
+    storage_info = model_manager.get_storage_info() if model_manager else {}
+    
+    return ojsonify({
+        "status": "healthy" if system_ready else "initializing",
+        "timestamp": now_iso(),
+        "version": "3.0.0-gcp",
+        "deployment": {
+            "environment": config.DEPLOYMENT_ENV,
+            "is_cloud_run": IS_CLOUD_RUN,
+            "storage_type": config.STORAGE_TYPE
+        },
+        "models": {
+            "use": model_manager.use_model_status,
+            "tfidf": "loaded" if model_manager.tfidf_vectorizer else "not loaded",
+            "faiss": model_manager.faiss_index.ntotal if model_manager.faiss_index else 0
+        },
+        "data": {
+            "listings": len(data_service.listings),
+            "sectors": len(data_service.metadata['sectors']),
+            "tags": len(data_service.metadata['tags']),
+            "locations": len(data_service.metadata['locations'])
+        },
+        "storage": storage_info
+    })
+
+
+@api_bp.route('/search', methods=['GET'])
+@endpoint(timed=True)
+def search() -> tuple[Dict[str, Any], int]:
+    """
+    Hybrid search endpoint combining semantic and keyword search.
+    
+    Query Parameters:
+        q (str, required): Search query string.
+        top_n (int, optional): Number of results to return (default: 10, max: 50).
+        semantic_weight (float, optional): Weight for semantic search 0-1 (default: 0.6).
+        sector (str, optional): Filter by sector.
+        location (str, optional): Filter by location.
+        tags (str, optional): Comma-separated tags to filter by.
+    
+    Malformed numeric parameters fall back to their defaults.
+    
+    Returns:
+        tuple: JSON response with search results and HTTP status code.
+        
+    Example Response:
+        {
+            "query": "coffee franchise",
+            "results": [{...}, {...}],
+            "total": 10,
+            "timestamp": "2024-01-25T10:30:00Z"
+        }
+    """
+    # Read every query parameter once
+    args = request.args
+    query = args.get('q', '').strip()
+    if not query:
+        return ojsonify({"error": "Query 'q' required"}), 400
+    
+    top_n = min(args.get('top_n', DEFAULT_TOP_N, type=int), MAX_TOP_N)
+    semantic_weight = args.get('semantic_weight', SEMANTIC_WEIGHT, type=float)
+    sector = args.get('sector')
+    sector = sector.lower() if sector else None
+    location = args.get('location')
+    location = location.lower() if location else None
+    tags_raw = args.get('tags')
+    tags = tuple(sorted(set(_TAGS_SPLIT(tags_raw.strip().lower())) - {''})) if tags_raw else ()
+    
+    # Apply filters as a mask over the whole catalog, then rank within it.
+    # The data version is read first and keys the cache: until the search
+    # snapshot is refreshed, filtered results change with every mutation.
+    filters_key = (data_service.version, sector, location, tags)
+    mask_listings, mask = data_service.filter_listings(sector, location, tags)
+    
+    results = search_service.search(
+        query, top_n, semantic_weight,
+        mask=mask, filters_key=filters_key, mask_listings=mask_listings
+    )
+    
+    return ojsonify({
+        "query": query,
+        "results": results,
+        "total": len(results),
+        "timestamp": now_iso()
+    })
+
+
+@api_bp.route('/recommend/<int:listing_id>', methods=['GET'])
+@endpoint(timed=True)
+def recommend(listing_id: int) -> tuple[Dict[str, Any], int]:
+    """
+    Get franchise recommendations based on a listing ID.
+    
+    Path Parameters:
+        listing_id (int): ID of the listing to get recommendations for.
+    
+    Query Parameters:
+        top_n (int, optional): Number of recommendations (default: 5, max: 20).
+        sector_filter (bool, optional): Filter to same sector (default: true).
+    
+    Returns:
+        tuple: JSON response with recommendations and HTTP status code.
+        
+    Example Response:
+        {
+            "listing_id": 42,
+            "recommendations": [{...}, {...}],
+            "total": 5,
+            "timestamp": "2024-01-25T10:30:00Z"
+        }
+    """
+    top_n = min(request.args.get('top_n', 5, type=int), 20)
+    sector_filter = request.args.get('sector_filter', 'true').lower() == 'true'
+    
+    results = search_service.get_recommendations(
+        listing_id, top_n, sector_filter, id_index=data_service.id_index
+    )
+    
+    return ojsonify({
+        "listing_id": listing_id,
+        "recommendations": results,
+        "total": len(results),
+        "timestamp": now_iso()
+    })
+
+
+@api_bp.route('/autocomplete', methods=['GET'])
+@endpoint
+def autocomplete() -> tuple[Dict[str, Any], int]:
+    """
+    Autocomplete suggestions endpoint.
+    
+    Query Parameters:
+        q (str, required): Partial query string.
+        max (int, optional): Maximum suggestions to return (default: 8, max: 20).
+    
+    Returns:
+        tuple: JSON response with suggestions and HTTP status code.
+        
+    Example Response:
+        {
+            "query": "cof",
+            "suggestions": [
+                {"text": "Coffee Shop", "type": "title", "category": "Food & Beverage"},
+                ...
+            ],
+            "total": 5
+        }
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return ojsonify([])
+    
+    max_suggestions = min(request.args.get('max', 8, type=int), 20)
+    
+    def build() -> Response:
+        suggestions = search_service.autocomplete(query, max_suggestions)
+        return ojsonify({
+            "query": query,
+            "suggestions": suggestions,
+            "total": len(suggestions)
+        })
+    
+    return _conditional(search_service.version, build)
+
+
+@api_bp.route('/filters', methods=['GET'])
+@endpoint
+def get_filters() -> tuple[Dict[str, Any], int]:
+    """
+    Get available filter options.
+    
+    Returns all unique sectors, locations, and tags from the dataset.
+    
+    Returns:
+        tuple: JSON response with filter options and HTTP status code.
+        
+    Example Response:
+        {
+            "sectors": ["Food & Beverage", "Retail", ...],
+            "locations": ["New York", "California", ...],
+            "tags": ["coffee", "fast-food", ...],
+            "total_listings": 150
+        }
+    """
+    return _conditional(
+        data_service.version,
+        lambda: Response(data_service.get_filters_json(), mimetype='application/json')
+    )
+
+
+@api_bp.route('/listings', methods=['GET'])
+@endpoint
+def get_listings() -> tuple[Dict[str, Any], int]:
+    """
+    Get all listings with pagination.
+    
+    Query Parameters:
+        limit (int, optional): Number of listings per page (default: 100, max: 500).
+        offset (int, optional): Number of listings to skip (default: 0).
+    
+    Returns:
+        tuple: JSON response with paginated listings and HTTP status code.
+        
+    Example Response:
+        {
+            "listings": [{...}, {...}],
+            "total": 150,
+            "limit": 100,
+            "offset": 0,
+            "has_more": true
+        }
+    """
+    return _paginated_listings()
+
+
+@api_bp.route('/admin/storage-info', methods=['GET'])
+@endpoint
+def storage_info() -> tuple[Dict[str, Any], int]:
+    """
+    Get storage information (admin endpoint).
+    
+    Returns details about model storage configuration and status.
+    
+    Returns:
+        tuple: JSON response with storage info and HTTP status code.
+    """
+    return ojsonify(model_manager.get_storage_info())
+
+
+@api_bp.route('/admin/retrain', methods=['POST'])
+@endpoint(ready=False)
+def retrain() -> tuple[Dict[str, Any], int]:
+    """
+    Manually trigger model retraining (admin endpoint).
+    
+    Note: Not recommended on Cloud Run due to ephemeral storage.
+    
+    Returns:
+        tuple: JSON response with retrain status and HTTP status code.
+    """
+    if IS_CLOUD_RUN:
+        return ojsonify({
+            "error": "Retraining not recommended on Cloud Run",
+            "suggestion": "Train locally and upload to GCS instead"
+        }), 400
+    
+    try:
+        logger.info("🔄 Manual retrain triggered...")
+        texts = data_service.get_all_texts()
+        model_manager.initialize_models(texts)
+        search_service.refresh(data_service.listings)
+        
+        return ojsonify({
+            "status": "success",
+            "message": "Models retrained successfully"
+        })
+    except Exception as e:
+        logger.error(f"Retrain failed: {e}")
+        return ojsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/admin/retrain/status', methods=['GET'])
+@endpoint(admin=True)
+def retrain_status() -> tuple[Dict[str, Any], int]:
+    """
+    Retrain status endpoint (admin).
+
+    This project runs retraining synchronously today (no background worker),
+    so `is_retraining` is always False unless you later add async retraining.
+    """
+    meta = model_manager.metadata or {}
+    return ojsonify({
+        "is_retraining": False,
+        "strategy": "manual_only",
+        "additions_since_retrain": 0,
+        "last_retrain_at": meta.get("saved_at"),
+        "trained_on_texts": meta.get("num_texts"),
+    })
+
+
+@api_bp.route('/admin/stats', methods=['GET'])
+@endpoint(admin=True)
+def admin_stats() -> tuple[Dict[str, Any], int]:
+    """
+    Simple admin stats endpoint used by test scripts.
+    """
+    return ojsonify({
+        "data": {
+            "total_listings": len(data_service.listings),
+            "sectors": len(data_service.metadata.get("sectors", [])),
+            "tags": len(data_service.metadata.get("tags", [])),
+            "locations": len(data_service.metadata.get("locations", [])),
+        },
+        "models": {
+            "tfidf_loaded": bool(model_manager.tfidf_vectorizer),
+            "faiss_vectors": model_manager.faiss_index.ntotal if model_manager.faiss_index else 0,
+            "use_loaded": model_manager.use_model_loaded,
+        },
+        "storage": model_manager.get_storage_info(),
+    })
+
+
+# ============================================================================
+# ADMIN + ADD LISTINGS
+# ============================================================================
+
+def _create_listing_from_request() -> Dict[str, Any]:
+    payload = request.get_json(silent=True)
+    if payload is None:
+        raise ValueError("JSON body required")
+
+    # Support either a single listing object or {\"listing\": {...}}
+    if isinstance(payload, dict) and "listing" in payload and isinstance(payload["listing"], dict):
+        return payload["listing"]
+
+    if isinstance(payload, dict):
+        return payload
+
+    raise ValueError("Invalid JSON body: expected an object")
+
+
+@api_bp.route('/admin/listings', methods=['POST'])
+@endpoint(admin=True)
+def admin_add_listing() -> tuple[Dict[str, Any], int]:
+    """
+    Add a new franchise listing (admin endpoint).
+
+    Updates in-memory listings/metadata immediately and returns 202; writing
+    dataset.json and refreshing the search index run as a background job
+    (poll GET /api/admin/jobs/<job_id>).
+    Does NOT retrain models by default; call POST /api/admin/retrain manually.
+    """
+    listing = _create_listing_from_request()
+    created = data_service.add_listing(listing, persist=False)
+
+    return _accepted({
+        "status": "created",
+        "id": created.get("id"),
+        "listing": created,
+    })
+
+
+@api_bp.route('/admin/listings/bulk', methods=['POST'])
+@endpoint(admin=True)
+def admin_add_listings_bulk() -> tuple[Dict[str, Any], int]:
+    """
+    Add many franchise listings in one request (admin endpoint).
+
+    Body: a JSON array of listings, or {"listings": [...]}. All listings are
+    validated first and added together; metadata, indexes, dataset.json and
+    the search index are refreshed once for the batch (as a background job,
+    like POST /admin/listings).
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("listings")
+    if not isinstance(payload, list):
+        raise ValueError("JSON body must be an array of listings or {\"listings\": [...]}")
+
+    created = data_service.add_listings(payload, persist=False)
+
+    return _accepted({
+        "status": "created",
+        "ids": [listing.get("id") for listing in created],
+        "count": len(created),
+    })
+
+
+@api_bp.route('/add/listings', methods=['POST'])
+@endpoint
+def add_listing_alias() -> tuple[Dict[str, Any], int]:
+    """
+    Public alias endpoint to add a listing.
+
+    NOTE: This is intentionally NOT auto-retraining. If you need auth here,
+    switch this to @endpoint(admin=True) or set up a separate auth mechanism.
+    """
+    listing = _create_listing_from_request()
+    created = data_service.add_listing(listing, persist=False)
+
+    return _accepted({
+        "status": "created",
+        "id": created.get("id"),
+        "listing": created,
+    })
+
+
+@api_bp.route('/admin/listings', methods=['GET'])
+@endpoint(admin=True)
+def admin_list_listings() -> tuple[Dict[str, Any], int]:
+    """
+    List all listings (admin endpoint) with pagination.
+    """
+    return _paginated_listings(public=False)
+
+
+@api_bp.route('/admin/listings/<int:listing_id>', methods=['PUT'])
+@endpoint(admin=True)
+def admin_update_listing(listing_id: int) -> tuple[Dict[str, Any], int]:
+    updates = request.get_json(silent=True) or {}
+    updated = data_service.update_listing(listing_id, updates, persist=False)
+
+    return _accepted({
+        "status": "updated",
+        "id": updated.get("id"),
+        "listing": updated,
+    })
+
+
+@api_bp.route('/admin/listings/<int:listing_id>', methods=['DELETE'])
+@endpoint(admin=True)
+def admin_delete_listing(listing_id: int) -> tuple[Dict[str, Any], int]:
+    data_service.delete_listing(listing_id, persist=False)
+
+    return _accepted({
+        "status": "deleted",
+        "id": listing_id,
+    })
+
+
+@api_bp.route('/admin/jobs/<job_id>', methods=['GET'])
+@endpoint(admin=True, ready=False)
+def admin_job_status(job_id: str) -> tuple[Dict[str, Any], int]:
+    """
+    Status of a background admin job (pending, running, done or error).
+
+    Job status is kept per worker process, so with several Gunicorn workers
+    an unknown id may belong to another worker.
+    """
+    status = admin_jobs.status(job_id)
+    if status is None:
+        return ojsonify({"error": f"Job {job_id} not found"}), 404
+    return ojsonify(status)
@@ -1,10 +1,10 @@
-"""
-Core module for the Semantic Search API.
-
-This module contains core functionality including configuration management,
-custom exceptions, and shared utilities.
-"""
-
-from .config import config
-
-__all__ = ['config']
+"""
+Core module for the Semantic Search API.
+
+This module contains core functionality including configuration management,
+custom exceptions, and shared utilities.
+"""
+
+from .config import config
+
+__all__ = ['config']
@@ -1,180 +1,301 @@
-"""
-Configuration Module for Semantic Search API
-
-This module provides centralized configuration management for the application,
-supporting deployment on Google Cloud Platform (Cloud Run and Compute Engine).
-
-Classes:
-    Config: Main configuration class containing all application settings.
-
-Attributes:
-    config (Config): Global configuration instance.
-
-Environment Variables:
-    HOST: Server host address (default: '0.0.0.0')
-    PORT: Server port (default: 8080)
-    DEBUG: Debug mode flag (default: 'False')
-    STORAGE_TYPE: Storage backend type - 'gcs' or 'local' (default: 'gcs')
-    GCS_BUCKET: Google Cloud Storage bucket name
-    GCP_PROJECT: Google Cloud Platform project ID
-    DATA_PATH: Path to dataset JSON file
-    AUTO_RETRAIN: Enable automatic model retraining (default: 'False')
-    CHECK_INTERVAL: Interval for checking updates in seconds (default: 3600)
-    ALLOWED_ORIGINS: CORS allowed origins, comma-separated (default: '*')
-    DEPLOYMENT_ENV: Deployment environment - 'development', 'cloud-run', or 'compute-engine'
-
-Example:
-    >>> from backend.src.core.config import config
-    >>> print(config.PORT)
-    8080
-    >>> if config.is_cloud_run():
-    ...     print("Running on Cloud Run")
-"""
-
-import os
-from pathlib import Path
-
-
-class Config:
-    """
-    Application configuration class.
-    
-    This class encapsulates all configuration settings for the semantic search API,
-    including server settings, GCP integration, model paths, and deployment options.
-    
-    Attributes:
-        HOST (str): Server host address.
-        PORT (int): Server port number.
-        DEBUG (bool): Debug mode flag.
-        STORAGE_TYPE (str): Storage backend type ('gcs' or 'local').
-        GCS_BUCKET (str): Google Cloud Storage bucket name.
-        GCS_PROJECT (str): Google Cloud Platform project ID.
-        GCS_PREFIX (str): Prefix path for models in GCS bucket.
-        BASE_DIR (Path): Base directory of the application.
-        MODELS_DIR (str): Directory path for storing models.
-        DATA_PATH (str): Path to the dataset JSON file.
-        USE_EMBEDDINGS_PATH (str): URL for Universal Sentence Encoder model.
-        TFIDF_MODEL_PATH (str): Path to TF-IDF model file.
-        FAISS_INDEX_PATH (str): Path to FAISS index file.
-        METADATA_PATH (str): Path to metadata JSON file.
-        DEFAULT_TOP_N (int): Default number of search results to return.
-        MAX_TOP_N (int): Maximum number of search results allowed.
-        SEMANTIC_WEIGHT (float): Weight for semantic search (0.0-1.0).
-        AUTO_RETRAIN (bool): Flag to enable automatic model retraining.
-        CHECK_INTERVAL (int): Interval in seconds for checking updates.
-        ALLOWED_ORIGINS (list): List of allowed CORS origins.
-        CACHE_MODELS_IN_MEMORY (bool): Flag to cache models in memory.
-        DEPLOYMENT_ENV (str): Current deployment environment.
-    """
-    
-    # ============================================================================
-    # SERVER CONFIG
-    # ============================================================================
-    HOST = os.getenv('HOST', '0.0.0.0')
-    PORT = int(os.getenv('PORT', 8080))  # Cloud Run uses PORT env var
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
-    
-    # ============================================================================
-    # GCP CONFIG
-    # ============================================================================
-    # Storage Options: 'gcs' (Cloud Storage) or 'local' (Compute Engine disk)
-    STORAGE_TYPE = os.getenv('STORAGE_TYPE', 'local')
-    
-    # Google Cloud Storage
-    GCS_BUCKET = os.getenv('GCS_BUCKET', 'search-api-models')
-    GCS_PROJECT = os.getenv('GCP_PROJECT', 'sigma-archery-467104-d5')
-    GCS_PREFIX = 'models/'  # Folder in bucket for models
-    
-    # For Cloud Run: use /tmp (ephemeral), gets recreated on each instance
-    # For Compute Engine: use persistent disk
-    BASE_DIR = Path(__file__).parent.parent.parent.parent
-    MODELS_DIR = os.path.join(BASE_DIR, "models")
-    
-    # ============================================================================
-    # DATA CONFIG
-    # ============================================================================
-    DATA_PATH = os.getenv('DATA_PATH', os.path.join(BASE_DIR, 'dataset.json'))
-    
-    # ============================================================================
-    # MODEL PATHS
-    # ============================================================================
-    USE_EMBEDDINGS_PATH = "https://tfhub.dev/google/universal-sentence-encoder/4"
-    TFIDF_MODEL_PATH = os.path.join(MODELS_DIR, 'tfidf_model.pkl')
-    FAISS_INDEX_PATH = os.path.join(MODELS_DIR, 'faiss_index.bin')
-    METADATA_PATH = os.path.join(MODELS_DIR, 'metadata.json')
-    
-    # ============================================================================
-    # SEARCH CONFIG
-    # ============================================================================
-    DEFAULT_TOP_N = 10
-    MAX_TOP_N = 50
-    SEMANTIC_WEIGHT = 0.6  # 60% semantic, 40% keyword
-    
-    # ============================================================================
-    # AUTO-RETRAIN CONFIG (Disabled for Cloud Run, optional for Compute Engine)
-    # ============================================================================
-    AUTO_RETRAIN = os.getenv('AUTO_RETRAIN', 'False').lower() == 'true'
-    CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', 3600))  # 1 hour
-    
-    # ============================================================================
-    # CORS CONFIG
-    # ============================================================================
-    ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*').split(',')
-
-    # ============================================================================
-    # ADMIN / SECURITY
-    # ============================================================================
-    # If set, admin endpoints require header: X-Admin-API-Key: <value>
-    # If empty, admin endpoints will be effectively disabled (return 401).
-    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY', '')
-    
-    # ============================================================================
-    # CACHE CONFIG (Cloud Run specific)
-    # ============================================================================
-    # Cloud Run instances can be reused, cache models in memory
-    CACHE_MODELS_IN_MEMORY = True
-    
-    # ============================================================================
-    # DEPLOYMENT INFO
-    # ============================================================================
-    DEPLOYMENT_ENV = os.getenv('DEPLOYMENT_ENV', 'development')  # development, cloud-run, compute-engine
-    
-    @classmethod
-    def is_cloud_run(cls):
-        """
-        Check if the application is running on Google Cloud Run.
-        
-        Returns:
-            bool: True if running on Cloud Run, False otherwise.
-            
-        Note:
-            Detection is based on DEPLOYMENT_ENV or the presence of K_SERVICE environment variable.
-        """
-        return cls.DEPLOYMENT_ENV == 'cloud-run' or os.getenv('K_SERVICE') is not None
-    
-    @classmethod
-    def is_compute_engine(cls):
-        """
-        Check if the application is running on Google Compute Engine.
-        
-        Returns:
-            bool: True if running on Compute Engine, False otherwise.
-        """
-        return cls.DEPLOYMENT_ENV == 'compute-engine'
-    
-    @classmethod
-    def should_use_gcs(cls):
-        """
-        Determine if Google Cloud Storage should be used for model storage.
-        
-        Returns:
-            bool: True if GCS should be used, False otherwise.
-            
-        Note:
-            GCS is used when STORAGE_TYPE is 'gcs' and a bucket name is configured.
-        """
-        return cls.STORAGE_TYPE == 'gcs' and cls.GCS_BUCKET
-
-
-# Global configuration instance
-config = Config()
+"""
+Configuration Module for Semantic Search API
+
+This module provides centralized configuration management for the application,
+supporting deployment on Google Cloud Platform (Cloud Run and Compute Engine).
+
+Classes:
+    Config: Main configuration class containing all application settings.
+
+Attributes:
+    config (Config): Global configuration instance.
+    DEFAULT_TOP_N, MAX_TOP_N, SEMANTIC_WEIGHT, IS_CLOUD_RUN: Search defaults and
+        deployment flag frozen at import, for request hot paths.
+
+Environment Variables:
+    HOST: Server host address (default: '0.0.0.0')
+    PORT: Server port (default: 8080)
+    DEBUG: Debug mode flag (default: 'False')
+    STORAGE_TYPE: Storage backend type - 'gcs' or 'local' (default: 'gcs')
+    GCS_BUCKET: Google Cloud Storage bucket name
+    GCP_PROJECT: Google Cloud Platform project ID
+    DATA_PATH: Path to dataset JSON file
+    AUTO_RETRAIN: Enable automatic model retraining (default: 'False')
+    CHECK_INTERVAL: Interval for checking updates in seconds (default: 3600)
+    MODEL_RELOAD_INTERVAL: Seconds between checks for models saved by another process
+        (default: 30, 0 disables)
+    USE_PRELOAD: Load the Universal Sentence Encoder at startup; 'False' defers it to
+        the first query that needs it (default: 'True')
+    ALLOWED_ORIGINS: CORS allowed origins, comma-separated (default: '*')
+    FAISS_INDEX_FACTORY: FAISS factory string for large catalogs
+        (default: 'OPQ64_256,IVF1024_HNSW32,PQ64')
+    FAISS_ANN_MIN_VECTORS: Catalog size from which the ANN index is used (default: 50000)
+    FAISS_SMALL_INDEX_FACTORY: FAISS factory string below that size, 'SQ8' (int8 codes)
+        or 'Flat' (exact float32) (default: 'SQ8')
+    FAISS_IVF_MIN_VECTORS: Catalog size from which the small-catalog codes are
+        IVF-partitioned (default: 10000)
+    FAISS_NPROBE: IVF lists visited per query (default: 16)
+    FAISS_HNSW_EF_SEARCH: HNSW candidate list size per query, for HNSW indexes and
+        HNSW-indexed IVF centroids (default: 64)
+    FAISS_USE_GPU: Mirror the FAISS index to a GPU when one is present (default: 'True')
+    FAISS_GPU_DEVICE: GPU device id for the FAISS mirror (default: 0)
+    FAISS_USE_MMAP: Memory-map the FAISS index, embeddings and TF-IDF weights instead of reading them into the heap (default: 'True')
+    TFIDF_N_FEATURES: Size of the hashed TF-IDF feature space (default: 262144)
+    SEMANTIC_OVERSAMPLE: FAISS neighbours fetched per search, as a multiple of top_n
+        (default: 20, 0 searches all listings)
+    SEARCH_BATCH_MAX_SIZE: Maximum queries per batched FAISS search (default: 32)
+    SEARCH_BATCH_MAX_WAIT_MS: Search batch collection window in ms (default: 5)
+    ENCODER_BATCH_MAX_SIZE: Maximum queries per batched USE encoding (default: 32)
+    ENCODER_BATCH_MAX_WAIT_MS: Encoder batch collection window in ms (default: 5)
+    EMBED_BATCH_SIZE: Texts per USE call when embedding the corpus at training (default: 256)
+    SEARCH_CACHE_SIZE: Exact-match search cache entries (default: 4096, 0 disables)
+    SEARCH_SEMANTIC_CACHE_SIZE: Semantic search cache entries (default: 2048, 0 disables)
+    SEARCH_SEMANTIC_CACHE_THRESHOLD: Cosine similarity for a semantic cache hit (default: 0.97)
+    AUTOCOMPLETE_CACHE_SIZE: Cached autocomplete prefixes (default: 8192, 0 disables)
+    RECOMMEND_CACHE_SIZE: Cached recommendation lists (default: 4096, 0 disables)
+    STORAGE_INFO_TTL: Seconds the model storage probe (local size, GCS listing) is cached (default: 30)
+    GCS_MAX_WORKERS: Concurrent GCS model file downloads/uploads (default: 4)
+    DEPLOYMENT_ENV: Deployment environment - 'development', 'cloud-run', or 'compute-engine'
+
+Example:
+    >>> from backend.src.core.config import config
+    >>> print(config.PORT)
+    8080
+    >>> if config.is_cloud_run():
+    ...     print("Running on Cloud Run")
+"""
+
+import os
+from pathlib import Path
+
+
+class Config:
+    """
+    Application configuration class.
+    
+    This class encapsulates all configuration settings for the semantic search API,
+    including server settings, GCP integration, model paths, and deployment options.
+    
+    Attributes:
+        HOST (str): Server host address.
+        PORT (int): Server port number.
+        DEBUG (bool): Debug mode flag.
+        STORAGE_TYPE (str): Storage backend type ('gcs' or 'local').
+        GCS_BUCKET (str): Google Cloud Storage bucket name.
+        GCS_PROJECT (str): Google Cloud Platform project ID.
+        GCS_PREFIX (str): Prefix path for models in GCS bucket.
+        STORAGE_INFO_TTL (float): Seconds the model storage probe is cached.
+        GCS_MAX_WORKERS (int): Maximum concurrent GCS model file transfers.
+        BASE_DIR (Path): Base directory of the application.
+        MODELS_DIR (str): Directory path for storing models.
+        DATA_PATH (str): Path to the dataset JSON file.
+        USE_EMBEDDINGS_PATH (str): URL for Universal Sentence Encoder model.
+        USE_PRELOAD (bool): Flag to load the Universal Sentence Encoder at startup.
+        TFIDF_MODEL_PATH (str): Path to legacy pickled TF-IDF model file.
+        TFIDF_IDF_PATH (str): Path to the TF-IDF IDF weights file.
+        FAISS_INDEX_PATH (str): Path to FAISS index file.
+        METADATA_PATH (str): Path to metadata JSON file.
+        FAISS_INDEX_FACTORY (str): FAISS factory string for large catalogs.
+        FAISS_ANN_MIN_VECTORS (int): Catalog size from which the ANN index is used.
+        FAISS_SMALL_INDEX_FACTORY (str): FAISS factory string for smaller catalogs.
+        FAISS_IVF_MIN_VECTORS (int): Catalog size from which smaller catalogs use IVF lists.
+        FAISS_NPROBE (int): Number of IVF lists visited per query.
+        FAISS_HNSW_EF_SEARCH (int): HNSW candidate list size per query.
+        FAISS_USE_GPU (bool): Flag to search a GPU copy of the FAISS index when available.
+        FAISS_GPU_DEVICE (int): GPU device id for the FAISS index copy.
+        FAISS_USE_MMAP (bool): Flag to memory-map the FAISS index, embeddings and TF-IDF weights on load.
+        TFIDF_N_FEATURES (int): Number of hashed features of the TF-IDF model.
+        DEFAULT_TOP_N (int): Default number of search results to return.
+        MAX_TOP_N (int): Maximum number of search results allowed.
+        SEMANTIC_WEIGHT (float): Weight for semantic search (0.0-1.0).
+        SEMANTIC_OVERSAMPLE (int): FAISS neighbours per search as a multiple of top_n.
+        SEARCH_BATCH_MAX_SIZE (int): Maximum queries per batched FAISS search.
+        SEARCH_BATCH_MAX_WAIT_MS (float): Time window for collecting a search batch.
+        ENCODER_BATCH_MAX_SIZE (int): Maximum queries per batched USE encoding.
+        ENCODER_BATCH_MAX_WAIT_MS (float): Time window for collecting an encoder batch.
+        EMBED_BATCH_SIZE (int): Texts per USE call when embedding the training corpus.
+        SEARCH_CACHE_SIZE (int): Capacity of the exact-match search result cache.
+        SEARCH_SEMANTIC_CACHE_SIZE (int): Capacity of the semantic search result cache.
+        SEARCH_SEMANTIC_CACHE_THRESHOLD (float): Query similarity for a semantic cache hit.
+        AUTOCOMPLETE_CACHE_SIZE (int): Capacity of the autocomplete suggestion cache.
+        RECOMMEND_CACHE_SIZE (int): Capacity of the recommendation cache.
+        AUTO_RETRAIN (bool): Flag to enable automatic model retraining.
+        CHECK_INTERVAL (int): Interval in seconds for checking updates.
+        MODEL_RELOAD_INTERVAL (int): Interval in seconds for checking for retrained models.
+        ALLOWED_ORIGINS (list): List of allowed CORS origins.
+        CACHE_MODELS_IN_MEMORY (bool): Flag to cache models in memory.
+        DEPLOYMENT_ENV (str): Current deployment environment.
+        IS_CLOUD_RUN (bool): Whether the process runs on Cloud Run.
+    """
+    
+    # ============================================================================
+    # SERVER CONFIG
+    # ============================================================================
+    HOST = os.getenv('HOST', '0.0.0.0')
+    PORT = int(os.getenv('PORT', 8080))  # Cloud Run uses PORT env var
+    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    
+    # ============================================================================
+    # GCP CONFIG
+    # ============================================================================
+    # Storage Options: 'gcs' (Cloud Storage) or 'local' (Compute Engine disk)
+    STORAGE_TYPE = os.getenv('STORAGE_TYPE', 'local')
+    
+    # Google Cloud Storage
+    GCS_BUCKET = os.getenv('GCS_BUCKET', 'search-api-models')
+    GCS_PROJECT = os.getenv('GCP_PROJECT', 'sigma-archery-467104-d5')
+    GCS_PREFIX = 'models/'  # Folder in bucket for models
+    # Storage probe (local dir walk + GCS listing) behind /health is cached this long
+    STORAGE_INFO_TTL = float(os.getenv('STORAGE_INFO_TTL', 30))
+    # Model files are downloaded/uploaded in parallel; lower on thin egress links
+    GCS_MAX_WORKERS = int(os.getenv('GCS_MAX_WORKERS', 4))
+    
+    # For Cloud Run: use /tmp (ephemeral), gets recreated on each instance
+    # For Compute Engine: use persistent disk
+    BASE_DIR = Path(__file__).parent.parent.parent.parent
+    MODELS_DIR = os.path.join(BASE_DIR, "models")
+    
+    # ============================================================================
+    # DATA CONFIG
+    # ============================================================================
+    DATA_PATH = os.getenv('DATA_PATH', os.path.join(BASE_DIR, 'dataset.json'))
+    
+    # ============================================================================
+    # MODEL PATHS
+    # ============================================================================
+    USE_EMBEDDINGS_PATH = "https://tfhub.dev/google/universal-sentence-encoder/4"
+    # USE is loaded on first use either way; preloading moves the 30-60s load
+    # (and its ~1GB) to startup, before Gunicorn forks workers
+    USE_PRELOAD = os.getenv('USE_PRELOAD', 'True').lower() == 'true'
+    TFIDF_MODEL_PATH = os.path.join(MODELS_DIR, 'tfidf_model.pkl')  # read only for old models
+    TFIDF_IDF_PATH = os.path.join(MODELS_DIR, 'tfidf_idf.npy')
+    FAISS_INDEX_PATH = os.path.join(MODELS_DIR, 'faiss_index.bin')
+    METADATA_PATH = os.path.join(MODELS_DIR, 'metadata.json')
+    
+    # FAISS index layout. Catalogs smaller than FAISS_IVF_MIN_VECTORS are
+    # scanned brute force over int8 scalar-quantized codes (a quarter of the
+    # float32 bandwidth); up to FAISS_ANN_MIN_VECTORS the same codes sit in
+    # 4 * sqrt(N) IVF lists; larger catalogs use the compressed ANN factory
+    # below (OPQ rotation -> IVF with HNSW-indexed centroids -> PQ codes).
+    FAISS_INDEX_FACTORY = os.getenv('FAISS_INDEX_FACTORY', 'OPQ64_256,IVF1024_HNSW32,PQ64')
+    FAISS_ANN_MIN_VECTORS = int(os.getenv('FAISS_ANN_MIN_VECTORS', 50000))
+    FAISS_SMALL_INDEX_FACTORY = os.getenv('FAISS_SMALL_INDEX_FACTORY', 'SQ8')
+    FAISS_IVF_MIN_VECTORS = int(os.getenv('FAISS_IVF_MIN_VECTORS', 10000))
+    FAISS_NPROBE = int(os.getenv('FAISS_NPROBE', 16))
+    FAISS_HNSW_EF_SEARCH = int(os.getenv('FAISS_HNSW_EF_SEARCH', 64))
+    
+    # Search a GPU copy of the FAISS index when a faiss-gpu build sees a GPU
+    FAISS_USE_GPU = os.getenv('FAISS_USE_GPU', 'True').lower() == 'true'
+    FAISS_GPU_DEVICE = int(os.getenv('FAISS_GPU_DEVICE', 0))
+    
+    # Back the loaded FAISS index, embeddings and TF-IDF weights with the page cache (shared by all workers)
+    FAISS_USE_MMAP = os.getenv('FAISS_USE_MMAP', 'True').lower() == 'true'
+    
+    # TF-IDF keyword model: hashed term features, so no vocabulary is learned
+    TFIDF_N_FEATURES = int(os.getenv('TFIDF_N_FEATURES', 2 ** 18))
+    
+    # ============================================================================
+    # SEARCH CONFIG
+    # ============================================================================
+    DEFAULT_TOP_N = 10
+    MAX_TOP_N = 50
+    SEMANTIC_WEIGHT = 0.6  # 60% semantic, 40% keyword
+    # FAISS fetches top_n * SEMANTIC_OVERSAMPLE neighbours per search (0: all listings)
+    SEMANTIC_OVERSAMPLE = int(os.getenv('SEMANTIC_OVERSAMPLE', 20))
+    
+    # Concurrent queries are coalesced into one FAISS search call
+    SEARCH_BATCH_MAX_SIZE = int(os.getenv('SEARCH_BATCH_MAX_SIZE', 32))
+    SEARCH_BATCH_MAX_WAIT_MS = float(os.getenv('SEARCH_BATCH_MAX_WAIT_MS', 5))
+    ENCODER_BATCH_MAX_SIZE = int(os.getenv('ENCODER_BATCH_MAX_SIZE', 32))
+    ENCODER_BATCH_MAX_WAIT_MS = float(os.getenv('ENCODER_BATCH_MAX_WAIT_MS', 5))
+    
+    # The training corpus is embedded in fixed-size chunks to bound peak memory
+    EMBED_BATCH_SIZE = int(os.getenv('EMBED_BATCH_SIZE', 256))
+    
+    # Search result cache: exact repeats, then near-duplicate query embeddings
+    SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', 4096))
+    SEARCH_SEMANTIC_CACHE_SIZE = int(os.getenv('SEARCH_SEMANTIC_CACHE_SIZE', 2048))
+    SEARCH_SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEARCH_SEMANTIC_CACHE_THRESHOLD', 0.97))
+    AUTOCOMPLETE_CACHE_SIZE = int(os.getenv('AUTOCOMPLETE_CACHE_SIZE', 8192))
+    RECOMMEND_CACHE_SIZE = int(os.getenv('RECOMMEND_CACHE_SIZE', 4096))
+    
+    # ============================================================================
+    # AUTO-RETRAIN CONFIG (Disabled for Cloud Run, optional for Compute Engine)
+    # ============================================================================
+    AUTO_RETRAIN = os.getenv('AUTO_RETRAIN', 'False').lower() == 'true'
+    CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', 3600))  # 1 hour
+    
+    # API workers pick up models written by scripts/retrain_worker.py
+    MODEL_RELOAD_INTERVAL = int(os.getenv('MODEL_RELOAD_INTERVAL', 30))
+    
+    # ============================================================================
+    # CORS CONFIG
+    # ============================================================================
+    ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*').split(',')
+
+    # ============================================================================
+    # ADMIN / SECURITY
+    # ============================================================================
+    # If set, admin endpoints require header: X-Admin-API-Key: <value>
+    # If empty, admin endpoints will be effectively disabled (return 401).
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY', '')
+    
+    # ============================================================================
+    # CACHE CONFIG (Cloud Run specific)
+    # ============================================================================
+    # Cloud Run instances can be reused, cache models in memory
+    CACHE_MODELS_IN_MEMORY = True
+    
+    # ============================================================================
+    # DEPLOYMENT INFO
+    # ============================================================================
+    DEPLOYMENT_ENV = os.getenv('DEPLOYMENT_ENV', 'development')  # development, cloud-run, compute-engine
+    # The environment does not change while the process runs; resolve once
+    IS_CLOUD_RUN = DEPLOYMENT_ENV == 'cloud-run' or os.getenv('K_SERVICE') is not None
+    
+    @classmethod
+    def is_cloud_run(cls):
+        """
+        Check if the application is running on Google Cloud Run.
+        
+        Returns:
+            bool: True if running on Cloud Run, False otherwise.
+            
+        Note:
+            Detection is based on DEPLOYMENT_ENV or the presence of K_SERVICE environment variable,
+            evaluated once at import (see IS_CLOUD_RUN).
+        """
+        return cls.IS_CLOUD_RUN
+    
+    @classmethod
+    def is_compute_engine(cls):
+        """
+        Check if the application is running on Google Compute Engine.
+        
+        Returns:
+            bool: True if running on Compute Engine, False otherwise.
+        """
+        return cls.DEPLOYMENT_ENV == 'compute-engine'
+    
+    @classmethod
+    def should_use_gcs(cls):
+        """
+        Determine if Google Cloud Storage should be used for model storage.
+        
+        Returns:
+            bool: True if GCS should be used, False otherwise.
+            
+        Note:
+            GCS is used when STORAGE_TYPE is 'gcs' and a bucket name is configured.
+        """
+        return cls.STORAGE_TYPE == 'gcs' and cls.GCS_BUCKET
+
+
+# Global configuration instance
+config = Config()
+
+# Read on every search/health request: bind once so routes use plain globals
+DEFAULT_TOP_N = config.DEFAULT_TOP_N
+MAX_TOP_N = config.MAX_TOP_N
+SEMANTIC_WEIGHT = config.SEMANTIC_WEIGHT
+IS_CLOUD_RUN = config.IS_CLOUD_RUN
@@ -1,13 +1,13 @@
-"""
-Models Module
-
-This module contains machine learning model management functionality,
-including loading, training, and storage of models.
-
-Modules:
-    model_manager: ML model management and operations.
-"""
-
-from .model_manager import ModelManager
-
-__all__ = ['ModelManager']
+"""
+Models Module
+
+This module contains machine learning model management functionality,
+including loading, training, and storage of models.
+
+Modules:
+    model_manager: ML model management and operations.
+"""
+
+from .model_manager import ModelManager
+
+__all__ = ['ModelManager']
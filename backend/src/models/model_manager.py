@@ -1,342 +1,826 @@
-"""
-Model Manager for GCP Deployment
-Supports both Cloud Storage and local disk storage
-"""
-
-import os
-import json
-import pickle
-import logging
-import numpy as np
-import tensorflow_hub as hub
-import faiss
-from sklearn.feature_extraction.text import TfidfVectorizer
-from threading import Lock
-from pathlib import Path
-from datetime import datetime, UTC
-from ..core.config import config
-from ..services.gcs_storage_service import GCSStorageService
-
-logger = logging.getLogger(__name__)
-
-class ModelManager:
-    """
-    Manages ML models with GCS or local storage
-    """
-    
-    def __init__(self):
-        self.use_model = None
-        self.tfidf_vectorizer = None
-        self.faiss_index = None
-        self.embeddings = None
-        self.model_lock = Lock()
-        self.metadata = {}
-        
-        # Create models directory
-        Path(config.MODELS_DIR).mkdir(parents=True, exist_ok=True)
-        logger.info(f"Models directory: {config.MODELS_DIR}")
-        
-        # Initialize GCS if enabled
-        self.gcs_storage = None
-        if config.should_use_gcs():
-            try:
-                logger.info("Initializing GCS storage...")
-                self.gcs_storage = GCSStorageService(
-                    bucket_name=config.GCS_BUCKET,
-                    project=config.GCS_PROJECT,
-                    prefix=config.GCS_PREFIX
-                )
-                if not self.gcs_storage.is_available():
-                    logger.warning("⚠ GCS not available, using local storage only")
-                    self.gcs_storage = None
-                else:
-                    logger.info(f"✓ GCS storage initialized: gs://{config.GCS_BUCKET}/{config.GCS_PREFIX}")
-            except Exception as e:
-                logger.warning(f"GCS initialization failed: {e}")
-                logger.warning("Continuing with local storage only")
-                self.gcs_storage = None
-        else:
-            logger.info("GCS disabled, using local storage only")
-    
-    def load_models(self) -> bool:
-        """
-        Load models from GCS or local storage
-        
-        Priority:
-        1. Download from GCS if available (source of truth)
-        2. Try local cache
-        3. Return False if not found anywhere (caller can train from scratch)
-        
-        Returns:
-            True if successful
-        """
-        try:
-            # Strategy 1: Download from GCS and load (preferred)
-            if self.gcs_storage and self.gcs_storage.is_available():
-                logger.info("🔍 Checking GCS for models...")
-                if self.gcs_storage.models_exist():
-                    logger.info("📥 Downloading models from GCS...")
-                    if self.gcs_storage.download_models(config.MODELS_DIR):
-                        logger.info("✓ Models downloaded from GCS")
-                        return self._load_models_locally()
-                    else:
-                        logger.error("❌ Failed to download models from GCS")
-                else:
-                    logger.warning("⚠ Models not found in GCS")
-
-            # Strategy 2: Try loading from local cache (fallback)
-            if self._models_exist_locally():
-                logger.info("📂 Loading models from local cache...")
-                return self._load_models_locally()
-            
-            logger.warning("⚠ No models found in local cache or GCS")
-            logger.info("💡 You need to train models first:")
-            logger.info("   1. Run: python train_models.py")
-            logger.info("   2. Run: ./upload_models.sh")
-            return False
-            
-        except Exception as e:
-            logger.error(f"Model load failed: {e}", exc_info=True)
-            return False
-    
-    def _models_exist_locally(self) -> bool:
-        """Check if all required model files exist locally"""
-        required_files = [
-            config.TFIDF_MODEL_PATH,
-            config.FAISS_INDEX_PATH,
-            config.METADATA_PATH,
-            config.FAISS_INDEX_PATH.replace('.bin', '.npy'),  # embeddings
-        ]
-        
-        exists = all(os.path.exists(f) for f in required_files)
-        
-        if exists:
-            logger.info("✓ All model files found locally")
-            # Show sizes
-            for f in required_files:
-                size_mb = os.path.getsize(f) / 1024 / 1024
-                logger.info(f"  - {Path(f).name}: {size_mb:.1f}MB")
-        else:
-            logger.debug("Some model files missing locally")
-            for f in required_files:
-                if not os.path.exists(f):
-                    logger.debug(f"  Missing: {Path(f).name}")
-        
-        return exists
-    
-    def _load_models_locally(self) -> bool:
-        """Load models from local disk"""
-        try:
-            with self.model_lock:
-                logger.info("Loading ML models into memory...")
-                
-                # Load USE model (downloads on first use, then cached by TF Hub)
-                logger.info("  Loading Universal Sentence Encoder...")
-                self.use_model = hub.load(config.USE_EMBEDDINGS_PATH)
-                logger.info("    ✓ USE model loaded")
-                
-                # Load TF-IDF
-                logger.info("  Loading TF-IDF vectorizer...")
-                with open(config.TFIDF_MODEL_PATH, 'rb') as f:
-                    self.tfidf_vectorizer = pickle.load(f)
-                logger.info(f"    ✓ TF-IDF loaded ({len(self.tfidf_vectorizer.get_feature_names_out())} features)")
-                
-                # Load FAISS index
-                logger.info("  Loading FAISS index...")
-                self.faiss_index = faiss.read_index(config.FAISS_INDEX_PATH)
-                logger.info(f"    ✓ FAISS index loaded ({self.faiss_index.ntotal} vectors)")
-                
-                # Load embeddings
-                logger.info("  Loading embeddings...")
-                embeddings_path = config.FAISS_INDEX_PATH.replace('.bin', '.npy')
-                self.embeddings = np.load(embeddings_path)
-                logger.info(f"    ✓ Embeddings loaded (shape: {self.embeddings.shape})")
-                
-                # Load metadata
-                with open(config.METADATA_PATH, 'r') as f:
-                    self.metadata = json.load(f)
-                logger.info(f"    ✓ Metadata loaded (trained on {self.metadata.get('num_texts', 'unknown')} texts)")
-                
-                logger.info("✓ All models loaded successfully into memory")
-                return True
-                
-        except Exception as e:
-            logger.error(f"Local model load failed: {e}", exc_info=True)
-            return False
-    
-    def initialize_models(self, texts: list) -> None:
-        """
-        Initialize/train models from scratch and save to storage
-        
-        Args:
-            texts: List of training texts
-        """
-        with self.model_lock:
-            try:
-                logger.info("="*70)
-                logger.info("🚀 INITIALIZING ML MODELS FROM SCRATCH")
-                logger.info("="*70)
-                logger.info(f"Training on {len(texts)} texts")
-                logger.info("This will take 2-5 minutes...")
-                logger.info("")
-                
-                # 1. Load USE model
-                if self.use_model is None:
-                    logger.info("1/4 Loading Universal Sentence Encoder...")
-                    logger.info("    (First time: downloading ~1GB model, may take 30-60s)")
-                    self.use_model = hub.load(config.USE_EMBEDDINGS_PATH)
-                    logger.info("    ✓ USE model loaded")
-                else:
-                    logger.info("1/4 USE model already loaded")
-                
-                # 2. Generate embeddings
-                logger.info("")
-                logger.info(f"2/4 Generating embeddings for {len(texts)} texts...")
-                logger.info("    (This may take 1-3 minutes)")
-                self.embeddings = self.use_model(texts).numpy().astype("float32")
-                faiss.normalize_L2(self.embeddings)
-                logger.info(f"    ✓ Embeddings generated (shape: {self.embeddings.shape})")
-                
-                # 3. Build FAISS index
-                logger.info("")
-                logger.info("3/4 Building FAISS index...")
-                dimension = self.embeddings.shape[1]
-                self.faiss_index = faiss.IndexFlatIP(dimension)
-                self.faiss_index.add(self.embeddings)
-                logger.info(f"    ✓ FAISS index built ({self.faiss_index.ntotal} vectors)")
-                
-                # 4. Train TF-IDF
-                logger.info("")
-                logger.info("4/4 Training TF-IDF vectorizer...")
-                self.tfidf_vectorizer = TfidfVectorizer(
-                    max_features=500,
-                    ngram_range=(1, 2),
-                    stop_words='english',
-                    min_df=1
-                )
-                self.tfidf_vectorizer.fit(texts)
-                logger.info(f"    ✓ TF-IDF trained ({len(self.tfidf_vectorizer.get_feature_names_out())} features)")
-                
-                # 5. Save models locally
-                logger.info("")
-                self._save_models_locally(texts)
-                
-                # 6. Upload to GCS if enabled
-                if self.gcs_storage and self.gcs_storage.is_available():
-                    logger.info("")
-                    logger.info("📤 Uploading models to GCS...")
-                    if self.gcs_storage.upload_models(config.MODELS_DIR):
-                        logger.info("✓ Models backed up to GCS")
-                    else:
-                        logger.warning("⚠ GCS upload failed (models saved locally only)")
-                
-                logger.info("")
-                logger.info("="*70)
-                logger.info("✅ MODEL INITIALIZATION COMPLETE")
-                logger.info("="*70)
-                
-            except Exception as e:
-                logger.error(f"❌ Model initialization failed: {e}", exc_info=True)
-                raise
-    
-    def _save_models_locally(self, texts: list):
-        """Save models to local storage"""
-        logger.info("💾 Saving models to local storage...")
-        
-        try:
-            # Save TF-IDF
-            logger.info("  Saving TF-IDF vectorizer...")
-            with open(config.TFIDF_MODEL_PATH, 'wb') as f:
-                pickle.dump(self.tfidf_vectorizer, f)
-            size_mb = os.path.getsize(config.TFIDF_MODEL_PATH) / 1024 / 1024
-            logger.info(f"    ✓ TF-IDF saved ({size_mb:.1f}MB)")
-            
-            # Save FAISS
-            logger.info("  Saving FAISS index...")
-            faiss.write_index(self.faiss_index, config.FAISS_INDEX_PATH)
-            size_mb = os.path.getsize(config.FAISS_INDEX_PATH) / 1024 / 1024
-            logger.info(f"    ✓ FAISS index saved ({size_mb:.1f}MB)")
-            
-            # Save embeddings
-            logger.info("  Saving embeddings...")
-            embeddings_path = config.FAISS_INDEX_PATH.replace('.bin', '.npy')
-            np.save(embeddings_path, self.embeddings)
-            size_mb = os.path.getsize(embeddings_path) / 1024 / 1024
-            logger.info(f"    ✓ Embeddings saved ({size_mb:.1f}MB)")
-            
-            # Save metadata
-            logger.info("  Saving metadata...")
-            self.metadata.update({
-                'num_texts': len(texts),
-                'saved_at': datetime.now(UTC).isoformat(),
-                'storage_type': 'gcs' if self.gcs_storage else 'local',
-                'deployment_env': config.DEPLOYMENT_ENV,
-                'gcs_bucket': config.GCS_BUCKET if self.gcs_storage else None
-            })
-            with open(config.METADATA_PATH, 'w') as f:
-                json.dump(self.metadata, f, indent=2)
-            logger.info("    ✓ Metadata saved")
-            
-            # Calculate total size
-            total_size = sum([
-                os.path.getsize(config.TFIDF_MODEL_PATH),
-                os.path.getsize(config.FAISS_INDEX_PATH),
-                os.path.getsize(embeddings_path),
-                os.path.getsize(config.METADATA_PATH)
-            ]) / 1024 / 1024
-            
-            logger.info(f"  ✓ Total model size: {total_size:.1f}MB")
-            logger.info(f"  ✓ Models saved to: {config.MODELS_DIR}")
-            
-        except Exception as e:
-            logger.error(f"Save failed: {e}", exc_info=True)
-            raise
-    
-    def get_storage_info(self) -> dict:
-        """Get storage information"""
-        info = {
-            'storage_type': 'GCS' if (self.gcs_storage and self.gcs_storage.is_available()) else 'Local Only',
-            'deployment_env': config.DEPLOYMENT_ENV,
-            'local_models_dir': config.MODELS_DIR,
-            'local_size': self._get_local_size(),
-            'models_loaded': all([
-                self.use_model is not None,
-                self.tfidf_vectorizer is not None,
-                self.faiss_index is not None,
-                self.embeddings is not None
-            ]),
-            'model_details': {}
-        }
-        
-        if self.tfidf_vectorizer:
-            info['model_details']['tfidf_features'] = len(self.tfidf_vectorizer.get_feature_names_out())
-        
-        if self.faiss_index:
-            info['model_details']['faiss_vectors'] = self.faiss_index.ntotal
-        
-        if self.embeddings is not None:
-            info['model_details']['embeddings_shape'] = self.embeddings.shape
-        
-        if self.metadata:
-            info['model_details']['metadata'] = self.metadata
-        
-        if self.gcs_storage and self.gcs_storage.is_available():
-            info['gcs'] = self.gcs_storage.get_storage_info()
-        
-        return info
-    
-    def _get_local_size(self) -> str:
-        """Get total local models size"""
-        try:
-            total_size = 0
-            models_path = Path(config.MODELS_DIR)
-            
-            if models_path.exists():
-                for file in models_path.glob('*'):
-                    if file.is_file():
-                        total_size += file.stat().st_size
-            
-            return f"{total_size / 1024 / 1024:.1f}MB"
-        except Exception as e:
-            logger.error(f"Error calculating local size: {e}")
+"""
+Model Manager for GCP Deployment
+Supports both Cloud Storage and local disk storage
+"""
+
+import os
+import json
+import time
+import pickle
+import logging
+import numpy as np
+import scipy.sparse
+import tensorflow_hub as hub
+import faiss
+from joblib import Parallel, delayed
+from concurrent.futures import Future, ThreadPoolExecutor
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+from threading import Lock
+from pathlib import Path
+from datetime import datetime, UTC
+from ..core.config import config
+
+logger = logging.getLogger(__name__)
+
+# Texts per parallel hashing job when training the TF-IDF model
+TFIDF_CHUNK_SIZE = 10000
+
+# Stored embeddings are L2-normalized, so int8 codes are components * 127
+EMBEDDING_INT8_SCALE = 127.0
+
+# Tokenization settings of the hashed TF-IDF model (stored in metadata.json)
+TFIDF_HASHING_PARAMS = {'ngram_range': [1, 2], 'stop_words': 'english', 'lowercase': True}
+
+# Buffer size for reading legacy pickled TF-IDF models
+PICKLE_BUFFER_SIZE = 1024 * 1024
+
+# Read-only zero-copy mapping of the index file (IO_FLAG_MMAP_IFC needs faiss >= 1.8)
+FAISS_MMAP_FLAGS = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+class HashedTfidf:
+    """
+    Hashed TF-IDF keyword model.
+    
+    Terms are hashed (HashingVectorizer), so the only fitted state is the IDF
+    vector: the model is persisted as a plain .npy array plus the hashing
+    settings instead of a pickled sklearn object.
+    """
+    
+    def __init__(self, idf: np.ndarray, n_features: int, **hashing_params):
+        self.idf = idf
+        self.hashing_params = {'n_features': n_features, **hashing_params}
+        self.hashing = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=tuple(hashing_params['ngram_range']),
+            stop_words=hashing_params['stop_words'],
+            lowercase=hashing_params['lowercase'],
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32
+        )
+    
+    @property
+    def n_features(self) -> int:
+        return len(self.idf)
+    
+    def transform(self, texts: list) -> scipy.sparse.csr_matrix:
+        """Hash texts into term counts, weight them by IDF and L2-normalize the rows."""
+        counts = self.hashing.transform(texts)
+        counts.data *= self.idf[counts.indices]
+        return normalize(counts, copy=False)
+
+class ModelManager:
+    """
+    Manages ML models with GCS or local storage
+    """
+    
+    def __init__(self):
+        # Loaded on first access of use_model, see there
+        self._use_model = None
+        # USE load started by load_models() while the other files download
+        self._use_model_future = None
+        self._use_lock = Lock()
+        self.tfidf_vectorizer = None
+        self.faiss_index = None
+        self.faiss_index_gpu = None
+        self.embeddings = None
+        # Guards reading and swapping the model attributes; it is never held
+        # across I/O, training or inference. Published models are only read,
+        # so searches take a reference under the lock and run outside it.
+        self.model_lock = Lock()
+        self._update_lock = Lock()
+        self._gpu_resources = None
+        self._gpu_index_pid = None
+        # st_mtime_ns of the metadata file the in-memory models came from
+        self._models_mtime_ns = None
+        self._next_reload_check = 0.0
+        self._reload_lock = Lock()
+        # (monotonic expiry, local size, GCS info) from the last storage probe
+        self._storage_probe = (0.0, None, None)
+        self.metadata = {}
+        
+        # Create models directory
+        Path(config.MODELS_DIR).mkdir(parents=True, exist_ok=True)
+        logger.info(f"Models directory: {config.MODELS_DIR}")
+        
+        # Initialize GCS if enabled
+        self.gcs_storage = None
+        if config.should_use_gcs():
+            try:
+                logger.info("Initializing GCS storage...")
+                # Imported here: the GCS client libraries are only loaded when GCS is used
+                from ..services.gcs_storage_service import GCSStorageService
+                self.gcs_storage = GCSStorageService(
+                    bucket_name=config.GCS_BUCKET,
+                    project=config.GCS_PROJECT,
+                    prefix=config.GCS_PREFIX,
+                    max_workers=config.GCS_MAX_WORKERS
+                )
+                if not self.gcs_storage.is_available():
+                    logger.warning("⚠ GCS not available, using local storage only")
+                    self.gcs_storage = None
+                else:
+                    logger.info(f"✓ GCS storage initialized: gs://{config.GCS_BUCKET}/{config.GCS_PREFIX}")
+            except Exception as e:
+                logger.warning(f"GCS initialization failed: {e}")
+                logger.warning("Continuing with local storage only")
+                self.gcs_storage = None
+        else:
+            logger.info("GCS disabled, using local storage only")
+    
+    def load_models(self) -> bool:
+        """
+        Load models from GCS or local storage
+        
+        Priority:
+        1. Download from GCS if available (source of truth)
+        2. Try local cache
+        3. Return False if not found anywhere (caller can train from scratch)
+        
+        Returns:
+            True if successful
+        """
+        # The TF Hub download of USE is independent of the model files: start
+        # it now so it overlaps the GCS download
+        if config.USE_PRELOAD and self._use_model is None and self._use_model_future is None:
+            pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='use-load')
+            self._use_model_future = pool.submit(hub.load, config.USE_EMBEDDINGS_PATH)
+            pool.shutdown(wait=False)
+        
+        try:
+            # Strategy 1: Download from GCS and load (preferred)
+            if self.gcs_storage and self.gcs_storage.is_available():
+                logger.info("🔍 Checking GCS for models...")
+                if self.gcs_storage.models_exist():
+                    logger.info("📥 Downloading models from GCS...")
+                    if self.gcs_storage.download_models(config.MODELS_DIR):
+                        logger.info("✓ Models downloaded from GCS")
+                        return self._load_models_locally()
+                    else:
+                        logger.error("❌ Failed to download models from GCS")
+                else:
+                    logger.warning("⚠ Models not found in GCS")
+
+            # Strategy 2: Try loading from local cache (fallback)
+            if self._models_exist_locally():
+                logger.info("📂 Loading models from local cache...")
+                return self._load_models_locally()
+            
+            logger.warning("⚠ No models found in local cache or GCS")
+            logger.info("💡 You need to train models first:")
+            logger.info("   1. Run: python train_models.py")
+            logger.info("   2. Run: ./upload_models.sh")
+            return False
+            
+        except Exception as e:
+            logger.error(f"Model load failed: {e}", exc_info=True)
+            return False
+    
+    def _models_exist_locally(self) -> bool:
+        """Check if all required model files exist locally"""
+        # Models saved before the IDF-only format still have the pickle
+        tfidf_path = (config.TFIDF_IDF_PATH if os.path.exists(config.TFIDF_IDF_PATH)
+                      else config.TFIDF_MODEL_PATH)
+        required_files = [
+            tfidf_path,
+            config.FAISS_INDEX_PATH,
+            config.METADATA_PATH,
+            config.FAISS_INDEX_PATH.replace('.bin', '.npy'),  # embeddings
+        ]
+        
+        exists = all(os.path.exists(f) for f in required_files)
+        
+        if exists:
+            logger.info("✓ All model files found locally")
+            # Show sizes
+            for f in required_files:
+                size_mb = os.path.getsize(f) / 1024 / 1024
+                logger.info(f"  - {Path(f).name}: {size_mb:.1f}MB")
+        else:
+            logger.debug("Some model files missing locally")
+            for f in required_files:
+                if not os.path.exists(f):
+                    logger.debug(f"  Missing: {Path(f).name}")
+        
+        return exists
+    
+    def _load_models_locally(self) -> bool:
+        """
+        Load models from local disk.
+        
+        Files are read without holding model_lock, so searches keep using
+        the current models; the new set is swapped in at the end.
+        """
+        try:
+            with self._update_lock:
+                logger.info("Loading ML models into memory...")
+                
+                # USE is not loaded here: it is loaded on first use (see
+                # use_model), and reloads keep the fixed pre-trained model
+                
+                # Load metadata (it also holds the TF-IDF hashing settings)
+                mtime_ns = self._metadata_mtime_ns()
+                with open(config.METADATA_PATH, 'r') as f:
+                    metadata = json.load(f)
+                
+                # Load TF-IDF
+                logger.info("  Loading TF-IDF vectorizer...")
+                tfidf_vectorizer = self._load_tfidf(metadata)
+                logger.info(f"    ✓ TF-IDF loaded ({self._tfidf_num_features(tfidf_vectorizer)} features)")
+                
+                # Load FAISS index
+                logger.info("  Loading FAISS index...")
+                faiss_index = self._read_faiss_index(config.FAISS_INDEX_PATH)
+                logger.info(f"    ✓ FAISS index loaded ({faiss_index.ntotal} vectors)")
+                
+                # Load embeddings
+                logger.info("  Loading embeddings...")
+                embeddings_path = config.FAISS_INDEX_PATH.replace('.bin', '.npy')
+                embeddings = self._load_embeddings(embeddings_path)
+                logger.info(f"    ✓ Embeddings loaded (shape: {embeddings.shape})")
+                
+                logger.info(f"    ✓ Metadata loaded (trained on {metadata.get('num_texts', 'unknown')} texts)")
+                
+                with self.model_lock:
+                    self.metadata = metadata
+                    self.tfidf_vectorizer = tfidf_vectorizer
+                    self.faiss_index = faiss_index
+                    self._gpu_index_pid = None  # GPU copy is rebuilt on next search
+                    self.embeddings = embeddings
+                    self._models_mtime_ns = mtime_ns
+                
+                logger.info("✓ All models loaded successfully into memory")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Local model load failed: {e}", exc_info=True)
+            return False
+    
+    def initialize_models(self, texts: list) -> None:
+        """
+        Initialize/train models from scratch and save to storage
+        
+        Training runs without holding model_lock, so the current models keep
+        serving searches until the new ones are swapped in.
+        
+        Args:
+            texts: List of training texts
+        """
+        with self._update_lock:
+            try:
+                logger.info("="*70)
+                logger.info("🚀 INITIALIZING ML MODELS FROM SCRATCH")
+                logger.info("="*70)
+                logger.info(f"Training on {len(texts)} texts")
+                logger.info("This will take 2-5 minutes...")
+                logger.info("")
+                
+                # 1. Load USE model
+                if not self.use_model_loaded:
+                    logger.info("1/4 Loading Universal Sentence Encoder...")
+                    logger.info("    (First time: downloading ~1GB model, may take 30-60s)")
+                    self.load_use_model()
+                else:
+                    logger.info("1/4 USE model already loaded")
+                
+                # 2. Generate embeddings
+                logger.info("")
+                logger.info(f"2/4 Generating embeddings for {len(texts)} texts...")
+                logger.info("    (This may take 1-3 minutes)")
+                embeddings = self._embed_texts(texts)
+                logger.info(f"    ✓ Embeddings generated (shape: {embeddings.shape})")
+                
+                # 3. Build FAISS index
+                logger.info("")
+                logger.info("3/4 Building FAISS index...")
+                faiss_index = self._build_faiss_index(embeddings)
+                embeddings = self._quantize_embeddings(embeddings)
+                logger.info(f"    ✓ FAISS index built ({faiss_index.ntotal} vectors)")
+                
+                # 4. Train TF-IDF
+                logger.info("")
+                logger.info("4/4 Training TF-IDF vectorizer...")
+                tfidf_vectorizer = self._fit_tfidf(texts)
+                logger.info(f"    ✓ TF-IDF trained ({self._tfidf_num_features(tfidf_vectorizer)} features)")
+                
+                with self.model_lock:
+                    self.tfidf_vectorizer = tfidf_vectorizer
+                    self.faiss_index = faiss_index
+                    self._gpu_index_pid = None  # GPU copy is rebuilt on next search
+                    self.embeddings = embeddings
+                
+                # 5. Save models locally
+                logger.info("")
+                self._save_models_locally(texts)
+                
+                # Serve from the saved file so the index pages live in the
+                # page cache, shared by forked workers, not in this heap
+                if config.FAISS_USE_MMAP:
+                    faiss_index = self._read_faiss_index(config.FAISS_INDEX_PATH)
+                    embeddings = self._load_embeddings(config.FAISS_INDEX_PATH.replace('.bin', '.npy'))
+                    with self.model_lock:
+                        self.faiss_index = faiss_index
+                        self._gpu_index_pid = None
+                        self.embeddings = embeddings
+                
+                # 6. Upload to GCS if enabled
+                if self.gcs_storage and self.gcs_storage.is_available():
+                    logger.info("")
+                    logger.info("📤 Uploading models to GCS...")
+                    if self.gcs_storage.upload_models(config.MODELS_DIR):
+                        logger.info("✓ Models backed up to GCS")
+                    else:
+                        logger.warning("⚠ GCS upload failed (models saved locally only)")
+                
+                logger.info("")
+                logger.info("="*70)
+                logger.info("✅ MODEL INITIALIZATION COMPLETE")
+                logger.info("="*70)
+                
+            except Exception as e:
+                logger.error(f"❌ Model initialization failed: {e}", exc_info=True)
+                raise
+    
+    @property
+    def use_model(self):
+        """
+        The Universal Sentence Encoder, loaded on first access.
+        
+        Only query encoding and training need USE; the TF-IDF and FAISS
+        models load and serve without it. With USE_PRELOAD, load_models()
+        starts the load in the background and warmup() waits for it.
+        USE is never replaced once loaded, so callers need no lock.
+        """
+        use_model = self._use_model
+        if use_model is None:
+            use_model = self.load_use_model()
+        return use_model
+    
+    def load_use_model(self):
+        """Load USE unless it is loaded already, and return it."""
+        with self._use_lock:
+            if self._use_model is None:
+                logger.info("  Loading Universal Sentence Encoder...")
+                self._use_model = self._load_use_model()
+                logger.info("    ✓ USE model loaded")
+            return self._use_model
+    
+    @property
+    def use_model_loaded(self) -> bool:
+        """Whether USE is loaded (without loading it)."""
+        return self._use_model is not None
+    
+    @property
+    def use_model_status(self) -> str:
+        """
+        USE state for health reports: 'loaded', 'lazy' or 'not loaded'.
+        
+        Without USE_PRELOAD an unloaded USE is expected ('lazy'): it loads
+        on the first query that needs it, and the service is ready without it.
+        """
+        if self.use_model_loaded:
+            return 'loaded'
+        return 'not loaded' if config.USE_PRELOAD else 'lazy'
+    
+    def _load_use_model(self):
+        """Load USE, or wait for the load started by load_models()."""
+        future: Future = self._use_model_future
+        self._use_model_future = None
+        if future is not None:
+            return future.result()
+        return hub.load(config.USE_EMBEDDINGS_PATH)
+    
+    def _embed_texts(self, texts: list) -> np.ndarray:
+        """
+        Encode the corpus with USE in chunks of config.EMBED_BATCH_SIZE texts.
+        
+        Batches are written into one preallocated float32 matrix, so peak
+        memory holds a single batch's tensors rather than the whole corpus
+        twice. Each batch is L2-normalized in place right after it is
+        written, while its rows are still in cache, instead of in a second
+        pass over the whole matrix.
+        """
+        batch_size = max(1, config.EMBED_BATCH_SIZE)
+        embeddings = None
+        for start in range(0, len(texts), batch_size):
+            batch = self.use_model(texts[start:start + batch_size]).numpy()
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            rows = embeddings[start:start + len(batch)]  # Contiguous view
+            rows[:] = batch
+            faiss.normalize_L2(rows)
+        return embeddings
+    
+    @staticmethod
+    def _build_faiss_index(embeddings: np.ndarray) -> faiss.Index:
+        """
+        Build the FAISS index for L2-normalized embeddings.
+        
+        Small catalogs get a brute-force index from FAISS_SMALL_INDEX_FACTORY:
+        int8 scalar-quantized codes ("SQ8") by default, or an exact "Flat"
+        index (the correctness oracle for the compressed index). From
+        FAISS_IVF_MIN_VECTORS vectors on, the same codes are partitioned into
+        4 * sqrt(N) IVF lists so a query scans only FAISS_NPROBE of them. From
+        FAISS_ANN_MIN_VECTORS vectors on, the index is built from
+        FAISS_INDEX_FACTORY. All are trained on the embeddings if needed.
+        """
+        num_vectors, dimension = embeddings.shape
+        
+        if num_vectors < config.FAISS_IVF_MIN_VECTORS:
+            factory = config.FAISS_SMALL_INDEX_FACTORY
+            logger.info(f"    Using brute-force index '{factory}' ({num_vectors} vectors)")
+        elif num_vectors < config.FAISS_ANN_MIN_VECTORS:
+            nlist = int(4 * np.sqrt(num_vectors))
+            factory = f"IVF{nlist},{config.FAISS_SMALL_INDEX_FACTORY}"
+            logger.info(f"    Using IVF index '{factory}' ({num_vectors} vectors)")
+        else:
+            factory = config.FAISS_INDEX_FACTORY
+            logger.info(f"    Using ANN index '{factory}' ({num_vectors} vectors)")
+        
+        index = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+        if not index.is_trained:
+            index.train(embeddings)
+        
+        index.add(embeddings)
+        ModelManager._configure_faiss_index(index)
+        return index
+    
+    @staticmethod
+    def _read_faiss_index(path: str) -> faiss.Index:
+        """
+        Read a FAISS index from disk, memory-mapped when FAISS_USE_MMAP is set.
+        
+        A mapped index is read-only: it must not be modified (no add/train)
+        after loading. Index types that cannot be mapped are read normally.
+        """
+        index = None
+        if config.FAISS_USE_MMAP:
+            try:
+                index = faiss.read_index(path, FAISS_MMAP_FLAGS)
+            except RuntimeError as e:
+                logger.warning(f"    Cannot memory-map FAISS index, reading it into memory: {e}")
+        
+        if index is None:
+            index = faiss.read_index(path)
+        
+        ModelManager._configure_faiss_index(index)
+        return index
+    
+    @staticmethod
+    def _configure_faiss_index(index: faiss.Index) -> None:
+        """Apply search-time parameters (nprobe, efSearch) to IVF and HNSW indexes."""
+        try:
+            faiss.extract_index_ivf(index).nprobe = config.FAISS_NPROBE
+        except RuntimeError:
+            pass  # Not an IVF index (e.g. IndexFlatIP)
+        
+        # efSearch of an HNSW index, or of the HNSW graph over IVF centroids;
+        # the centroid search needs at least nprobe candidates
+        space = faiss.ParameterSpace()
+        for name, value in (
+            ('efSearch', config.FAISS_HNSW_EF_SEARCH),
+            ('quantizer_efSearch', max(config.FAISS_HNSW_EF_SEARCH, config.FAISS_NPROBE)),
+        ):
+            try:
+                space.set_index_parameter(index, name, value)
+            except RuntimeError:
+                pass  # No HNSW graph at that level
+    
+    def warmup(self) -> None:
+        """
+        Run one dummy call through each model used on the request path.
+        
+        TensorFlow builds and optimizes the USE graph on its first call, which
+        otherwise lands on the first user request. Called once at the end of
+        startup (before Gunicorn forks workers when the app is preloaded).
+        USE is only loaded here with USE_PRELOAD.
+        
+        model_lock is only held to take references to the published models;
+        the calls run outside it (as on the request path), so a warmup that
+        races a reload does not stall searches.
+        """
+        use_model = None
+        if config.USE_PRELOAD or self.use_model_loaded:
+            use_model = self.load_use_model()
+        
+        with self.model_lock:
+            vectorizer = self.tfidf_vectorizer
+            index = self.faiss_index
+        
+        vectorizer.transform(["warmup"])
+        if use_model is not None:
+            query_emb = use_model(["warmup"]).numpy().astype("float32")
+            faiss.normalize_L2(query_emb)
+            index.search(query_emb, 1)
+    
+    @classmethod
+    def _load_embeddings(cls, path: str) -> np.ndarray:
+        """
+        Load the listing embeddings, memory-mapped read-only when FAISS_USE_MMAP is set.
+        
+        Only the rows that are used (recommendations) are paged in, and the
+        pages are shared by all worker processes through the page cache.
+        Legacy float32 files are quantized into memory instead.
+        """
+        embeddings = np.load(path, mmap_mode='r' if config.FAISS_USE_MMAP else None)
+        return cls._quantize_embeddings(embeddings)
+    
+    @staticmethod
+    def _quantize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+        """
+        Store L2-normalized float embeddings as int8 (4x smaller).
+        
+        int8 input (already quantized, e.g. loaded from disk) is returned as-is.
+        """
+        if embeddings.dtype == np.int8:
+            return embeddings
+        codes = np.rint(embeddings * EMBEDDING_INT8_SCALE)
+        return np.clip(codes, -127, 127).astype(np.int8)
+    
+    def get_embedding(self, idx: int) -> np.ndarray:
+        """
+        Get the L2-normalized float32 embedding of one listing.
+        
+        Args:
+            idx (int): Row of the listing in the embeddings matrix.
+        
+        Returns:
+            np.ndarray: Embedding of shape (1, d), ready for faiss_index.search.
+        """
+        vector = self.embeddings[idx].astype(np.float32).reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+    
+    @staticmethod
+    def _load_tfidf(metadata: dict):
+        """
+        Load the TF-IDF model saved by _save_models_locally().
+        
+        The IDF vector is memory-mapped like the embeddings. Models saved
+        before the IDF-only format are unpickled from TFIDF_MODEL_PATH.
+        """
+        params = metadata.get('tfidf')
+        if params is None or not os.path.exists(config.TFIDF_IDF_PATH):
+            with open(config.TFIDF_MODEL_PATH, 'rb', buffering=PICKLE_BUFFER_SIZE) as f:
+                return pickle.load(f)
+        
+        idf = np.load(config.TFIDF_IDF_PATH, mmap_mode='r' if config.FAISS_USE_MMAP else None)
+        return HashedTfidf(idf, **params)
+    
+    @staticmethod
+    def _fit_tfidf(texts: list) -> HashedTfidf:
+        """
+        Train the TF-IDF keyword model.
+        
+        Terms are hashed (HashingVectorizer) instead of looked up in a learned
+        vocabulary, so tokenization is stateless and large corpora are hashed
+        in parallel chunks; only the IDF weights (TfidfTransformer) are fitted.
+        The returned model exposes the usual transform(texts) interface.
+        """
+        model = HashedTfidf(
+            np.ones(config.TFIDF_N_FEATURES, dtype=np.float32),
+            config.TFIDF_N_FEATURES,
+            **TFIDF_HASHING_PARAMS
+        )
+        hashing = model.hashing
+        
+        n_chunks = min(os.cpu_count() or 1, max(1, len(texts) // TFIDF_CHUNK_SIZE))
+        if n_chunks > 1:
+            chunks = [texts[i::n_chunks] for i in range(n_chunks)]
+            counts = scipy.sparse.vstack(
+                Parallel(n_jobs=n_chunks)(delayed(hashing.transform)(chunk) for chunk in chunks)
+            )
+        else:
+            counts = hashing.transform(texts)
+        
+        model.idf = TfidfTransformer().fit(counts).idf_.astype(np.float32)
+        return model
+    
+    def _tfidf_num_features(self, model=None) -> int:
+        """Number of features of the TF-IDF model (hashed, or a legacy pickled model)."""
+        model = self.tfidf_vectorizer if model is None else model
+        if isinstance(model, HashedTfidf):
+            return model.n_features
+        if isinstance(model, Pipeline):
+            return len(model.named_steps['tfidf'].idf_)
+        return len(model.vocabulary_)  # get_feature_names_out() would build an O(V) array
+    
+    def get_search_index(self) -> faiss.Index:
+        """
+        Get the FAISS index to search: the GPU copy when available, else the CPU index.
+        
+        The GPU copy is created lazily in each process because CUDA state
+        does not survive the fork of a preloading Gunicorn master. Callers
+        must hold model_lock, and also while searching the GPU copy.
+        """
+        if self._gpu_index_pid != os.getpid():
+            self._gpu_index_pid = os.getpid()
+            self._gpu_resources = None
+            self.faiss_index_gpu = self._mirror_index_to_gpu()
+        
+        return self.faiss_index_gpu if self.faiss_index_gpu is not None else self.faiss_index
+    
+    def _mirror_index_to_gpu(self):
+        """Copy the CPU FAISS index to the configured GPU, or return None."""
+        if (
+            not config.FAISS_USE_GPU
+            or self.faiss_index is None
+            or not hasattr(faiss, 'StandardGpuResources')  # faiss-cpu build
+            or faiss.get_num_gpus() == 0
+        ):
+            return None
+        
+        try:
+            if self._gpu_resources is None:
+                self._gpu_resources = faiss.StandardGpuResources()
+            gpu_index = faiss.index_cpu_to_gpu(
+                self._gpu_resources, config.FAISS_GPU_DEVICE, self.faiss_index
+            )
+            logger.info(f"✓ FAISS index mirrored to GPU {config.FAISS_GPU_DEVICE}")
+            return gpu_index
+        except Exception as e:
+            logger.warning(f"GPU FAISS unavailable, searching on CPU: {e}")
+            return None
+    
+    @staticmethod
+    def _metadata_mtime_ns():
+        """st_mtime_ns of the local metadata file, or None if it does not exist."""
+        try:
+            return os.stat(config.METADATA_PATH).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_updated(self) -> bool:
+        """
+        Reload the local models if another process saved newer ones.
+        
+        Models are written by scripts/retrain_worker.py (or another API
+        process) with metadata.json replaced last, so a changed metadata
+        mtime means a complete new set of files. The check is a single
+        os.stat() and runs at most once per MODEL_RELOAD_INTERVAL seconds;
+        only one thread performs a reload.
+        
+        Returns:
+            bool: True if new models were loaded.
+        """
+        if config.MODEL_RELOAD_INTERVAL <= 0 or time.monotonic() < self._next_reload_check:
+            return False
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        try:
+            self._next_reload_check = time.monotonic() + config.MODEL_RELOAD_INTERVAL
+            mtime_ns = self._metadata_mtime_ns()
+            if mtime_ns is None or mtime_ns == self._models_mtime_ns:
+                return False
+            
+            logger.info("🔄 Newer models found on disk, reloading...")
+            return self._load_models_locally()
+        finally:
+            self._reload_lock.release()
+    
+    @staticmethod
+    def _replace_atomically(path: str, write) -> None:
+        """
+        Write a model file via a temporary sibling and os.replace().
+        
+        Readers (and memory-mapped indexes) never see a partially written
+        file: they get either the old or the new one.
+        """
+        root, ext = os.path.splitext(path)
+        tmp_path = f"{root}.tmp{ext}"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    
+    def _save_models_locally(self, texts: list):
+        """Save models to local storage (metadata.json is replaced last)"""
+        logger.info("💾 Saving models to local storage...")
+        
+        def dump_idf(path):
+            np.save(path, self.tfidf_vectorizer.idf)
+        
+        def dump_metadata(path):
+            with open(path, 'w') as f:
+                json.dump(self.metadata, f, indent=2)
+        
+        embeddings_path = config.FAISS_INDEX_PATH.replace('.bin', '.npy')
+        artifacts = [
+            ("TF-IDF", config.TFIDF_IDF_PATH, dump_idf),
+            ("FAISS index", config.FAISS_INDEX_PATH, lambda path: faiss.write_index(self.faiss_index, path)),
+            ("Embeddings", embeddings_path, lambda path: np.save(path, self.embeddings)),
+        ]
+        
+        try:
+            # Save TF-IDF, FAISS and embeddings concurrently: they are
+            # independent files and the writers release the GIL during I/O
+            logger.info("  Saving TF-IDF, FAISS index and embeddings...")
+            with ThreadPoolExecutor(max_workers=len(artifacts), thread_name_prefix='model-save') as pool:
+                futures = [
+                    pool.submit(self._replace_atomically, path, write) for _, path, write in artifacts
+                ]
+                for (name, path, _), future in zip(artifacts, futures):
+                    future.result()
+                    size_mb = os.path.getsize(path) / 1024 / 1024
+                    logger.info(f"    ✓ {name} saved ({size_mb:.1f}MB)")
+            
+            # Save metadata
+            logger.info("  Saving metadata...")
+            self.metadata.update({
+                'num_texts': len(texts),
+                'saved_at': datetime.now(UTC).isoformat(),
+                'storage_type': 'gcs' if self.gcs_storage else 'local',
+                'deployment_env': config.DEPLOYMENT_ENV,
+                'gcs_bucket': config.GCS_BUCKET if self.gcs_storage else None,
+                'tfidf': self.tfidf_vectorizer.hashing_params
+            })
+            self._replace_atomically(config.METADATA_PATH, dump_metadata)
+            self._models_mtime_ns = self._metadata_mtime_ns()
+            logger.info("    ✓ Metadata saved")
+            
+            # Calculate total size
+            total_size = sum([
+                os.path.getsize(config.TFIDF_IDF_PATH),
+                os.path.getsize(config.FAISS_INDEX_PATH),
+                os.path.getsize(embeddings_path),
+                os.path.getsize(config.METADATA_PATH)
+            ]) / 1024 / 1024
+            
+            logger.info(f"  ✓ Total model size: {total_size:.1f}MB")
+            logger.info(f"  ✓ Models saved to: {config.MODELS_DIR}")
+            
+        except Exception as e:
+            logger.error(f"Save failed: {e}", exc_info=True)
+            raise
+    
+    def get_storage_info(self) -> dict:
+        """
+        Get storage information
+        
+        The in-memory model details are always current; the local directory
+        size and the GCS listing (a network round trip) are cached for
+        STORAGE_INFO_TTL seconds, since /health calls this on every probe.
+        """
+        local_size, gcs_info = self._probe_storage()
+        info = {
+            'storage_type': 'GCS' if (self.gcs_storage and self.gcs_storage.is_available()) else 'Local Only',
+            'deployment_env': config.DEPLOYMENT_ENV,
+            'local_models_dir': config.MODELS_DIR,
+            'local_size': local_size,
+            'models_loaded': all([
+                self.use_model_status != 'not loaded',  # Lazy USE is not awaited
+                self.tfidf_vectorizer is not None,
+                self.faiss_index is not None,
+                self.embeddings is not None
+            ]),
+            'model_details': {}
+        }
+        
+        if self.tfidf_vectorizer:
+            info['model_details']['tfidf_features'] = self._tfidf_num_features()
+        
+        if self.faiss_index:
+            info['model_details']['faiss_vectors'] = self.faiss_index.ntotal
+            info['model_details']['faiss_gpu'] = self.faiss_index_gpu is not None
+        
+        if self.embeddings is not None:
+            info['model_details']['embeddings_shape'] = self.embeddings.shape
+        
+        if self.metadata:
+            info['model_details']['metadata'] = self.metadata
+        
+        if gcs_info is not None:
+            info['gcs'] = gcs_info
+        
+        return info
+    
+    def _probe_storage(self) -> tuple:
+        """Get (local models size, GCS storage info or None), cached for STORAGE_INFO_TTL seconds."""
+        expires, local_size, gcs_info = self._storage_probe
+        now = time.monotonic()
+        if now < expires:
+            return local_size, gcs_info
+        
+        local_size = self._get_local_size()
+        gcs_info = None
+        if self.gcs_storage and self.gcs_storage.is_available():
+            gcs_info = self.gcs_storage.get_storage_info()
+        self._storage_probe = (now + config.STORAGE_INFO_TTL, local_size, gcs_info)
+        return local_size, gcs_info
+    
+    def _get_local_size(self) -> str:
+        """Get total local models size"""
+        try:
+            total_size = 0
+            models_path = Path(config.MODELS_DIR)
+            
+            if models_path.exists():
+                for file in models_path.glob('*'):
+                    if file.is_file():
+                        total_size += file.stat().st_size
+            
+            return f"{total_size / 1024 / 1024:.1f}MB"
+        except Exception as e:
+            logger.error(f"Error calculating local size: {e}")
             return "N/A"
\ No newline at end of file
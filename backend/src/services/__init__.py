@@ -1,16 +1,16 @@
-"""
-Services Module
-
-This module contains business logic services for the Semantic Search API,
-including data management, search functionality, and cloud storage integration.
-
-Modules:
-    data_service: Data loading and management.
-    search_service: Hybrid search functionality.
-    gcs_storage_service: Google Cloud Storage integration.
-"""
-
-from .data_service import DataService
-from .search_service import SearchService
-
-__all__ = ['DataService', 'SearchService']
+"""
+Services Module
+
+This module contains business logic services for the Semantic Search API,
+including data management, search functionality, and cloud storage integration.
+
+Modules:
+    data_service: Data loading and management.
+    search_service: Hybrid search functionality.
+    gcs_storage_service: Google Cloud Storage integration.
+"""
+
+from .data_service import DataService
+from .search_service import SearchService
+
+__all__ = ['DataService', 'SearchService']
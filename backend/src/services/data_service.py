@@ -1,303 +1,819 @@
-"""
-Data Service Module
-
-This module handles data loading, management, and change detection for franchise listings.
-It provides functionality to load data from JSON files, track changes, and extract metadata.
-
-Classes:
-    DataService: Main service class for data management.
-
-Example:
-    >>> from backend.src.services.data_service import DataService
-    >>> service = DataService('dataset.json')
-    >>> if service.load_data():
-    ...     print(f"Loaded {len(service.listings)} listings")
-"""
-
-import json
-import hashlib
-import logging
-from pathlib import Path
-from typing import List, Dict, Set, Any, Optional, Tuple
-
-logger = logging.getLogger(__name__)
-
-
-class DataService:
-    """
-    Manages data loading and change detection for franchise listings.
-    
-    This class handles loading franchise data from JSON files, tracking changes
-    to the data, and extracting metadata such as sectors, tags, and locations.
-    
-    Attributes:
-        data_path (str): Path to the data JSON file.
-        listings (List[Dict]): List of franchise listings loaded from the file.
-        data_hash (str): MD5 hash of the data file for change detection.
-        metadata (Dict[str, Set]): Extracted metadata including sectors, tags, and locations.
-    
-    Example:
-        >>> service = DataService('dataset.json')
-        >>> service.load_data()
-        >>> print(service.metadata['sectors'])
-        {'Food & Beverage', 'Retail', 'Services'}
-    """
-    
-    def __init__(self, data_path: str):
-        """
-        Initialize the DataService.
-        
-        Args:
-            data_path (str): Path to the JSON file containing franchise listings.
-        """
-        self.data_path = data_path
-        self.listings: List[Dict[str, Any]] = []
-        self.data_hash: str = None
-        self.metadata: Dict[str, Set] = {
-            'sectors': set(),
-            'tags': set(),
-            'locations': set()
-        }
-        # Tracks input file format so we can write back in the same shape
-        # - 'array': file is a JSON array
-        # - 'wrapped': file is an object with a 'listings' key
-        self._file_format: str = 'array'
-    
-    def load_data(self) -> bool:
-        """
-        Load franchise listings from the JSON file.
-        
-        This method reads the JSON file, parses the listings, updates the data hash,
-        and extracts metadata. It supports both array format and object format with
-        a 'listings' key.
-        
-        Returns:
-            bool: True if data was loaded successfully, False otherwise.
-            
-        Raises:
-            Exception: Logs error if file reading or parsing fails.
-            
-        Example:
-            >>> service = DataService('dataset.json')
-            >>> success = service.load_data()
-            >>> if success:
-            ...     print(f"Loaded {len(service.listings)} listings")
-        """
-        try:
-            logger.info(f"📖 Loading data from {self.data_path}")
-            
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Support both formats: array or object with 'listings' key
-            if isinstance(data, dict) and 'listings' in data:
-                self.listings = data['listings']
-                self._file_format = 'wrapped'
-            else:
-                self.listings = data
-                self._file_format = 'array'
-            
-            # Update hash and metadata
-            self._update_hash()
-            self._extract_metadata()
-            
-            logger.info(f"✓ Loaded {len(self.listings)} listings")
-            logger.info(
-                f"  - {len(self.metadata['sectors'])} sectors, "
-                f"{len(self.metadata['tags'])} tags, "
-                f"{len(self.metadata['locations'])} locations"
-            )
-            return True
-            
-        except Exception as e:
-            logger.error(f"Data loading failed: {e}", exc_info=True)
-            return False
-
-    def _persist(self) -> None:
-        """
-        Persist the current listings back to disk, preserving the original file shape.
-        """
-        payload: Any
-        if self._file_format == 'wrapped':
-            payload = {"listings": self.listings}
-        else:
-            payload = self.listings
-
-        path = Path(self.data_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-
-        # Refresh hash + metadata after write
-        self._update_hash()
-        self._extract_metadata()
-
-    def _next_id(self) -> int:
-        """
-        Compute next numeric ID based on current listings.
-        """
-        max_id = 0
-        for listing in self.listings:
-            try:
-                max_id = max(max_id, int(listing.get("id", 0)))
-            except Exception:
-                continue
-        return max_id + 1
-
-    def add_listing(self, listing: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Add a new listing, persist to disk, and update in-memory metadata/hash.
-
-        Required fields: title, sector
-        If 'id' is missing, an auto-incremented integer ID is assigned.
-        """
-        if not isinstance(listing, dict):
-            raise ValueError("Listing must be a JSON object")
-
-        title = str(listing.get("title", "")).strip()
-        sector = str(listing.get("sector", "")).strip()
-        if not title or not sector:
-            raise ValueError("Fields 'title' and 'sector' are required")
-
-        # Copy to avoid mutating caller's object
-        new_listing = dict(listing)
-
-        if "id" not in new_listing or new_listing.get("id") in (None, "", 0):
-            new_listing["id"] = self._next_id()
-        else:
-            # Ensure unique
-            existing_ids = {str(x.get("id")) for x in self.listings}
-            if str(new_listing.get("id")) in existing_ids:
-                raise ValueError(f"Listing id '{new_listing.get('id')}' already exists")
-
-        # Normalize tags to list
-        if "tags" in new_listing and new_listing["tags"] is not None and not isinstance(new_listing["tags"], list):
-            raise ValueError("Field 'tags' must be an array of strings")
-
-        self.listings.append(new_listing)
-        self._persist()
-        return new_listing
-
-    def update_listing(self, listing_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Update an existing listing by id and persist.
-        """
-        if not isinstance(updates, dict):
-            raise ValueError("Updates must be a JSON object")
-
-        idx = next((i for i, l in enumerate(self.listings) if int(l.get("id", -1)) == int(listing_id)), None)
-        if idx is None:
-            raise ValueError(f"Listing ID {listing_id} not found")
-
-        updated = dict(self.listings[idx])
-        # Disallow id change
-        if "id" in updates and updates["id"] != updated.get("id"):
-            raise ValueError("Field 'id' cannot be modified")
-
-        updated.update(updates)
-        # Revalidate required fields
-        if not str(updated.get("title", "")).strip() or not str(updated.get("sector", "")).strip():
-            raise ValueError("Fields 'title' and 'sector' are required")
-
-        if "tags" in updated and updated["tags"] is not None and not isinstance(updated["tags"], list):
-            raise ValueError("Field 'tags' must be an array of strings")
-
-        self.listings[idx] = updated
-        self._persist()
-        return updated
-
-    def delete_listing(self, listing_id: int) -> None:
-        """
-        Delete a listing by id and persist.
-        """
-        before = len(self.listings)
-        self.listings = [l for l in self.listings if int(l.get("id", -1)) != int(listing_id)]
-        if len(self.listings) == before:
-            raise ValueError(f"Listing ID {listing_id} not found")
-        self._persist()
-    
-    def _update_hash(self) -> None:
-        """
-        Calculate MD5 hash of the data file for change detection.
-        
-        This private method computes the MD5 hash of the data file to enable
-        detection of changes to the underlying data.
-        
-        Note:
-            Sets self.data_hash to None if hash calculation fails.
-        """
-        try:
-            with open(self.data_path, 'rb') as f:
-                self.data_hash = hashlib.md5(f.read()).hexdigest()
-        except Exception as e:
-            logger.error(f"Hash calculation failed: {e}")
-            self.data_hash = None
-    
-    def _extract_metadata(self) -> None:
-        """
-        Extract unique sectors, tags, and locations from listings.
-        
-        This private method processes all listings to build sets of unique
-        values for sectors, tags, and locations, which are stored in the
-        metadata dictionary.
-        """
-        self.metadata['sectors'] = set(
-            listing.get("sector", "Other") for listing in self.listings
-        )
-        self.metadata['tags'] = set(
-            tag for listing in self.listings for tag in listing.get("tags", [])
-        )
-        self.metadata['locations'] = set(
-            listing.get("location", "Unknown") for listing in self.listings
-        )
-    
-    def has_changed(self) -> bool:
-        """
-        Check if the data file has changed since last load.
-        
-        This method compares the current file hash with the stored hash to
-        detect if the data file has been modified.
-        
-        Returns:
-            bool: True if the data has changed, False otherwise.
-            
-        Example:
-            >>> service = DataService('dataset.json')
-            >>> service.load_data()
-            >>> # ... time passes, file might be updated ...
-            >>> if service.has_changed():
-            ...     service.load_data()  # Reload data
-        """
-        old_hash = self.data_hash
-        self._update_hash()
-        return old_hash != self.data_hash
-    
-    def get_all_texts(self) -> List[str]:
-        """
-        Get concatenated text from all listings for model training.
-        
-        This method combines all relevant fields from each listing into a single
-        text string, which is useful for training machine learning models.
-        
-        Returns:
-            List[str]: List of concatenated text strings, one per listing.
-            
-        Example:
-            >>> service = DataService('dataset.json')
-            >>> service.load_data()
-            >>> texts = service.get_all_texts()
-            >>> print(texts[0])
-            'McDonald's Food & Beverage Fast food franchise...'
-        """
-        return [
-            " ".join([
-                str(listing.get("title", "")),
-                str(listing.get("sector", "")),
-                str(listing.get("description", "")),
-                str(listing.get("investment_range", "")),
-                str(listing.get("location", "")),
-                " ".join(listing.get("tags", []))
-            ])
-            for listing in self.listings
-        ]
+"""
+Data Service Module
+
+This module handles data loading, management, and change detection for franchise listings.
+It provides functionality to load data from JSON files, track changes, and extract metadata.
+
+Classes:
+    DataService: Main service class for data management.
+
+Example:
+    >>> from backend.src.services.data_service import DataService
+    >>> service = DataService('dataset.json')
+    >>> if service.load_data():
+    ...     print(f"Loaded {len(service.listings)} listings")
+"""
+
+import os
+import sys
+import hashlib
+import logging
+import orjson
+import numpy as np
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import List, Dict, Set, Any, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Listings per chunk when streaming /listings pages
+LISTINGS_STREAM_CHUNK = 64
+
+# Distinct filter combinations whose masks are memoized (see filter_mask)
+FILTER_MASK_CACHE_SIZE = 256
+
+# Read size when re-hashing the data file (see _update_hash)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class DataService:
+    """
+    Manages data loading and change detection for franchise listings.
+    
+    This class handles loading franchise data from JSON files, tracking changes
+    to the data, and extracting metadata such as sectors, tags, and locations.
+    
+    Attributes:
+        data_path (str): Path to the data JSON file.
+        listings (List[Dict]): List of franchise listings loaded from the file.
+        data_hash (str): BLAKE2b hash of the data file for change detection.
+        metadata (Dict[str, Set]): Extracted metadata including sectors, tags, and locations.
+        sector_index (Dict[str, np.ndarray]): Lower-cased sector -> listing positions.
+        location_index (Dict[str, np.ndarray]): Lower-cased location -> listing positions.
+        tag_index (Dict[str, np.ndarray]): Lower-cased tag -> listing positions.
+        version (int): Incremented whenever the listings change in this process.
+    
+    Example:
+        >>> service = DataService('dataset.json')
+        >>> service.load_data()
+        >>> print(service.metadata['sectors'])
+        {'Food & Beverage', 'Retail', 'Services'}
+    """
+    
+    def __init__(self, data_path: str):
+        """
+        Initialize the DataService.
+        
+        Args:
+            data_path (str): Path to the JSON file containing franchise listings.
+        """
+        self.data_path = data_path
+        self.listings: List[Dict[str, Any]] = []
+        self.data_hash: str = None
+        self.metadata: Dict[str, Set] = {
+            'sectors': set(),
+            'tags': set(),
+            'locations': set()
+        }
+        # Tracks input file format so we can write back in the same shape
+        # - 'array': file is a JSON array
+        # - 'wrapped': file is an object with a 'listings' key
+        self._file_format: str = 'array'
+        # (st_mtime_ns, st_size) of the data file when data_hash was computed
+        self._data_sig: Optional[Tuple[int, int]] = None
+        # Held while save() writes the file (see has_changed)
+        self._write_lock = Lock()
+        # Serializes mutations: each one derives the new state from the current one
+        self._mutation_lock = Lock()
+        # Value (as written) -> number of listings carrying it, per metadata set,
+        # so an update or delete can tell when a value is no longer used
+        self._metadata_counts: Dict[str, Counter] = {
+            'sectors': Counter(), 'tags': Counter(), 'locations': Counter()
+        }
+        # Nesting depth of batch() and whether a save was deferred by it
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Lower-cased filter value -> listing positions (see filter_mask)
+        self.sector_index: Dict[str, np.ndarray] = {}
+        self.location_index: Dict[str, np.ndarray] = {}
+        self.tag_index: Dict[str, np.ndarray] = {}
+        # str(listing id) -> position in self.listings
+        self.id_index: Dict[str, int] = {}
+        # Largest numeric listing id, maintained with id_index (see _next_id)
+        self._max_id = 0
+        # (listings, sector_index, location_index, tag_index, mask cache) the
+        # filters are answered from, published in one assignment so a mask is
+        # always paired with the listings it was built against (see filter_listings)
+        self._filter_state: Tuple = ([], {}, {}, {}, {})
+        self._mask_lock = Lock()
+        # Pre-serialized responses (see get_filters_json / get_listings_json)
+        # Bumped whenever the listings change (in this process)
+        self.version = 0
+        # (version, payload) of the serialized /filters response
+        self._filters_json_cache: Optional[Tuple[int, bytes]] = None
+        # (version, texts) of the last get_all_texts() result
+        self._texts_cache: Optional[Tuple[int, List[str]]] = None
+        self._listing_json_cache: List[bytes] = []
+        # Listings the byte cache was encoded from (see _build_response_cache)
+        self._listing_json_source: List[Dict[str, Any]] = []
+    
+    def load_data(self) -> bool:
+        """
+        Load franchise listings from the JSON file.
+        
+        This method reads the JSON file, parses the listings, updates the data hash,
+        and extracts metadata. It supports both array format and object format with
+        a 'listings' key.
+        
+        Returns:
+            bool: True if data was loaded successfully, False otherwise.
+            
+        Raises:
+            Exception: Logs error if file reading or parsing fails.
+            
+        Example:
+            >>> service = DataService('dataset.json')
+            >>> success = service.load_data()
+            >>> if success:
+            ...     print(f"Loaded {len(service.listings)} listings")
+        """
+        try:
+            logger.info(f"📖 Loading data from {self.data_path}")
+            
+            # Read the file once: the same bytes are hashed and parsed, then
+            # released before the derived state (indexes, caches) is built
+            sig = self._file_signature()
+            with open(self.data_path, 'rb') as f:
+                raw = f.read()
+            data_hash = self._hash_bytes(raw)
+            data = orjson.loads(raw)
+            del raw
+            
+            with self._mutation_lock:
+                # Support both formats: array or object with 'listings' key
+                if isinstance(data, dict) and 'listings' in data:
+                    self.listings = data['listings']
+                    self._file_format = 'wrapped'
+                else:
+                    self.listings = data
+                    self._file_format = 'array'
+                
+                # Update hash and metadata
+                self.data_hash = data_hash
+                self._data_sig = sig
+                self._build_indexes()
+                self._build_response_cache()
+            
+            logger.info(f"✓ Loaded {len(self.listings)} listings")
+            logger.info(
+                f"  - {len(self.metadata['sectors'])} sectors, "
+                f"{len(self.metadata['tags'])} tags, "
+                f"{len(self.metadata['locations'])} locations"
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Data loading failed: {e}", exc_info=True)
+            return False
+
+    def _persist(self, persist: bool = True) -> None:
+        """
+        Save the listings after a mutation (the in-memory state is already
+        updated, see _splice).
+        
+        Args:
+            persist (bool, optional): Write the listings to disk. Callers that
+                pass False must call save() later. Inside batch() the save is
+                deferred to the end of the batch. Defaults to True.
+        """
+        if persist:
+            if self._batch_depth:
+                self._batch_dirty = True
+            else:
+                self.save()
+
+    @contextmanager
+    def batch(self) -> Iterator["DataService"]:
+        """
+        Group several mutations into a single save().
+        
+        In-memory state is refreshed after each mutation as usual, but the
+        dataset file is written once, when the outermost batch exits (and only
+        if a mutation asked to persist).
+        
+        Example:
+            >>> with service.batch():
+            ...     service.add_listing(a)
+            ...     service.delete_listing(7)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self.save()
+
+    def save(self) -> None:
+        """
+        Persist the current listings back to disk, preserving the original file shape.
+        
+        The file is assembled from the per-listing bytes already serialized
+        for /listings (one listing per line inside the JSON array), so saving
+        does not re-encode the catalog; it is written to a temporary file and
+        renamed over dataset.json, so readers never see a partial file.
+        
+        Safe to call from a background thread: the byte cache is replaced, not
+        modified, by each mutation, and has_changed() does not report our own
+        in-progress write as an external change.
+        """
+        if len(self._listing_json_cache) != len(self.listings):
+            self._build_response_cache()
+        body = b',\n'.join(self._listing_json_cache)
+        if self._file_format == 'wrapped':
+            raw = b'{"listings": [\n' + body + b'\n]}\n'
+        else:
+            raw = b'[\n' + body + b'\n]\n'
+
+        path = Path(self.data_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+
+        with self._write_lock:
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+            # Refresh hash after write
+            self.data_hash = self._hash_bytes(raw)
+            self._data_sig = self._file_signature()
+
+    def _next_id(self) -> int:
+        """
+        Compute next numeric ID based on current listings.
+        
+        The largest id is tracked while the indexes are built, so this does
+        not scan the listings.
+        """
+        return self._max_id + 1
+
+    def add_listing(self, listing: Dict[str, Any], persist: bool = True) -> Dict[str, Any]:
+        """
+        Add a new listing, persist to disk, and update in-memory metadata/hash.
+
+        Required fields: title, sector
+        If 'id' is missing, an auto-incremented integer ID is assigned.
+        With persist=False the caller is responsible for calling save().
+        """
+        return self.add_listings([listing], persist=persist)[0]
+
+    def add_listings(self, listings: List[Dict[str, Any]], persist: bool = True) -> List[Dict[str, Any]]:
+        """
+        Add several listings at once, refreshing metadata, indexes and the
+        response cache (and persisting) a single time for the whole batch.
+
+        Every listing is validated as in add_listing() before any is added, so
+        an invalid entry rejects the whole batch. Missing ids are assigned in
+        order; ids must be unique within the batch and the catalog.
+        """
+        if not isinstance(listings, list) or not listings:
+            raise ValueError("Listings must be a non-empty JSON array")
+
+        with self._mutation_lock:
+            new_listings = self._validate_new_listings(listings)
+            self._splice(len(self.listings), 0, new_listings)
+        self._persist(persist)
+        return new_listings
+
+    def _validate_new_listings(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate listings for add_listings() and return copies with ids assigned."""
+        existing_ids = self.id_index
+        batch_ids: Set[str] = set()
+        next_id = self._next_id()
+        new_listings = []
+
+        for position, listing in enumerate(listings):
+            where = f"Listing {position}: " if len(listings) > 1 else ""
+            if not isinstance(listing, dict):
+                raise ValueError(f"{where}Listing must be a JSON object")
+
+            title = str(listing.get("title", "")).strip()
+            sector = str(listing.get("sector", "")).strip()
+            if not title or not sector:
+                raise ValueError(f"{where}Fields 'title' and 'sector' are required")
+
+            # Copy to avoid mutating caller's object
+            new_listing = dict(listing)
+
+            if "id" not in new_listing or new_listing.get("id") in (None, "", 0):
+                while str(next_id) in existing_ids or str(next_id) in batch_ids:
+                    next_id += 1
+                new_listing["id"] = next_id
+            elif str(new_listing.get("id")) in existing_ids or str(new_listing.get("id")) in batch_ids:
+                # Ensure unique
+                raise ValueError(f"{where}Listing id '{new_listing.get('id')}' already exists")
+            batch_ids.add(str(new_listing["id"]))
+
+            # Normalize tags to list
+            if "tags" in new_listing and new_listing["tags"] is not None and not isinstance(new_listing["tags"], list):
+                raise ValueError(f"{where}Field 'tags' must be an array of strings")
+
+            new_listings.append(new_listing)
+
+        return new_listings
+
+    def update_listing(self, listing_id: int, updates: Dict[str, Any], persist: bool = True) -> Dict[str, Any]:
+        """
+        Update an existing listing by id and persist (unless persist=False).
+        """
+        if not isinstance(updates, dict):
+            raise ValueError("Updates must be a JSON object")
+
+        with self._mutation_lock:
+            idx = self.id_index.get(str(listing_id))
+            if idx is None:
+                raise ValueError(f"Listing ID {listing_id} not found")
+
+            updated = dict(self.listings[idx])
+            # Disallow id change
+            if "id" in updates and updates["id"] != updated.get("id"):
+                raise ValueError("Field 'id' cannot be modified")
+
+            updated.update(updates)
+            # Revalidate required fields
+            if not str(updated.get("title", "")).strip() or not str(updated.get("sector", "")).strip():
+                raise ValueError("Fields 'title' and 'sector' are required")
+
+            if "tags" in updated and updated["tags"] is not None and not isinstance(updated["tags"], list):
+                raise ValueError("Field 'tags' must be an array of strings")
+
+            self._splice(idx, 1, [updated])
+        self._persist(persist)
+        return updated
+
+    def delete_listing(self, listing_id: int, persist: bool = True) -> None:
+        """
+        Delete a listing by id and persist (unless persist=False).
+        """
+        with self._mutation_lock:
+            idx = self.id_index.get(str(listing_id))
+            if idx is None:
+                raise ValueError(f"Listing ID {listing_id} not found")
+            self._splice(idx, 1, [])
+        self._persist(persist)
+    
+    def _splice(self, position: int, removed: int, added: List[Dict[str, Any]]) -> None:
+        """
+        Replace `removed` listings at `position` by `added`, updating the derived state.
+        
+        Add, update and delete are all splices (appending, replacing one
+        listing, removing one), so one delta update keeps the metadata, the
+        filter indexes, the id map and the response cache current: only the
+        postings of values the spliced listings carry are rewritten, plus a
+        shift of the positions after a removal. Everything is published as
+        new objects; the current listings list, index arrays and byte cache
+        are never modified, so readers holding them stay consistent.
+        """
+        previous = self.listings
+        end = position + removed
+        old = previous[position:end]
+        listings = previous[:position] + added + previous[end:]
+        shift = len(added) - removed
+        # Whether listings after the splice change position (deletes)
+        moved = shift != 0 and end < len(previous)
+        
+        counts = {field: Counter(values) for field, values in self._metadata_counts.items()}
+        for listing in old:
+            self._count_metadata(counts, listing, -1)
+        for listing in added:
+            self._count_metadata(counts, listing, 1)
+        # Unary + drops the values no listing carries any more
+        counts = {field: +values for field, values in counts.items()}
+        
+        indexes = []
+        for field, index in enumerate((self.sector_index, self.location_index, self.tag_index)):
+            stale = {key for listing in old for key in self._index_keys(listing)[field]}
+            fresh: Dict[str, List[int]] = {}
+            for offset, listing in enumerate(added):
+                for key in self._index_keys(listing)[field]:
+                    fresh.setdefault(key, []).append(position + offset)
+            indexes.append(self._splice_postings(index, position, end, shift, moved, stale, fresh))
+        
+        id_index = dict(self.id_index)
+        for listing in old:
+            id_index.pop(str(listing.get("id")), None)
+        for at, listing in enumerate(listings[position:] if moved else added, position):
+            id_index[str(listing.get("id"))] = at
+        
+        cache = self._listing_json_cache
+        cache_current = self._listing_json_source is previous and len(cache) == len(previous)
+        
+        self.listings = listings
+        # Ids of deleted listings are not handed out again, so the largest
+        # id only grows
+        self._publish_indexes(listings, counts, *indexes, id_index, self._largest_id(added, self._max_id))
+        if cache_current:
+            self._listing_json_cache = cache[:position] + [orjson.dumps(listing) for listing in added] + cache[end:]
+            self._listing_json_source = listings
+            self.version += 1
+        else:
+            self._build_response_cache()
+    
+    @staticmethod
+    def _splice_postings(
+        index: Dict[str, np.ndarray],
+        position: int,
+        end: int,
+        shift: int,
+        moved: bool,
+        stale: Set[str],
+        fresh: Dict[str, List[int]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Copy of a posting-list index after a splice (see _splice).
+        
+        Postings of `stale` keys lose the spliced positions [position, end),
+        `fresh` keys gain the positions of the added listings, and when
+        listings `moved` every posting after the splice is shifted.
+        """
+        updated = dict(index)
+        empty = np.empty(0, dtype=np.intp)
+        for key in (index.keys() if moved else stale) | fresh.keys():
+            postings = index.get(key, empty)
+            if moved or key in stale:
+                postings = postings[(postings < position) | (postings >= end)]
+                if moved:
+                    postings = np.where(postings >= end, postings + shift, postings)
+            if key in fresh:
+                postings = np.insert(postings, np.searchsorted(postings, position), fresh[key])
+            if len(postings):
+                updated[key] = postings
+            else:
+                updated.pop(key, None)
+        return updated
+    
+    def _update_hash(self) -> None:
+        """
+        Calculate the hash of the data file for change detection.
+        
+        This private method computes the BLAKE2b hash of the data file to enable
+        detection of changes to the underlying data. The file is streamed in
+        HASH_CHUNK_SIZE blocks instead of being read into memory at once.
+        
+        Note:
+            Sets self.data_hash to None if hash calculation fails.
+        """
+        try:
+            self._data_sig = self._file_signature()
+            digest = hashlib.blake2b(digest_size=16)
+            with open(self.data_path, 'rb', buffering=HASH_CHUNK_SIZE) as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            self.data_hash = digest.hexdigest()
+        except Exception as e:
+            logger.error(f"Hash calculation failed: {e}")
+            self.data_hash = None
+            self._data_sig = None
+    
+    @staticmethod
+    def _hash_bytes(raw: bytes) -> str:
+        """Hash the raw data file contents (BLAKE2b, 128-bit digest, same as _update_hash)."""
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Get (st_mtime_ns, st_size) of the data file, or None if it cannot be stat'ed."""
+        try:
+            st = os.stat(self.data_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _build_indexes(self) -> None:
+        """
+        Build the metadata sets and the inverted indexes in one pass over the listings.
+        
+        The unique sectors, tags and locations (as written) go to
+        self.metadata for /filters, with the number of listings carrying
+        each so that _splice() can tell when a value is no longer used.
+        Search filters are answered by posting-list lookups instead of
+        lower-casing and scanning every listing per request. Locations are
+        indexed by distinct value so that substring matching only scans the
+        (few) distinct locations, not every listing. Tags are interned so
+        listings sharing a tag share one string object. Listing ids are
+        mapped to positions for the admin update and delete lookups.
+        """
+        listings = self.listings
+        indexes: Tuple[Dict[str, List[int]], ...] = ({}, {}, {})
+        id_index: Dict[str, int] = {}
+        counts = {'sectors': Counter(), 'tags': Counter(), 'locations': Counter()}
+        for position, listing in enumerate(listings):
+            self._count_metadata(counts, listing, 1)
+            for index, keys in zip(indexes, self._index_keys(listing)):
+                for key in keys:
+                    index.setdefault(key, []).append(position)
+            id_index[str(listing.get("id"))] = position
+        
+        arrays = [
+            {key: np.array(positions, dtype=np.intp) for key, positions in index.items()}
+            for index in indexes
+        ]
+        self._publish_indexes(listings, counts, *arrays, id_index, self._largest_id(listings))
+    
+    def _publish_indexes(
+        self,
+        listings: List[Dict[str, Any]],
+        counts: Dict[str, Counter],
+        sector_index: Dict[str, np.ndarray],
+        location_index: Dict[str, np.ndarray],
+        tag_index: Dict[str, np.ndarray],
+        id_index: Dict[str, int],
+        max_id: int
+    ) -> None:
+        """Swap in the metadata and indexes of `listings` (new sets and dicts, never modified)."""
+        self._metadata_counts = counts
+        self.metadata['sectors'] = set(counts['sectors'])
+        self.metadata['tags'] = set(counts['tags'])
+        self.metadata['locations'] = set(counts['locations'])
+        self.sector_index = sector_index
+        self.location_index = location_index
+        self.tag_index = tag_index
+        self.id_index = id_index
+        self._max_id = max_id
+        self._filter_state = (listings, sector_index, location_index, tag_index, {})
+    
+    @staticmethod
+    def _count_metadata(counts: Dict[str, Counter], listing: Dict[str, Any], n: int) -> None:
+        """Add n (1 or -1) to the metadata counts of the listing's sector, location and tags."""
+        counts['sectors'][listing.get("sector", "Other")] += n
+        counts['locations'][listing.get("location", "Unknown")] += n
+        for tag in listing.get("tags") or ():
+            counts['tags'][tag] += n
+    
+    @staticmethod
+    def _index_keys(listing: Dict[str, Any]) -> Tuple[Tuple[str], Tuple[str], Set[str]]:
+        """Keys of the listing in the sector, location and tag indexes (lower-cased)."""
+        return (
+            (str(listing.get("sector") or "").lower(),),
+            (str(listing.get("location") or "").lower(),),
+            {sys.intern(str(tag).lower()) for tag in (listing.get("tags") or [])}
+        )
+    
+    @staticmethod
+    def _largest_id(listings: List[Dict[str, Any]], largest: int = 0) -> int:
+        """Largest numeric listing id (at least `largest`); non-numeric ids are skipped."""
+        for listing in listings:
+            try:
+                largest = max(largest, int(listing.get("id", 0)))
+            except Exception:
+                pass
+        return largest
+    
+    def filter_mask(
+        self,
+        sector: Optional[str] = None,
+        location: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Build a boolean mask of listings matching the search filters.
+        
+        Args:
+            sector (str, optional): Exact sector match (case-insensitive).
+            location (str, optional): Substring of the listing location (case-insensitive).
+            tags (Iterable[str], optional): Listing must carry at least one of these tags.
+        
+        Returns:
+            Optional[np.ndarray]: Boolean array parallel to self.listings (as of
+                the call), or None if no filter is set. See filter_listings().
+        """
+        return self.filter_listings(sector, location, tags)[1]
+    
+    def filter_listings(
+        self,
+        sector: Optional[str] = None,
+        location: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Build a boolean mask of listings matching the search filters, together
+        with the listings it is parallel to.
+        
+        The listings list is replaced, never modified, by each mutation, so
+        the pair stays consistent while later mutations publish new lists;
+        SearchService.hybrid_search() uses it to line the mask up with its own
+        (possibly older) snapshot. Filter combinations repeat across requests
+        (UI facets), so masks are memoized until the listings change. The
+        returned array is read-only.
+        
+        Args:
+            sector (str, optional): Exact sector match (case-insensitive).
+            location (str, optional): Substring of the listing location (case-insensitive).
+            tags (Iterable[str], optional): Listing must carry at least one of these tags.
+        
+        Returns:
+            Tuple[List[Dict], Optional[np.ndarray]]: The listings and the mask over
+                them, or None as the mask if no filter is set.
+        """
+        # Listings, indexes and mask cache from one published state: masks
+        # built from replaced indexes land in the old cache, never the new one
+        listings, sector_index, location_index, tag_index, cache = self._filter_state
+        if not (sector or location or tags):
+            return listings, None
+        
+        sector = sector.lower() if sector else None
+        location = location.lower() if location else None
+        tags = tuple(sorted({t.lower() for t in tags})) if tags else ()
+        key = (sector, location, tags)
+        mask = cache.get(key)
+        if mask is not None:
+            return listings, mask
+        
+        empty = np.empty(0, dtype=np.intp)
+        mask = np.ones(len(listings), dtype=bool)
+        
+        def restrict(postings: List[np.ndarray]) -> None:
+            allowed = np.zeros(len(listings), dtype=bool)
+            if postings:
+                allowed[np.concatenate(postings)] = True
+            np.logical_and(mask, allowed, out=mask)
+        
+        if sector:
+            restrict([sector_index.get(sector, empty)])
+        if location:
+            restrict([positions for value, positions in location_index.items() if location in value])
+        if tags:
+            restrict([tag_index[t] for t in tags if t in tag_index])
+        
+        mask.flags.writeable = False
+        with self._mask_lock:
+            if len(cache) >= FILTER_MASK_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = mask
+        return listings, mask
+    
+    def _build_response_cache(self) -> None:
+        """
+        Pre-serialize the read-only API payloads derived from the listings.
+        
+        Each listing is encoded once so /listings pages are assembled by
+        joining bytes. The filters payload is only invalidated here and
+        sorted lazily by the next get_filters_json(), so a burst of admin
+        mutations does not re-sort it each time.
+        
+        Listing dicts are never modified in place (updates replace them), so
+        bytes of listings that were already encoded are reused by identity and
+        only added or updated listings are serialized.
+        """
+        self.version += 1
+        encoded = dict(zip(map(id, self._listing_json_source), self._listing_json_cache))
+        listings = self.listings
+        self._listing_json_cache = [
+            encoded.get(id(listing)) or orjson.dumps(listing) for listing in listings
+        ]
+        self._listing_json_source = listings
+    
+    def get_filters_json(self) -> bytes:
+        """
+        Get the serialized /filters payload.
+        
+        Returns:
+            bytes: JSON object with sorted sectors, locations, tags and the listing count.
+        """
+        # Read the version first: a mutation racing this build bumps it
+        # again, so a stale payload is never reported as current
+        version = self.version
+        cached = self._filters_json_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        payload = orjson.dumps({
+            "sectors": sorted(self.metadata['sectors']),
+            "locations": sorted(self.metadata['locations']),
+            "tags": sorted(self.metadata['tags']),
+            "total_listings": len(self.listings)
+        })
+        self._filters_json_cache = (version, payload)
+        return payload
+    
+    def iter_listings_json(self, offset: int, limit: int) -> Iterator[bytes]:
+        """
+        Serialize one page of the /listings payload as a stream of chunks.
+        
+        Listings are read lazily, one chunk at a time, from the per-listing
+        byte cache instead of copying the whole page up front. The cache list
+        is replaced, never mutated, when the listings change, so a response
+        that is already being sent keeps a consistent view.
+        
+        Args:
+            offset (int): Number of listings to skip.
+            limit (int): Maximum number of listings in the page.
+        
+        Returns:
+            Iterator[bytes]: Chunks that concatenate to a JSON object with the
+                page of listings and pagination fields.
+        """
+        if len(self._listing_json_cache) != len(self.listings):
+            self._build_response_cache()
+        
+        cache = self._listing_json_cache
+        total = len(cache)
+        tail = orjson.dumps({
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": (offset + limit) < total
+        })[1:]
+        
+        def generate() -> Iterator[bytes]:
+            yield b'{"listings":['
+            stop = min(offset + limit, total)
+            for start in range(offset, stop, LISTINGS_STREAM_CHUNK):
+                if start != offset:
+                    yield b','
+                yield b','.join(cache[start:min(start + LISTINGS_STREAM_CHUNK, stop)])
+            yield b'],' + tail
+        
+        return generate()
+    
+    def get_listings_json(self, offset: int, limit: int) -> bytes:
+        """
+        Get one serialized page of the /listings payload.
+        
+        Args:
+            offset (int): Number of listings to skip.
+            limit (int): Maximum number of listings in the page.
+        
+        Returns:
+            bytes: JSON object with the page of listings and pagination fields.
+        """
+        return b''.join(self.iter_listings_json(offset, limit))
+    
+    def has_changed(self) -> bool:
+        """
+        Check if the data file has changed since last load.
+        
+        A single os.stat() is compared with the file's mtime and size from the
+        last hash: if both are unchanged the file is considered unchanged
+        without reading it. Otherwise the file is re-hashed, so a touched but
+        identical file is not reported as changed.
+        
+        Returns:
+            bool: True if the data has changed, False otherwise.
+            
+        Example:
+            >>> service = DataService('dataset.json')
+            >>> service.load_data()
+            >>> # ... time passes, file might be updated ...
+            >>> if service.has_changed():
+            ...     service.load_data()  # Reload data
+        """
+        if self._write_lock.locked():
+            return False  # Our own save() is in progress
+        
+        sig = self._file_signature()
+        if sig is not None and sig == self._data_sig:
+            return False
+        
+        old_hash = self.data_hash
+        self._update_hash()
+        return old_hash != self.data_hash
+    
+    def get_all_texts(self) -> List[str]:
+        """
+        Get concatenated text from all listings for model training.
+        
+        This method combines all relevant fields from each listing into a single
+        text string, which is useful for training machine learning models.
+        
+        Returns:
+            List[str]: List of concatenated text strings, one per listing.
+            
+        Example:
+            >>> service = DataService('dataset.json')
+            >>> service.load_data()
+            >>> texts = service.get_all_texts()
+            >>> print(texts[0])
+            'McDonald's Food & Beverage Fast food franchise...'
+        
+        Note:
+            The result is cached until the listings change; treat it as read-only.
+        """
+        version = self.version
+        cached = self._texts_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        # Build column by column: one pass per field instead of a nested
+        # list and six lookups per listing
+        listings = list(self.listings)
+        columns = [
+            map(str, [listing.get(field, "") for listing in listings])
+            for field in ("title", "sector", "description", "investment_range", "location")
+        ]
+        columns.append([" ".join(listing.get("tags", [])) for listing in listings])
+        texts = [" ".join(row) for row in zip(*columns)]
+        
+        self._texts_cache = (version, texts)
+        return texts
@@ -0,0 +1,72 @@
+"""
+Encoder Service Module
+
+This module batches Universal Sentence Encoder calls for concurrent search
+queries. Each USE call pays a fixed graph-launch cost that dominates the
+encoding of a single short query, so encoding all in-flight queries in one
+call is much cheaper than encoding them one by one.
+
+Classes:
+    EncoderService: Micro-batching front-end for a text encoder.
+
+Example:
+    >>> encoder = EncoderService(lambda texts: use_model(texts).numpy())
+    >>> query_emb = encoder.encode("coffee franchise")
+"""
+
+import numpy as np
+from typing import Callable, List
+
+from .micro_batcher import MicroBatcher
+
+
+class EncoderService(MicroBatcher):
+    """
+    Micro-batching layer for text encoding.
+
+    Callers submit one text at a time and block until its embedding is
+    ready. Texts queued together (see MicroBatcher) are encoded with a
+    single call of the encoder.
+
+    Attributes:
+        encode_fn (Callable): Function mapping a list of N texts to an (N, d) array.
+        max_batch_size (int): Maximum number of texts encoded together.
+        max_wait_ms (float): Maximum time to wait for a batch to fill up.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize the EncoderService.
+
+        Args:
+            encode_fn (Callable): Batched encoder, e.g. `lambda t: use_model(t).numpy()`.
+            max_batch_size (int, optional): Maximum texts per batch. Defaults to 32.
+            max_wait_ms (float, optional): Batch collection window. Defaults to 5.0.
+        """
+        super().__init__(max_batch_size, max_wait_ms, name='use-query-encoder')
+        self.encode_fn = encode_fn
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Encode a single text through the shared batch.
+
+        Args:
+            text (str): Text to encode.
+
+        Returns:
+            np.ndarray: float32 embedding of shape (1, d).
+
+        Raises:
+            Exception: Re-raises any error raised by the underlying encoder.
+        """
+        return self.submit(text)
+
+    def _run_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Encode the whole batch in one call and split it into (1, d) rows."""
+        embeddings = np.asarray(self.encode_fn(texts), dtype=np.float32)
+        return [embeddings[i:i + 1] for i in range(len(texts))]
@@ -1,328 +1,520 @@
-"""
-Google Cloud Storage Service
-Handles model storage and retrieval from GCS
-"""
-
-import os
-import logging
-from pathlib import Path
-from typing import Optional, List, Dict
-from google.cloud import storage
-from google.api_core.exceptions import GoogleAPIError, NotFound
-
-logger = logging.getLogger(__name__)
-
-class GCSStorageService:
-    """
-    Google Cloud Storage Service for model storage
-    """
-    
-    def __init__(self, bucket_name: str, project: str = None, prefix: str = 'models/'):
-        """
-        Initialize GCS storage service
-        
-        Args:
-            bucket_name: GCS bucket name
-            project: GCP project ID (optional, uses default)
-            prefix: Folder prefix in bucket
-        """
-        self.bucket_name = bucket_name
-        self.project = project
-        self.prefix = prefix
-        self.client = None
-        self.bucket = None
-        
-        self._initialize_gcs()
-    
-    def _initialize_gcs(self):
-        """Initialize GCS client and bucket"""
-        try:
-            if self.project:
-                self.client = storage.Client(project=self.project)
-            else:
-                # Uses Application Default Credentials (ADC)
-                self.client = storage.Client()
-            
-            self.bucket = self.client.bucket(self.bucket_name)
-            
-            # Test connection
-            if self.bucket.exists():
-                logger.info(f"✓ Connected to GCS bucket: {self.bucket_name}")
-            else:
-                logger.error(f"❌ Bucket {self.bucket_name} does not exist")
-                self.client = None
-                self.bucket = None
-                
-        except Exception as e:
-            logger.error(f"GCS initialization failed: {e}")
-            logger.warning("Continuing without GCS - will use local storage only")
-            self.client = None
-            self.bucket = None
-    
-    def is_available(self) -> bool:
-        """Check if GCS is available"""
-        return self.client is not None and self.bucket is not None
-    
-    def download_models(self, local_dir: str, required_files: Optional[List[str]] = None) -> bool:
-        """
-        Download all models from GCS to local directory
-        
-        Args:
-            local_dir: Local directory to download to
-            required_files: Optional list of required files (uses default if None)
-            
-        Returns:
-            True if successful
-        """
-        if not self.is_available():
-            logger.warning("GCS not available, cannot download models")
-            return False
-        
-        # Default required files
-        if required_files is None:
-            required_files = [
-                'tfidf_model.pkl',
-                'faiss_index.bin',
-                'faiss_index.npy',
-                'metadata.json',
-            ]
-        
-        try:
-            logger.info(f"📥 Downloading models from GCS: gs://{self.bucket_name}/{self.prefix}")
-            
-            # Create local directory
-            local_path = Path(local_dir)
-            local_path.mkdir(parents=True, exist_ok=True)
-            
-            # Track downloads
-            downloaded = []
-            failed = []
-            
-            for filename in required_files:
-                blob_name = f"{self.prefix}{filename}"
-                file_path = local_path / filename
-                
-                if self._download_blob(blob_name, str(file_path)):
-                    downloaded.append(filename)
-                else:
-                    failed.append(filename)
-            
-            # Determine success
-            all_downloaded = len(failed) == 0
-            
-            if all_downloaded:
-                logger.info(f"✓ Successfully downloaded all {len(downloaded)} model files")
-                return True
-            elif downloaded:
-                # Partial failure - cleanup and report
-                logger.error(f"❌ Partial download failed. Missing: {failed}")
-                logger.info("Cleaning up partial downloads...")
-                for filename in downloaded:
-                    try:
-                        (local_path / filename).unlink()
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup {filename}: {e}")
-                return False
-            else:
-                logger.error(f"❌ No files downloaded. All failed: {failed}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Model download failed: {e}", exc_info=True)
-            return False
-
-    def _download_blob(self, blob_name: str, local_path: str, expected_min_size: int = 1024) -> bool:
-        """Download a single blob with validation"""
-        try:
-            blob = self.bucket.blob(blob_name)
-            
-            if not blob.exists():
-                logger.warning(f"Blob does not exist: {blob_name}")
-                return False
-            
-            # Check remote size
-            remote_size = blob.size
-            logger.info(f"  Downloading {Path(local_path).name} ({remote_size / 1024:.1f} KB)...")
-            
-            # Download to file
-            blob.download_to_filename(local_path)
-            
-            # Verify local file
-            if not os.path.exists(local_path):
-                logger.error(f"Download failed: file not created")
-                return False
-            
-            local_size = os.path.getsize(local_path)
-            
-            # Verify size matches
-            if local_size != remote_size:
-                logger.error(f"Size mismatch: local={local_size}, remote={remote_size}")
-                os.remove(local_path)  # Clean up corrupt file
-                return False
-            
-            # Verify minimum size
-            if local_size < expected_min_size:
-                logger.warning(f"File unusually small: {local_size} bytes (expected >{expected_min_size})")
-            
-            size_kb = local_size / 1024
-            logger.info(f"  ✓ {Path(local_path).name} ({size_kb:.1f} KB)")
-            return True
-            
-        except NotFound:
-            logger.warning(f"Blob not found: {blob_name}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to download {blob_name}: {e}")
-            if os.path.exists(local_path):
-                os.remove(local_path)  # Clean up partial download
-            return False
-
-    def upload_models(self, local_dir: str) -> bool:
-        """
-        Upload all models from local directory to GCS
-        
-        Args:
-            local_dir: Local directory containing models
-            
-        Returns:
-            True if successful
-        """
-        if not self.is_available():
-            logger.warning("GCS not available, cannot upload models")
-            return False
-        
-        try:
-            logger.info(f"📤 Uploading models to GCS: gs://{self.bucket_name}/{self.prefix}")
-            
-            files_to_upload = [
-                'tfidf_model.pkl',
-                'faiss_index.bin',
-                'faiss_index.npy',
-                'metadata.json',
-            ]
-            
-            uploaded = 0
-            for filename in files_to_upload:
-                local_path = os.path.join(local_dir, filename)
-                
-                if not os.path.exists(local_path):
-                    logger.warning(f"⚠ File not found: {local_path}")
-                    continue
-                
-                blob_name = f"{self.prefix}{filename}"
-                if self._upload_blob(local_path, blob_name):
-                    uploaded += 1
-            
-            if uploaded > 0:
-                logger.info(f"✓ Uploaded {uploaded}/{len(files_to_upload)} model files")
-                return True
-            else:
-                logger.error("❌ No files uploaded")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Model upload failed: {e}", exc_info=True)
-            return False
-    
-    def _upload_blob(self, local_path: str, blob_name: str) -> bool:
-        """Upload a single blob"""
-        try:
-            blob = self.bucket.blob(blob_name)
-            blob.upload_from_filename(local_path)
-            
-            size_mb = os.path.getsize(local_path) / 1024 / 1024
-            logger.info(f"  ✓ {Path(local_path).name} ({size_mb:.1f}MB)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to upload {local_path}: {e}")
-            return False
-    
-    def models_exist(self) -> bool:
-        """Check if models exist in GCS"""
-        if not self.is_available():
-            return False
-        
-        try:
-            required_files = [
-                'tfidf_model.pkl',
-                'faiss_index.bin',
-                'faiss_index.npy',
-                'metadata.json'
-            ]
-            
-            for filename in required_files:
-                blob_name = f"{self.prefix}{filename}"
-                blob = self.bucket.blob(blob_name)
-                
-                if not blob.exists():
-                    logger.debug(f"Model file not found in GCS: {blob_name}")
-                    return False
-            
-            logger.info(f"✓ All model files found in GCS")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking models in GCS: {e}")
-            return False
-    
-    def get_storage_info(self) -> Dict:
-        """Get storage information"""
-        if not self.is_available():
-            return {
-                'status': 'unavailable',
-                'bucket': self.bucket_name,
-                'error': 'GCS client not initialized'
-            }
-        
-        try:
-            info = {
-                'status': 'available',
-                'bucket': self.bucket_name,
-                'project': self.project,
-                'prefix': self.prefix,
-                'models_exist': self.models_exist(),
-                'files': []
-            }
-            
-            # List model files
-            blobs = self.client.list_blobs(self.bucket_name, prefix=self.prefix)
-            for blob in blobs:
-                info['files'].append({
-                    'name': blob.name.replace(self.prefix, ''),
-                    'size_mb': round(blob.size / 1024 / 1024, 2),
-                    'updated': blob.updated.isoformat() if blob.updated else None
-                })
-            
-            return info
-            
-        except Exception as e:
-            logger.error(f"Error getting storage info: {e}")
-            return {
-                'status': 'error', 
-                'bucket': self.bucket_name,
-                'error': str(e)
-            }
-    
-    def delete_models(self) -> bool:
-        """Delete all models from GCS (use with caution!)"""
-        if not self.is_available():
-            return False
-        
-        try:
-            logger.warning(f"🗑️ Deleting all models from GCS: gs://{self.bucket_name}/{self.prefix}")
-            
-            blobs = self.client.list_blobs(self.bucket_name, prefix=self.prefix)
-            deleted = 0
-            
-            for blob in blobs:
-                blob.delete()
-                deleted += 1
-                logger.info(f"  ✓ Deleted: {blob.name}")
-            
-            logger.info(f"✓ Deleted {deleted} files from GCS")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Delete failed: {e}")
-            return False
\ No newline at end of file
+"""
+Google Cloud Storage Service
+Handles model storage and retrieval from GCS
+
+Model files are stored zstd-compressed (<name>.zst) in the bucket and
+decompressed on download, so local copies stay memory-mappable.
+"""
+
+import os
+import time
+import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, List, Dict
+import zstandard
+import google_crc32c
+from google.api_core.exceptions import GoogleAPIError, NotFound
+
+from ..core.config import config
+
+logger = logging.getLogger(__name__)
+
+# Suffix and zstd level of the compressed model blobs
+COMPRESSED_SUFFIX = '.zst'
+ZSTD_LEVEL = 3
+
+# Blobs from this size on are fetched as parallel byte ranges of RANGE_CHUNK_SIZE
+RANGED_DOWNLOAD_MIN_SIZE = 32 * 1024 * 1024
+RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Read size when checksumming a downloaded file
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+# Deletes sent per HTTP batch request (the JSON API accepts up to 100)
+DELETE_BATCH_SIZE = 100
+
+# Model files, each as the names it may be stored under in order of preference:
+# buckets written before the IDF-only TF-IDF format hold tfidf_model.pkl,
+# which ModelManager still loads (see ModelManager._load_tfidf)
+MODEL_FILES = [
+    ('tfidf_idf.npy', 'tfidf_model.pkl'),
+    ('faiss_index.bin',),
+    ('faiss_index.npy',),
+    ('metadata.json',),
+]
+
+class GCSStorageService:
+    """
+    Google Cloud Storage Service for model storage
+    """
+    
+    def __init__(self, bucket_name: str, project: str = None, prefix: str = 'models/',
+                 max_workers: int = 4):
+        """
+        Initialize GCS storage service
+        
+        Args:
+            bucket_name: GCS bucket name
+            project: GCP project ID (optional, uses default)
+            prefix: Folder prefix in bucket
+            max_workers: Maximum concurrent blob transfers
+        """
+        self.bucket_name = bucket_name
+        self.project = project
+        self.prefix = prefix
+        self.max_workers = max(1, int(max_workers))
+        self.client = None
+        self.bucket = None
+        # (time.monotonic() of the listing, blobs under prefix), see _list_blobs
+        self._listing = (0.0, None)
+        
+        self._initialize_gcs()
+    
+    def _initialize_gcs(self):
+        """Initialize GCS client and bucket"""
+        try:
+            # google.cloud.storage is slow to import; load it only once GCS is used
+            from google.cloud import storage
+            
+            if self.project:
+                self.client = storage.Client(project=self.project)
+            else:
+                # Uses Application Default Credentials (ADC)
+                self.client = storage.Client()
+            self._size_connection_pool()
+            
+            self.bucket = self.client.bucket(self.bucket_name)
+            
+            # Test connection
+            if self.bucket.exists():
+                logger.info(f"✓ Connected to GCS bucket: {self.bucket_name}")
+            else:
+                logger.error(f"❌ Bucket {self.bucket_name} does not exist")
+                self.client = None
+                self.bucket = None
+                
+        except Exception as e:
+            logger.error(f"GCS initialization failed: {e}")
+            logger.warning("Continuing without GCS - will use local storage only")
+            self.client = None
+            self.bucket = None
+    
+    def _size_connection_pool(self):
+        """
+        Let the client's HTTP session keep a connection per concurrent transfer.
+        
+        Files are transferred max_workers at a time and large ones in
+        max_workers byte ranges each. requests pools only 10 connections per
+        host by default, so the rest were opened and torn down (a TLS
+        handshake each) for every request.
+        """
+        from requests.adapters import HTTPAdapter
+        
+        # The client has no public setting for this: its (lazily created)
+        # authorized requests.Session is only reachable as the private _http
+        # attribute, so leave the defaults if a client version lacks it.
+        http = getattr(self.client, '_http', None)
+        if not hasattr(http, 'mount'):
+            logger.debug("GCS client has no mountable HTTP session; keeping its default pool")
+            return
+        pool_size = max(10, self.max_workers * self.max_workers)
+        http.mount('https://', HTTPAdapter(pool_maxsize=pool_size))
+    
+    def is_available(self) -> bool:
+        """Check if GCS is available"""
+        return self.client is not None and self.bucket is not None
+    
+    def download_models(self, local_dir: str, required_files: Optional[List[str]] = None) -> bool:
+        """
+        Download all models from GCS to local directory
+        
+        Args:
+            local_dir: Local directory to download to
+            required_files: Optional list of required files (uses default if None)
+            
+        Returns:
+            True if successful
+        """
+        if not self.is_available():
+            logger.warning("GCS not available, cannot download models")
+            return False
+        
+        try:
+            # One listing serves for picking the files and for their metadata
+            # (size, crc32c), so a download makes no per-file metadata calls
+            listed = self._list_blobs()
+            
+            # Default required files: whichever name of each model file is stored
+            if required_files is None:
+                required_files = self._pick_model_files(self._stored_names(listed))
+            
+            blobs = {blob.name: blob for blob in listed}
+
+            logger.info(f"📥 Downloading models from GCS: gs://{self.bucket_name}/{self.prefix}")
+            
+            # Create local directory
+            local_path = Path(local_dir)
+            local_path.mkdir(parents=True, exist_ok=True)
+            
+            # Track downloads
+            downloaded = []
+            failed = []
+            
+            # The files are independent blobs: fetch them concurrently
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = pool.map(
+                    lambda filename: self._download_blob(
+                        f"{self.prefix}{filename}", str(local_path / filename), blobs
+                    ),
+                    required_files
+                )
+                for filename, ok in zip(required_files, results):
+                    if ok:
+                        downloaded.append(filename)
+                    else:
+                        failed.append(filename)
+            
+            # Determine success
+            all_downloaded = len(failed) == 0
+            
+            if all_downloaded:
+                logger.info(f"✓ Successfully downloaded all {len(downloaded)} model files")
+                return True
+            elif downloaded:
+                # Partial failure - cleanup and report
+                logger.error(f"❌ Partial download failed. Missing: {failed}")
+                logger.info("Cleaning up partial downloads...")
+                for filename in downloaded:
+                    try:
+                        (local_path / filename).unlink()
+                    except Exception as e:
+                        logger.warning(f"Failed to cleanup {filename}: {e}")
+                return False
+            else:
+                logger.error(f"❌ No files downloaded. All failed: {failed}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Model download failed: {e}", exc_info=True)
+            return False
+
+    def _download_blob(self, blob_name: str, local_path: str, blobs: Dict[str, Any],
+                       expected_min_size: int = 1024) -> bool:
+        """Download a single model file, preferring its compressed blob
+        
+        Args:
+            blob_name: Name of the uncompressed blob
+            local_path: Local file to write
+            blobs: Listed blobs by name, reused for their metadata
+            expected_min_size: Size below which a warning is logged
+        """
+        compressed_path = local_path + COMPRESSED_SUFFIX
+        compressed = blobs.get(blob_name + COMPRESSED_SUFFIX)
+        if compressed is None:
+            # Uploaded before compression was introduced
+            return self._download_raw_blob(blob_name, blobs.get(blob_name), local_path, expected_min_size)
+        
+        if not self._download_raw_blob(compressed.name, compressed, compressed_path, 0):
+            return False
+        try:
+            with open(compressed_path, 'rb') as src, open(local_path, 'wb') as dst:
+                zstandard.ZstdDecompressor().copy_stream(src, dst)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to decompress {blob_name}: {e}")
+            if os.path.exists(local_path):
+                os.remove(local_path)
+            return False
+        finally:
+            os.remove(compressed_path)
+    
+    def _download_raw_blob(self, blob_name: str, blob, local_path: str, expected_min_size: int = 1024) -> bool:
+        """Download a single listed blob with validation (blob is None if not listed)"""
+        try:
+            if blob is None:
+                logger.warning(f"Blob does not exist: {blob_name}")
+                return False
+            
+            # Check remote size
+            remote_size = blob.size
+            logger.info(f"  Downloading {Path(local_path).name} ({remote_size / 1024:.1f} KB)...")
+            
+            # Download to file: one stream, or parallel ranges for large blobs.
+            # Bytes are taken as stored (no decompressive transcoding), so
+            # they match blob.size, blob.crc32c and the range offsets.
+            # (download_to_filename verifies the checksum itself, ranges do not)
+            if remote_size >= RANGED_DOWNLOAD_MIN_SIZE and hasattr(os, 'pwrite'):
+                self._download_ranges(blob, local_path, remote_size)
+                if not self._crc32c_matches(blob, local_path):
+                    os.remove(local_path)  # Clean up corrupt file
+                    return False
+            else:
+                blob.download_to_filename(local_path, raw_download=True)
+            
+            # Verify local file
+            try:
+                local_size = os.stat(local_path).st_size
+            except FileNotFoundError:
+                logger.error(f"Download failed: file not created")
+                return False
+            
+            # Verify size matches
+            if local_size != remote_size:
+                logger.error(f"Size mismatch: local={local_size}, remote={remote_size}")
+                os.remove(local_path)  # Clean up corrupt file
+                return False
+            
+            # Verify minimum size
+            if local_size < expected_min_size:
+                logger.warning(f"File unusually small: {local_size} bytes (expected >{expected_min_size})")
+            
+            size_kb = local_size / 1024
+            logger.info(f"  ✓ {Path(local_path).name} ({size_kb:.1f} KB)")
+            return True
+            
+        except NotFound:
+            logger.warning(f"Blob not found: {blob_name}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to download {blob_name}: {e}")
+            if os.path.exists(local_path):
+                os.remove(local_path)  # Clean up partial download
+            return False
+
+    def _download_ranges(self, blob, local_path: str, size: int) -> None:
+        """
+        Download a blob as RANGE_CHUNK_SIZE byte ranges on parallel connections.
+        
+        A single HTTP stream is limited by one TCP connection; each range is
+        written at its offset into a file presized to the blob size.
+        """
+        ranges = [
+            (start, min(start + RANGE_CHUNK_SIZE, size) - 1)
+            for start in range(0, size, RANGE_CHUNK_SIZE)
+        ]
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            
+            def fetch(byte_range):
+                start, end = byte_range
+                data = blob.download_as_bytes(start=start, end=end, raw_download=True, checksum=None)
+                os.pwrite(fd, data, start)
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(fetch, ranges))
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _crc32c_matches(blob, local_path: str) -> bool:
+        """Check a downloaded file against the blob's CRC32C from GCS metadata."""
+        if not blob.crc32c:
+            return True  # No checksum in the blob metadata
+        
+        checksum = google_crc32c.Checksum()
+        with open(local_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b''):
+                checksum.update(chunk)
+        local_crc32c = base64.b64encode(checksum.digest()).decode('ascii')
+        
+        if local_crc32c != blob.crc32c:
+            logger.error(f"Checksum mismatch: local={local_crc32c}, remote={blob.crc32c}")
+            return False
+        return True
+    
+    def upload_models(self, local_dir: str) -> bool:
+        """
+        Upload all models from local directory to GCS
+        
+        Args:
+            local_dir: Local directory containing models
+            
+        Returns:
+            True if successful
+        """
+        if not self.is_available():
+            logger.warning("GCS not available, cannot upload models")
+            return False
+        
+        try:
+            logger.info(f"📤 Uploading models to GCS: gs://{self.bucket_name}/{self.prefix}")
+            
+            files_to_upload = self._pick_model_files(set(os.listdir(local_dir)))
+            
+            def upload(filename: str) -> bool:
+                local_path = os.path.join(local_dir, filename)
+                return self._upload_blob(local_path, f"{self.prefix}{filename}")
+            
+            # Upload the data files concurrently, then metadata.json last (as
+            # locally), so it never describes files that are not uploaded yet
+            data_files = [f for f in files_to_upload if f != 'metadata.json']
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                uploaded = sum(pool.map(upload, data_files))
+            if 'metadata.json' in files_to_upload:
+                uploaded += upload('metadata.json')
+            
+            if uploaded > 0:
+                logger.info(f"✓ Uploaded {uploaded}/{len(files_to_upload)} model files")
+                return True
+            else:
+                logger.error("❌ No files uploaded")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Model upload failed: {e}", exc_info=True)
+            return False
+        finally:
+            self._listing = (0.0, None)
+    
+    def _upload_blob(self, local_path: str, blob_name: str) -> bool:
+        """
+        Upload a single model file as a zstd-compressed blob.
+        
+        The file is compressed while it is read and the compressed bytes are
+        sent from memory, without writing a compressed copy to disk first.
+        """
+        try:
+            with open(local_path, 'rb') as src:
+                size = os.fstat(src.fileno()).st_size
+                with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_reader(src) as reader:
+                    data = reader.read()
+            
+            blob = self.bucket.blob(blob_name + COMPRESSED_SUFFIX)
+            blob.upload_from_string(data, content_type='application/zstd')
+            
+            size_mb = size / 1024 / 1024
+            compressed_mb = len(data) / 1024 / 1024
+            logger.info(f"  ✓ {Path(local_path).name} ({size_mb:.1f}MB, {compressed_mb:.1f}MB compressed)")
+            return True
+            
+        except FileNotFoundError:
+            logger.warning(f"⚠ File not found: {local_path}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to upload {local_path}: {e}")
+            return False
+    
+    def models_exist(self) -> bool:
+        """Check if models exist in GCS"""
+        if not self.is_available():
+            return False
+        
+        try:
+            if not self._models_present(self._list_blobs()):
+                return False
+            
+            logger.info(f"✓ All model files found in GCS")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error checking models in GCS: {e}")
+            return False
+    
+    def _list_blobs(self) -> list:
+        """
+        List the blobs under the prefix, reusing a listing up to STORAGE_INFO_TTL seconds old.
+        
+        Uploads and deletes made through this service drop the cached listing.
+        """
+        listed_at, blobs = self._listing
+        now = time.monotonic()
+        if blobs is None or now - listed_at > config.STORAGE_INFO_TTL:
+            blobs = list(self.client.list_blobs(self.bucket_name, prefix=self.prefix))
+            self._listing = (now, blobs)
+        return blobs
+    
+    def _models_present(self, blobs: list) -> bool:
+        """Check that a listing contains every model file (compressed or not)."""
+        present = self._stored_names(blobs)
+        
+        for names in MODEL_FILES:
+            if not any(name in present for name in names):
+                logger.debug(f"Model file not found in GCS: {self.prefix}{names[0]}")
+                return False
+        return True
+    
+    def _stored_names(self, blobs: list) -> set:
+        """Model file names (without prefix or compressed suffix) in a listing."""
+        names = set()
+        for blob in blobs:
+            name = blob.name[len(self.prefix):]
+            if name.endswith(COMPRESSED_SUFFIX):
+                name = name[:-len(COMPRESSED_SUFFIX)]
+            names.add(name)
+        return names
+    
+    @staticmethod
+    def _pick_model_files(present: set) -> List[str]:
+        """First present name of each model file (the preferred name if none is)."""
+        return [next((name for name in names if name in present), names[0]) for names in MODEL_FILES]
+    
+    def get_storage_info(self) -> Dict:
+        """Get storage information"""
+        if not self.is_available():
+            return {
+                'status': 'unavailable',
+                'bucket': self.bucket_name,
+                'error': 'GCS client not initialized'
+            }
+        
+        try:
+            # One listing answers both which files exist and their details
+            blobs = self._list_blobs()
+            models_exist = self._models_present(blobs)
+            
+            info = {
+                'status': 'available',
+                'bucket': self.bucket_name,
+                'project': self.project,
+                'prefix': self.prefix,
+                'models_exist': models_exist,
+                'files': []
+            }
+            
+            # List model files
+            for blob in blobs:
+                info['files'].append({
+                    'name': blob.name.replace(self.prefix, ''),
+                    'size_mb': round(blob.size / 1024 / 1024, 2),
+                    'updated': blob.updated.isoformat() if blob.updated else None
+                })
+            
+            return info
+            
+        except Exception as e:
+            logger.error(f"Error getting storage info: {e}")
+            return {
+                'status': 'error', 
+                'bucket': self.bucket_name,
+                'error': str(e)
+            }
+    
+    def delete_models(self) -> bool:
+        """Delete all models from GCS (use with caution!)"""
+        if not self.is_available():
+            return False
+        
+        try:
+            logger.warning(f"🗑️ Deleting all models from GCS: gs://{self.bucket_name}/{self.prefix}")
+            
+            blobs = list(self.client.list_blobs(self.bucket_name, prefix=self.prefix))
+            
+            # Deletes inside client.batch() are sent as one multipart request
+            for start in range(0, len(blobs), DELETE_BATCH_SIZE):
+                with self.client.batch():
+                    for blob in blobs[start:start + DELETE_BATCH_SIZE]:
+                        blob.delete()
+            
+            for blob in blobs:
+                logger.info(f"  ✓ Deleted: {blob.name}")
+            logger.info(f"✓ Deleted {len(blobs)} files from GCS")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Delete failed: {e}")
+            return False
+        finally:
+            self._listing = (0.0, None)
\ No newline at end of file
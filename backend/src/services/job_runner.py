@@ -0,0 +1,102 @@
+"""
+Job Runner Module
+
+This module runs slow follow-up work of admin requests (writing dataset.json,
+re-indexing) in the background, so the request thread can return as soon as
+the in-memory change is made.
+
+Classes:
+    JobRunner: Serial background executor with pollable job status.
+
+Example:
+    >>> jobs = JobRunner()
+    >>> job_id = jobs.submit(data_service.save)
+    >>> jobs.status(job_id)
+    {'id': '...', 'status': 'running'}
+"""
+
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs jobs one at a time on a single background thread.
+
+    A single worker serializes all writes to the dataset file, and jobs run
+    in submission order. The executor thread is started on the first submit,
+    so a runner created before Gunicorn forks is safe to use in each worker.
+    Job status is per process: it is only known to the worker that accepted
+    the request.
+
+    Attributes:
+        max_jobs (int): Number of most recent jobs whose status is kept.
+    """
+
+    def __init__(self, max_jobs: int = 1000):
+        """
+        Initialize the JobRunner.
+
+        Args:
+            max_jobs (int, optional): Number of job statuses to keep. Defaults to 1000.
+        """
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='admin-jobs')
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = Lock()
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> str:
+        """
+        Queue a job.
+
+        Args:
+            fn (Callable): Function to run in the background.
+            *args, **kwargs: Arguments for fn.
+
+        Returns:
+            str: Job id for status().
+        """
+        job_id = uuid.uuid4().hex
+        future = self._executor.submit(self._run, job_id, fn, *args, **kwargs)
+        with self._lock:
+            self._jobs[job_id] = future
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    @staticmethod
+    def _run(job_id: str, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            raise
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a job.
+
+        Args:
+            job_id (str): Id returned by submit().
+
+        Returns:
+            Optional[Dict]: {"id", "status"} with status "pending", "running",
+                "done" or "error" (with "error" message), or None if unknown.
+        """
+        with self._lock:
+            future = self._jobs.get(job_id)
+        if future is None:
+            return None
+
+        if not future.done():
+            return {"id": job_id, "status": "running" if future.running() else "pending"}
+        error = future.exception()
+        if error is not None:
+            return {"id": job_id, "status": "error", "error": str(error)}
+        return {"id": job_id, "status": "done"}
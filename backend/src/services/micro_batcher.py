@@ -0,0 +1,162 @@
+"""
+Micro Batcher Module
+
+This module holds the request-coalescing machinery shared by the query
+encoder and the FAISS query batcher. Callers submit one request at a time
+and block on it; a background thread takes the pending requests off a queue
+and runs them through one batched call.
+
+Classes:
+    MicroBatcher: Base class for micro-batching front-ends.
+
+Example:
+    >>> class Doubler(MicroBatcher):
+    ...     def _run_batch(self, items):
+    ...         return [2 * item for item in items]
+    >>> Doubler(max_batch_size=8, max_wait_ms=2).submit(21)
+    42
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """A single request waiting for its batch to be run."""
+
+    __slots__ = ('item', 'event', 'result', 'error')
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """
+    Base class for micro-batching a blocking, batchable call.
+
+    A background thread waits for a request, takes every other request that
+    is already queued and, only if there are several, keeps collecting for up
+    to `max_wait_ms` (or until `max_batch_size` are queued) before running
+    the batch. A lone request is dispatched immediately, so an idle service
+    adds no latency; under load, requests arriving while a batch runs queue
+    up and are coalesced into the next one.
+
+    The worker thread is started lazily on first use and restarted after a
+    fork, so instances created in a preloading Gunicorn master keep working
+    in the forked workers.
+
+    Subclasses implement _run_batch().
+
+    Attributes:
+        max_batch_size (int): Maximum number of requests run together.
+        max_wait_ms (float): Maximum time to wait for a batch to fill up.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5.0, name: str = 'micro-batcher'):
+        """
+        Initialize the MicroBatcher.
+
+        Args:
+            max_batch_size (int, optional): Maximum requests per batch. Defaults to 32.
+            max_wait_ms (float, optional): Batch collection window. Defaults to 5.0.
+            name (str, optional): Name of the worker thread, also used in logs.
+        """
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.name = name
+
+        self._start_lock = threading.Lock()
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def submit(self, item: Any) -> Any:
+        """
+        Run a single request through the shared batch.
+
+        Args:
+            item: The request, as passed to _run_batch().
+
+        Returns:
+            The request's entry of the list returned by _run_batch().
+
+        Raises:
+            Exception: Re-raises any error raised by _run_batch() for the batch.
+        """
+        self._ensure_worker()
+
+        pending = _Pending(item)
+        self._queue.put(pending)
+        pending.event.wait()
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run_batch(self, items: List[Any]) -> List[Any]:
+        """Run the batched call: one result per item, in order."""
+        raise NotImplementedError
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if it is not running in this process."""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # Forked child: the parent's queue and thread are not usable here
+                self._queue = queue.Queue()
+                self._thread = None
+                self._pid = os.getpid()
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, run it, dispatch the results."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+
+                # A lone request is not held back waiting for company
+                remaining = deadline - time.monotonic()
+                if len(batch) == 1 or remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._process(batch)
+
+    def _process(self, batch: List[_Pending]) -> None:
+        """Run the whole batch in one call and hand each caller its result."""
+        try:
+            results = self._run_batch([pending.item for pending in batch])
+
+            for pending, result in zip(batch, results):
+                pending.result = result
+        except Exception as e:
+            logger.error(f"Batched call failed in {self.name} ({len(batch)} requests): {e}")
+            for pending in batch:
+                pending.error = e
+        finally:
+            for pending in batch:
+                pending.event.set()
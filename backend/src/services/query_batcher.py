@@ -0,0 +1,78 @@
+"""
+Query Batcher Module
+
+This module coalesces concurrent nearest-neighbour searches into a single
+batched FAISS call. Each FAISS search pays a fixed per-call cost, so stacking
+the query vectors of all in-flight requests and searching them together is
+much cheaper than searching them one by one.
+
+Classes:
+    QueryBatcher: Micro-batching front-end for a FAISS-style search function.
+
+Example:
+    >>> batcher = QueryBatcher(index.search, max_batch_size=32, max_wait_ms=5)
+    >>> distances, indices = batcher.search(query_emb, k=10)
+"""
+
+import numpy as np
+from typing import Callable, List, Tuple
+
+from .micro_batcher import MicroBatcher
+
+
+class QueryBatcher(MicroBatcher):
+    """
+    Micro-batching layer for nearest-neighbour search.
+
+    Callers submit one query vector at a time and block until the result is
+    ready. Queries queued together (see MicroBatcher) are stacked into one
+    (N, d) float32 matrix and searched with a single call.
+
+    Attributes:
+        search_fn (Callable): Function with the `index.search(xq, k)` signature.
+        max_batch_size (int): Maximum number of queries searched together.
+        max_wait_ms (float): Maximum time to wait for a batch to fill up.
+    """
+
+    def __init__(
+        self,
+        search_fn: Callable[[np.ndarray, int], Tuple[np.ndarray, np.ndarray]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize the QueryBatcher.
+
+        Args:
+            search_fn (Callable): Batched search function, e.g. `faiss_index.search`.
+            max_batch_size (int, optional): Maximum queries per batch. Defaults to 32.
+            max_wait_ms (float, optional): Batch collection window. Defaults to 5.0.
+        """
+        super().__init__(max_batch_size, max_wait_ms, name='faiss-query-batcher')
+        self.search_fn = search_fn
+
+    def search(self, query_emb: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search a single query vector through the shared batch.
+
+        Args:
+            query_emb (np.ndarray): Query vector of shape (d,) or (1, d).
+            k (int): Number of neighbours to return.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and indices, each of shape (1, k),
+                matching the layout returned by `index.search`.
+
+        Raises:
+            Exception: Re-raises any error raised by the underlying search.
+        """
+        return self.submit((np.asarray(query_emb, dtype=np.float32).reshape(-1), int(k)))
+
+    def _run_batch(self, queries: List[Tuple[np.ndarray, int]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Run one search for the whole batch and split it into per-query rows."""
+        xq = np.stack([vector for vector, _ in queries]).astype(np.float32, copy=False)
+        distances, indices = self.search_fn(xq, max(k for _, k in queries))
+        return [
+            (distances[i:i + 1, :k], indices[i:i + 1, :k])
+            for i, (_, k) in enumerate(queries)
+        ]
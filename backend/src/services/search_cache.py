@@ -0,0 +1,137 @@
+"""
+Search Cache Module
+
+This module caches hybrid search results. Search traffic contains many
+repeated and near-duplicate queries (autocomplete-driven typing, retries,
+agents rephrasing), and a cache hit skips the USE encoding, the FAISS search
+and the TF-IDF scoring entirely.
+
+Classes:
+    SearchCache: Two-tier (exact + semantic) cache of search results.
+
+Example:
+    >>> cache = SearchCache(max_entries=4096, semantic_entries=2048, threshold=0.97)
+    >>> results = cache.get(key)
+    >>> if results is None:
+    ...     results = cache.get_similar(query_emb, params)
+"""
+
+import logging
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    Two-tier cache of search results.
+
+    - Exact tier: LRU dictionary keyed by the normalized query and the search
+      parameters.
+    - Semantic tier: ring buffer of the last `semantic_entries` L2-normalized
+      query embeddings. A lookup returns the results of the most similar
+      cached query with the same parameters if its cosine similarity is at
+      least `threshold`; the oldest entry is overwritten first.
+
+    Cached result lists are shared between callers and must not be mutated.
+    Call clear() whenever the listings or models change.
+
+    Attributes:
+        max_entries (int): Capacity of the exact tier (0 disables it).
+        semantic_entries (int): Capacity of the semantic tier (0 disables it).
+        threshold (float): Minimum cosine similarity for a semantic hit.
+    """
+
+    def __init__(self, max_entries: int = 4096, semantic_entries: int = 2048, threshold: float = 0.97):
+        """
+        Initialize the SearchCache.
+
+        Args:
+            max_entries (int, optional): Exact tier capacity. Defaults to 4096.
+            semantic_entries (int, optional): Semantic tier capacity. Defaults to 2048.
+            threshold (float, optional): Cosine similarity for a semantic hit. Defaults to 0.97.
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.semantic_entries = max(0, int(semantic_entries))
+        self.threshold = float(threshold)
+
+        self._lock = Lock()
+        self._exact: "OrderedDict[Hashable, List[Dict[str, Any]]]" = OrderedDict()
+        self._sem_vectors: Optional[np.ndarray] = None
+        self._sem_params: List[Hashable] = [None] * self.semantic_entries
+        self._sem_results: List[Optional[List[Dict[str, Any]]]] = [None] * self.semantic_entries
+        self._sem_next = 0
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Get the results cached under an exact key, or None."""
+        if not self.max_entries:
+            return None
+        with self._lock:
+            results = self._exact.get(key)
+            if results is not None:
+                self._exact.move_to_end(key)
+            return results
+
+    def put(self, key: Hashable, results: List[Dict[str, Any]]) -> None:
+        """Cache results under an exact key, evicting the least recently used entry."""
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._exact[key] = results
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+    def get_similar(self, query_emb: np.ndarray, params: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the results of the most similar cached query with the same parameters.
+
+        Args:
+            query_emb (np.ndarray): L2-normalized query embedding of shape (1, d).
+            params (Hashable): Search parameters the results must have been computed with.
+
+        Returns:
+            Optional[List[Dict]]: Cached results, or None if no query is similar enough.
+        """
+        if not self.semantic_entries:
+            return None
+        with self._lock:
+            if self._sem_vectors is None:
+                return None
+            similarities = self._sem_vectors @ query_emb.reshape(-1)
+            same_params = np.fromiter(
+                (p == params for p in self._sem_params), dtype=bool, count=self.semantic_entries
+            )
+            if not same_params.any():
+                return None
+            similarities[~same_params] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._sem_results[best]
+
+    def put_similar(self, query_emb: np.ndarray, params: Hashable, results: List[Dict[str, Any]]) -> None:
+        """Add a query embedding and its results to the semantic tier, replacing the oldest entry."""
+        if not self.semantic_entries:
+            return
+        with self._lock:
+            vector = query_emb.reshape(-1)
+            if self._sem_vectors is None or self._sem_vectors.shape[1] != vector.shape[0]:
+                self._sem_vectors = np.zeros((self.semantic_entries, vector.shape[0]), dtype=np.float32)
+            slot = self._sem_next
+            self._sem_vectors[slot] = vector
+            self._sem_params[slot] = params
+            self._sem_results[slot] = results
+            self._sem_next = (slot + 1) % self.semantic_entries
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._exact.clear()
+            self._sem_vectors = None
+            self._sem_params = [None] * self.semantic_entries
+            self._sem_results = [None] * self.semantic_entries
+            self._sem_next = 0
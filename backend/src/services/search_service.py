@@ -1,303 +1,718 @@
-"""
-Search Service Module
-
-This module provides hybrid search functionality combining semantic and keyword-based search.
-It uses FAISS for efficient semantic similarity search and TF-IDF for keyword matching.
-
-Classes:
-    SearchService: Main service class for search operations.
-
-Example:
-    >>> from backend.src.services.search_service import SearchService
-    >>> service = SearchService(model_manager, listings)
-    >>> results = service.hybrid_search("coffee franchise", top_n=10)
-"""
-
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from threading import Lock
-import logging
-from typing import List, Dict, Any
-
-logger = logging.getLogger(__name__)
-
-
-class SearchService:
-    """
-    Hybrid search service combining semantic and keyword-based search.
-    
-    This class provides advanced search functionality by combining:
-    - Semantic search using Universal Sentence Encoder and FAISS
-    - Keyword search using TF-IDF vectorization
-    - Autocomplete suggestions
-    - Content-based recommendations
-    
-    Attributes:
-        model_manager: Manager for ML models (USE, TF-IDF, FAISS).
-        listings (List[Dict]): List of franchise listings to search.
-        tfidf_matrix: Sparse matrix of TF-IDF vectors for all listings.
-        search_lock (Lock): Thread lock for safe concurrent access.
-    
-    Example:
-        >>> service = SearchService(model_manager, listings)
-        >>> results = service.hybrid_search("restaurant franchise", top_n=5)
-        >>> for result in results:
-        ...     print(result['title'], result['similarity_score'])
-    """
-    
-    def __init__(self, model_manager, listings: List[Dict[str, Any]]):
-        """
-        Initialize the SearchService.
-        
-        Args:
-            model_manager: Instance of ModelManager with loaded models.
-            listings (List[Dict]): List of franchise listings.
-        """
-        self.model_manager = model_manager
-        self.listings = listings
-        self.tfidf_matrix = None
-        self.search_lock = Lock()
-        self._build_tfidf_matrix()
-    
-    def _build_tfidf_matrix(self) -> None:
-        """
-        Build TF-IDF matrix from current listings.
-        
-        This private method transforms all listing texts into TF-IDF vectors
-        for efficient keyword-based search.
-        """
-        texts = [self._prepare_text(listing) for listing in self.listings]
-        with self.model_manager.model_lock:
-            if self.model_manager.tfidf_vectorizer:
-                self.tfidf_matrix = self.model_manager.tfidf_vectorizer.transform(texts)
-    
-    @staticmethod
-    def _prepare_text(listing: Dict[str, Any]) -> str:
-        """
-        Prepare listing text for embedding and vectorization.
-        
-        Combines multiple fields from a listing into a single text string
-        for processing by ML models.
-        
-        Args:
-            listing (Dict): A franchise listing dictionary.
-        
-        Returns:
-            str: Concatenated text from all relevant fields.
-        """
-        return " ".join([
-            str(listing.get("title", "")),
-            str(listing.get("sector", "")),
-            str(listing.get("description", "")),
-            str(listing.get("investment_range", "")),
-            str(listing.get("location", "")),
-            " ".join(listing.get("tags", []))
-        ])
-    
-    def hybrid_search(
-        self, 
-        query: str, 
-        top_n: int = 10, 
-        semantic_weight: float = 0.6
-    ) -> List[Dict[str, Any]]:
-        """
-        Perform hybrid search combining semantic and keyword matching.
-        
-        This method combines semantic similarity (using Universal Sentence Encoder
-        and FAISS) with keyword matching (using TF-IDF) to provide more accurate
-        and relevant search results.
-        
-        Args:
-            query (str): Search query string.
-            top_n (int, optional): Number of results to return. Defaults to 10.
-            semantic_weight (float, optional): Weight for semantic score (0.0-1.0).
-                Defaults to 0.6 (60% semantic, 40% keyword).
-        
-        Returns:
-            List[Dict]: List of matching listings with similarity scores.
-                Each result includes:
-                - All original listing fields
-                - similarity_score: Combined score
-                - semantic_score: Semantic similarity score
-                - keyword_score: Keyword matching score
-        
-        Example:
-            >>> results = service.hybrid_search("coffee shop", top_n=5, semantic_weight=0.7)
-            >>> for result in results:
-            ...     print(f"{result['title']}: {result['similarity_score']:.3f}")
-        """
-        with self.search_lock:
-            try:
-                # 1. Semantic search using FAISS
-                with self.model_manager.model_lock:
-                    query_emb = self.model_manager.use_model([query]).numpy().astype("float32")
-                    import faiss
-                    faiss.normalize_L2(query_emb)
-                    semantic_scores, semantic_indices = self.model_manager.faiss_index.search(
-                        query_emb, len(self.listings)
-                    )
-                
-                # 2. Keyword search using TF-IDF
-                with self.model_manager.model_lock:
-                    query_tfidf = self.model_manager.tfidf_vectorizer.transform([query])
-                    keyword_scores = cosine_similarity(query_tfidf, self.tfidf_matrix).flatten()
-                
-                # 3. Combine scores with weighted average
-                combined_scores = {}
-                for idx in range(len(self.listings)):
-                    sem_idx = np.where(semantic_indices[0] == idx)[0]
-                    if len(sem_idx) > 0:
-                        semantic_score = semantic_scores[0][sem_idx[0]]
-                    else:
-                        semantic_score = 0.0
-                    keyword_score = keyword_scores[idx]
-                    combined_scores[idx] = (
-                        semantic_weight * semantic_score +
-                        (1 - semantic_weight) * keyword_score
-                    )
-                
-                # 4. Sort by combined score and return top results
-                sorted_results = sorted(
-                    combined_scores.items(), 
-                    key=lambda x: x[1], 
-                    reverse=True
-                )
-                results = []
-                
-                for idx, score in sorted_results[:top_n]:
-                    result = self.listings[idx].copy()
-                    result["similarity_score"] = float(score)
-                    result["semantic_score"] = float(
-                        semantic_scores[0][np.where(semantic_indices[0] == idx)[0][0]]
-                    )
-                    result["keyword_score"] = float(keyword_scores[idx])
-                    results.append(result)
-                
-                return results
-                
-            except Exception as e:
-                logger.error(f"Search failed: {e}", exc_info=True)
-                return []
-    
-    def get_recommendations(
-        self, 
-        listing_id: int, 
-        top_n: int = 5, 
-        sector_filter: bool = True
-    ) -> List[Dict[str, Any]]:
-        """
-        Get similar franchise recommendations based on a listing ID.
-        
-        This method finds franchises similar to a given listing using semantic
-        similarity. Optionally filters results to the same sector.
-        
-        Args:
-            listing_id (int): ID of the base listing to find recommendations for.
-            top_n (int, optional): Number of recommendations to return. Defaults to 5.
-            sector_filter (bool, optional): If True, only return franchises in the
-                same sector. Defaults to True.
-        
-        Returns:
-            List[Dict]: List of similar listings with similarity scores.
-        
-        Raises:
-            ValueError: If the listing_id is not found.
-        
-        Example:
-            >>> recommendations = service.get_recommendations(listing_id=42, top_n=5)
-            >>> for rec in recommendations:
-            ...     print(f"{rec['title']}: {rec['similarity_score']:.3f}")
-        """
-        idx = next(
-            (i for i, listing in enumerate(self.listings) if listing.get("id") == listing_id), 
-            None
-        )
-        if idx is None:
-            raise ValueError(f"Listing ID {listing_id} not found")
-        
-        try:
-            with self.model_manager.model_lock:
-                sim_scores, indices = self.model_manager.faiss_index.search(
-                    self.model_manager.embeddings[idx].reshape(1, -1), 
-                    top_n + 10
-                )
-            
-            base_listing = self.listings[idx]
-            results = []
-            
-            for i, candidate_idx in enumerate(indices[0]):
-                # Skip the base listing itself
-                if candidate_idx == idx:
-                    continue
-                
-                # Apply sector filter if enabled
-                if sector_filter and self.listings[candidate_idx].get('sector') != base_listing.get('sector'):
-                    continue
-                
-                result = self.listings[candidate_idx].copy()
-                result["similarity_score"] = float(sim_scores[0][i])
-                results.append(result)
-                
-                if len(results) >= top_n:
-                    break
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Recommendation failed: {e}", exc_info=True)
-            return []
-    
-    def autocomplete(self, query: str, max_suggestions: int = 8) -> List[Dict[str, str]]:
-        """
-        Generate autocomplete suggestions based on a partial query.
-        
-        This method searches through listing titles, sectors, and tags to find
-        matches for the query string and returns them as autocomplete suggestions.
-        
-        Args:
-            query (str): Partial query string to autocomplete.
-            max_suggestions (int, optional): Maximum number of suggestions to return.
-                Defaults to 8.
-        
-        Returns:
-            List[Dict]: List of suggestion dictionaries, each containing:
-                - text: The suggestion text
-                - type: Field type ('title', 'sector', or 'tags')
-                - category: The sector of the listing
-        
-        Example:
-            >>> suggestions = service.autocomplete("cof", max_suggestions=5)
-            >>> for suggestion in suggestions:
-            ...     print(f"{suggestion['text']} ({suggestion['type']})")
-            Coffee Shop (title)
-            Coffee & Beverages (sector)
-        """
-        query = query.lower().strip()
-        if not query:
-            return []
-        
-        suggestions = []
-        seen = set()
-        
-        for listing in self.listings:
-            for field in ["title", "sector", "tags"]:
-                values = listing.get(field, [])
-                if field == "tags":
-                    items = values
-                else:
-                    items = [values]
-                
-                for item in items:
-                    text = str(item).lower()
-                    if query in text and text not in seen:
-                        suggestions.append({
-                            "text": str(item),
-                            "type": field,
-                            "category": listing.get("sector", "Other")
-                        })
-                        seen.add(text)
-            
-            if len(suggestions) >= max_suggestions:
-                break
-        
-        return suggestions
+"""
+Search Service Module
+
+This module provides hybrid search functionality combining semantic and keyword-based search.
+It uses FAISS for efficient semantic similarity search and TF-IDF for keyword matching.
+
+Classes:
+    SearchService: Main service class for search operations.
+
+Example:
+    >>> from backend.src.services.search_service import SearchService
+    >>> service = SearchService(model_manager, listings)
+    >>> results = service.hybrid_search("coffee franchise", top_n=10)
+"""
+
+import re
+import heapq
+import faiss
+import numpy as np
+import marisa_trie
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from threading import Lock
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..core.config import config
+from .query_batcher import QueryBatcher
+from .encoder_service import EncoderService
+from .search_cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+
+def _fuse_scores(sem_scores: np.ndarray, kw_scores: np.ndarray, w: float) -> np.ndarray:
+    """
+    Fuse semantic and keyword scores: w * sem + (1 - w) * kw.
+    
+    Both inputs must be C-contiguous float32 arrays of equal length; the
+    result is a new float32 array computed in two vectorized passes.
+    """
+    fused = np.multiply(kw_scores, np.float32(1.0 - w))
+    fused += np.multiply(sem_scores, np.float32(w))
+    return fused
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+    
+    Uses a partial selection (np.partition) so only the candidates that can
+    make the cut are sorted. Ties are broken by index, exactly like a stable
+    descending argsort of the whole array.
+    """
+    n = scores.shape[0]
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    
+    kth_score = np.partition(scores, n - k)[n - k]
+    candidates = np.flatnonzero(scores >= kth_score)
+    return candidates[np.argsort(-scores[candidates], kind='stable')[:k]]
+
+
+def _smallest_distinct(values, k: int) -> List[int]:
+    """
+    The k smallest distinct values of an iterable, in ascending order.
+    
+    Keeps a bounded max-heap of the best k seen so far, so memory is O(k)
+    and the input is consumed lazily in one pass instead of being collected
+    and sorted whole.
+    """
+    if k <= 0:
+        return []
+    heap: List[int] = []  # Negated values: heap[0] is the largest kept
+    kept = set()
+    for value in values:
+        if value in kept:
+            continue
+        if len(heap) < k:
+            heapq.heappush(heap, -value)
+            kept.add(value)
+        elif value < -heap[0]:
+            kept.discard(-heapq.heapreplace(heap, -value))
+            kept.add(value)
+    return sorted(-value for value in heap)
+
+
+class SearchService:
+    """
+    Hybrid search service combining semantic and keyword-based search.
+    
+    This class provides advanced search functionality by combining:
+    - Semantic search using Universal Sentence Encoder and FAISS
+    - Keyword search using TF-IDF vectorization
+    - Autocomplete suggestions
+    - Content-based recommendations
+    
+    Attributes:
+        model_manager: Manager for ML models (USE, TF-IDF, FAISS).
+        listings (List[Dict]): List of franchise listings to search.
+        tfidf_matrix: Sparse matrix of TF-IDF vectors for all listings.
+        query_batcher (QueryBatcher): Coalesces concurrent FAISS searches.
+        encoder (EncoderService): Coalesces concurrent USE query encodings.
+        autocomplete_trie (marisa_trie.RecordTrie): Word-prefix index of suggestions.
+        cache (SearchCache): Exact + semantic cache of search results.
+        autocomplete_cache (SearchCache): Exact cache of autocomplete suggestions per prefix.
+        recommend_cache (SearchCache): Exact cache of recommendations per listing and parameters.
+        version (int): Incremented on every refresh(); part of every cache key.
+    
+    Example:
+        >>> service = SearchService(model_manager, listings)
+        >>> results = service.hybrid_search("restaurant franchise", top_n=5)
+        >>> for result in results:
+        ...     print(result['title'], result['similarity_score'])
+    """
+    
+    def __init__(self, model_manager, listings: List[Dict[str, Any]]):
+        """
+        Initialize the SearchService.
+        
+        Args:
+            model_manager: Instance of ModelManager with loaded models.
+            listings (List[Dict]): List of franchise listings.
+        """
+        self.model_manager = model_manager
+        self.listings = listings
+        self.tfidf_matrix = None
+        # (listings snapshot, TF-IDF matrix, vectorizer that produced it) published
+        # together in one assignment: searches read all three from here, so they
+        # never see a matrix whose rows do not match the listings, or transform
+        # the query with a different vocabulary than the rows
+        self._tfidf_state: Tuple[List[Dict[str, Any]], Any, Any] = ([], None, None)
+        # (mask listings, snapshot listings, positions) of the last filter mask
+        # lined up with the snapshot, see _align_mask
+        self._mask_alignment: Tuple = (None, None, None)
+        # (listings snapshot, prepared texts) of the last TF-IDF build, see _listing_texts
+        self._texts_state: Tuple[List[Dict[str, Any]], List[str]] = ([], [])
+        self._refresh_lock = Lock()
+        self.autocomplete_trie = None
+        # (word-prefix trie, suggestions its positions refer to) published
+        # together in one assignment, like _tfidf_state
+        self._autocomplete: Tuple[Any, List[Dict[str, str]]] = (None, [])
+        self.version = 0
+        self.query_batcher = QueryBatcher(
+            self._search_index,
+            max_batch_size=config.SEARCH_BATCH_MAX_SIZE,
+            max_wait_ms=config.SEARCH_BATCH_MAX_WAIT_MS
+        )
+        self.encoder = EncoderService(
+            self._encode_texts,
+            max_batch_size=config.ENCODER_BATCH_MAX_SIZE,
+            max_wait_ms=config.ENCODER_BATCH_MAX_WAIT_MS
+        )
+        self.cache = SearchCache(
+            max_entries=config.SEARCH_CACHE_SIZE,
+            semantic_entries=config.SEARCH_SEMANTIC_CACHE_SIZE,
+            threshold=config.SEARCH_SEMANTIC_CACHE_THRESHOLD
+        )
+        self.autocomplete_cache = SearchCache(
+            max_entries=config.AUTOCOMPLETE_CACHE_SIZE, semantic_entries=0
+        )
+        self.recommend_cache = SearchCache(
+            max_entries=config.RECOMMEND_CACHE_SIZE, semantic_entries=0
+        )
+        self._build_tfidf_matrix()
+        self._build_autocomplete_index()
+    
+    def refresh(self, listings: List[Dict[str, Any]]) -> None:
+        """
+        Point the service at an updated set of listings.
+        
+        Rebuilds everything derived from the listings (TF-IDF matrix and
+        autocomplete index) and drops cached search results. Call after
+        listings are added, updated or deleted, or the models are reloaded.
+        
+        Args:
+            listings (List[Dict]): The current list of franchise listings. It is
+                kept as the search snapshot, so it must be replaced rather than
+                modified afterwards (as DataService does).
+        """
+        with self._refresh_lock:
+            self.listings = listings
+            self._update_tfidf_matrix()
+            self._build_autocomplete_index()
+            # Entries computed against the old listings by in-flight requests are
+            # stored under the old version and can never be hit again
+            self.version += 1
+            self.cache.clear()
+            self.autocomplete_cache.clear()
+            self.recommend_cache.clear()
+    
+    def _search_index(self, xq: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run one FAISS search for a batch of query vectors.
+        
+        Used by the query batcher; resolves the index on every call so a
+        reloaded index (or its GPU copy) is picked up without rebuilding
+        the batcher. model_lock is only held to resolve the index: CPU
+        indexes are read-only once published and are searched concurrently.
+        """
+        with self.model_manager.model_lock:
+            index = self.model_manager.get_search_index()
+            if index is not self.model_manager.faiss_index:
+                # GPU indexes do not support concurrent searches
+                return index.search(xq, k)
+        return index.search(xq, k)
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a batch of query texts into L2-normalized float32 rows.
+        
+        Used by the encoder service; like _search_index, the model is
+        resolved on every call so a reloaded model is picked up. The batch
+        is normalized in place with one call; each query gets a row view.
+        """
+        use_model = self.model_manager.use_model  # Loaded once, never swapped
+        embeddings = np.ascontiguousarray(use_model(texts).numpy(), dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+        return embeddings
+    
+    def _build_tfidf_matrix(self) -> None:
+        """
+        Build TF-IDF matrix from current listings.
+        
+        This private method transforms all listing texts into TF-IDF vectors
+        for efficient keyword-based search. The matrix is built aside and then
+        published, so concurrent searches keep using the previous one.
+        """
+        listings = self.listings
+        texts = self._listing_texts(listings)
+        with self.model_manager.model_lock:
+            vectorizer = self.model_manager.tfidf_vectorizer
+        if vectorizer:
+            matrix = self._tfidf_transform(vectorizer, texts)
+            self._publish_tfidf(listings, matrix, vectorizer)
+    
+    def _publish_tfidf(self, listings: List[Dict[str, Any]], matrix, vectorizer) -> None:
+        """Swap in a TF-IDF matrix, the listings its rows belong to and its vectorizer."""
+        self._tfidf_state = (listings, matrix, vectorizer)
+        self.tfidf_matrix = matrix
+    
+    def _update_tfidf_matrix(self) -> None:
+        """
+        Update the TF-IDF matrix after the listings changed.
+        
+        The fitted vectorizer transforms each text independently, so rows of
+        listings that are unchanged (the same dict objects as when the matrix
+        was built; DataService replaces a dict when it updates a listing) are
+        reused and only added or updated listings are transformed. Falls back
+        to a full rebuild when the vectorizer was reloaded.
+        """
+        previous, matrix, vectorizer = self._tfidf_state
+        if (matrix is None
+                or vectorizer is not self.model_manager.tfidf_vectorizer
+                or matrix.shape[0] != len(previous)):
+            self._build_tfidf_matrix()
+            return
+        
+        listings = self.listings
+        # The snapshot keeps the old dicts alive, so their id()s cannot be reused
+        old_rows = {id(listing): row for row, listing in enumerate(previous)}
+        rows = np.fromiter(
+            (old_rows.get(id(listing), -1) for listing in listings),
+            dtype=np.intp,
+            count=len(listings)
+        )
+        new_positions = np.flatnonzero(rows < 0)
+        if len(new_positions) == 0 and len(rows) == len(previous) and (rows == np.arange(len(rows))).all():
+            self._publish_tfidf(listings, matrix, vectorizer)
+            return
+        
+        all_texts = self._listing_texts(listings)
+        texts = [all_texts[position] for position in new_positions]
+        stacked = matrix
+        if texts:
+            new_rows = self._tfidf_transform(vectorizer, texts)
+            stacked = sp.vstack([stacked, new_rows], format='csr')
+        
+        # New rows were appended after the old ones, in listing order
+        rows[new_positions] = len(previous) + np.arange(len(new_positions))
+        self._publish_tfidf(listings, stacked[rows], vectorizer)
+    
+    @staticmethod
+    def _tfidf_transform(vectorizer, texts: List[str]):
+        """
+        TF-IDF rows of texts as an L2-normalized float32 CSR matrix.
+        
+        Keyword scores are plain dot products of these rows, so vectorizers
+        that do not normalize themselves (a legacy pickle fitted with
+        norm=None) are normalized here. Legacy pickles also produce float64
+        rows; float32 halves the matrix and is ample for cosine scores.
+        """
+        rows = vectorizer.transform(texts).tocsr().astype(np.float32, copy=False)
+        if getattr(vectorizer, 'norm', 'l2') != 'l2':
+            rows = normalize(rows, copy=False)
+        return rows
+    
+    def _listing_texts(self, listings: List[Dict[str, Any]]) -> List[str]:
+        """
+        Prepared texts of the given listings snapshot.
+        
+        Texts of listings seen in the previous snapshot (same dict objects)
+        are reused, so a rebuild after a model reload or an update only
+        prepares the text of new or changed listings.
+        """
+        previous, previous_texts = self._texts_state
+        known = {id(listing): text for listing, text in zip(previous, previous_texts)}
+        texts = [known.get(id(listing)) or self._prepare_text(listing) for listing in listings]
+        self._texts_state = (listings, texts)
+        return texts
+    
+    def _build_autocomplete_index(self) -> None:
+        """
+        Build the autocomplete suggestion list and its word-prefix trie.
+        
+        Suggestions are the unique (case-insensitive) titles, sectors and tags,
+        in listing order. The trie maps every word-suffix of a lower-cased
+        suggestion ("coffee shop", "shop") to the suggestion's position, so a
+        query matches any suggestion containing a word that starts with it.
+        """
+        suggestions = []
+        seen = set()
+        entries = []
+        
+        for listing in self.listings:
+            category = listing.get("sector", "Other")
+            for field in ["title", "sector", "tags"]:
+                values = listing.get(field)
+                items = (values or []) if field == "tags" else [values]
+                
+                for item in items:
+                    text = str(item).lower()
+                    if text in seen:
+                        continue
+                    seen.add(text)
+                    position = len(suggestions)
+                    suggestions.append({"text": str(item), "type": field, "category": category})
+                    for word in re.finditer(r'\S+', text):
+                        entries.append((text[word.start():], (position,)))
+        
+        trie = marisa_trie.RecordTrie('<I', entries)
+        self._autocomplete = (trie, suggestions)
+        self.autocomplete_trie = trie
+    
+    @staticmethod
+    def _prepare_text(listing: Dict[str, Any]) -> str:
+        """
+        Prepare listing text for embedding and vectorization.
+        
+        Combines multiple fields from a listing into a single text string
+        for processing by ML models.
+        
+        Args:
+            listing (Dict): A franchise listing dictionary.
+        
+        Returns:
+            str: Concatenated text from all relevant fields.
+        """
+        return " ".join([
+            str(listing.get("title", "")),
+            str(listing.get("sector", "")),
+            str(listing.get("description", "")),
+            str(listing.get("investment_range", "")),
+            str(listing.get("location", "")),
+            " ".join(listing.get("tags", []))
+        ])
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a query (batched with concurrent ones) into an L2-normalized (1, d) vector."""
+        return self.encoder.encode(query)
+    
+    def search(
+        self,
+        query: str,
+        top_n: int = 10,
+        semantic_weight: float = 0.6,
+        mask: Optional[np.ndarray] = None,
+        filters_key: Tuple = (),
+        mask_listings: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cached hybrid search.
+        
+        Looks the query up in the exact cache, then in the semantic cache
+        (a previous query with the same parameters and a near-identical
+        embedding), and only runs hybrid_search() on a miss. The query is
+        lower-cased and its whitespace collapsed before it is looked up,
+        encoded and searched. A filter that matches nothing returns an empty
+        list without searching.
+        
+        Args:
+            query (str): Search query string.
+            top_n (int, optional): Number of results to return. Defaults to 10.
+            semantic_weight (float, optional): Weight for semantic score. Defaults to 0.6.
+                Rounded to 2 decimals so near-identical weights share cache entries.
+            mask (np.ndarray, optional): Filter mask, see hybrid_search().
+            filters_key (Tuple, optional): Hashable description of the filters
+                that produced `mask`; part of the cache key.
+            mask_listings (List[Dict], optional): Listings `mask` is parallel to,
+                see hybrid_search().
+        
+        Returns:
+            List[Dict]: Search results as returned by hybrid_search(). The list
+                may be shared with other callers and must not be mutated.
+        """
+        if mask is not None and not mask.any():
+            return []  # Nothing passes the filters: skip encoding and search
+        
+        semantic_weight = round(float(semantic_weight), 2)
+        params = (self.version, top_n, semantic_weight, filters_key)
+        # The query is searched in the normalized form it is cached under, so
+        # every spelling that shares a cache entry gets the same results
+        query = " ".join(query.lower().split())
+        exact_key = (query, params)
+        results = self.cache.get(exact_key)
+        if results is not None:
+            return results
+        
+        query_emb = self._encode_query(query)
+        results = self.cache.get_similar(query_emb, params)
+        if results is None:
+            results = self.hybrid_search(
+                query, top_n, semantic_weight, mask, query_emb=query_emb, mask_listings=mask_listings
+            )
+            if not results:
+                return results  # Failed or empty searches are not cached
+            self.cache.put_similar(query_emb, params, results)
+        
+        self.cache.put(exact_key, results)
+        return results
+    
+    def hybrid_search(
+        self, 
+        query: str, 
+        top_n: int = 10, 
+        semantic_weight: float = 0.6,
+        mask: Optional[np.ndarray] = None,
+        query_emb: Optional[np.ndarray] = None,
+        mask_listings: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform hybrid search combining semantic and keyword matching.
+        
+        This method combines semantic similarity (using Universal Sentence Encoder
+        and FAISS) with keyword matching (using TF-IDF) to provide more accurate
+        and relevant search results.
+        
+        Args:
+            query (str): Search query string.
+            top_n (int, optional): Number of results to return. Defaults to 10.
+            semantic_weight (float, optional): Weight for semantic score (0.0-1.0).
+                Defaults to 0.6 (60% semantic, 40% keyword).
+            mask (np.ndarray, optional): Boolean array parallel to the listings;
+                only listings where it is True are ranked (see DataService.filter_listings).
+            query_emb (np.ndarray, optional): Pre-computed normalized query
+                embedding (see _encode_query); encoded here if omitted.
+            mask_listings (List[Dict], optional): Listings `mask` was built
+                against. When they are not the searched snapshot (listings
+                changed since the last refresh()), the mask is lined up with
+                the snapshot, see _align_mask. If omitted, `mask` is assumed
+                to follow the snapshot's positions.
+        
+        Returns:
+            List[Dict]: List of matching listings with similarity scores.
+                Each result includes:
+                - All original listing fields
+                - similarity_score: Combined score
+                - semantic_score: Semantic similarity score
+                - keyword_score: Keyword matching score
+        
+        Example:
+            >>> results = service.hybrid_search("coffee shop", top_n=5, semantic_weight=0.7)
+            >>> for result in results:
+            ...     print(f"{result['title']}: {result['similarity_score']:.3f}")
+        """
+        # Searches are not serialized with each other: concurrent queries
+        # must reach the query batcher together to be coalesced.
+        # Listings and TF-IDF rows come from one published snapshot, which a
+        # concurrent refresh() replaces but never modifies.
+        listings, tfidf_matrix, vectorizer = self._tfidf_state
+        num_listings = len(listings)
+        candidates = None
+        if mask is not None:
+            mask = self._align_mask(mask, mask_listings, listings)
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []  # Nothing passes the filters: no need to search all listings
+        try:
+            # 1. Semantic search using FAISS (encoding and search are both
+            #    batched with concurrent queries)
+            if query_emb is None:
+                query_emb = self._encode_query(query)
+            semantic_scores, semantic_indices = self.query_batcher.search(
+                query_emb, self._semantic_k(top_n, num_listings, candidates)
+            )
+            
+            # 2. Keyword search using TF-IDF (with the matrix's own vectorizer)
+            query_tfidf = self._tfidf_transform(vectorizer, [query])
+            # Rows are L2-normalized, so the dot product is the cosine similarity
+            keyword_scores = (tfidf_matrix @ query_tfidf.T).toarray().ravel()
+            
+            # 3. Combine scores with weighted average
+            # (ANN indexes may not return every listing: missing ones score 0)
+            found = semantic_indices[0]
+            valid = (found >= 0) & (found < num_listings)
+            semantic_by_idx = np.zeros(num_listings, dtype=np.float32)
+            semantic_by_idx[found[valid]] = semantic_scores[0][valid]
+            keyword_scores = np.ascontiguousarray(keyword_scores, dtype=np.float32)
+            combined_scores = _fuse_scores(semantic_by_idx, keyword_scores, semantic_weight)
+            
+            # 4. Sort by combined score (within the filter mask) and return top results
+            #    Only the final top_n listings are turned into result dicts.
+            if mask is None:
+                ranked = _top_k(combined_scores, top_n)
+            else:
+                ranked = candidates[_top_k(combined_scores[candidates], top_n)]
+            results = []
+            
+            for idx in ranked:
+                result = listings[idx].copy()
+                result["similarity_score"] = float(combined_scores[idx])
+                result["semantic_score"] = float(semantic_by_idx[idx])
+                result["keyword_score"] = float(keyword_scores[idx])
+                results.append(result)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Search failed: {e}", exc_info=True)
+            return []
+    
+    def _align_mask(
+        self,
+        mask: np.ndarray,
+        mask_listings: Optional[List[Dict[str, Any]]],
+        listings: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Line a filter mask up with the positions of the searched snapshot.
+        
+        Admin mutations change DataService.listings right away but the search
+        snapshot only at the next refresh(), so in between positions may have
+        shifted. Snapshot listings are matched to the mask's listings by
+        identity (listing dicts are replaced, never modified): listings deleted
+        or updated since the snapshot match nothing and are filtered out. The
+        position map is kept for the next search against the same pair.
+        """
+        if mask_listings is None:
+            # The mask may already cover listings added since the snapshot
+            return mask[:len(listings)]
+        if mask_listings is listings:
+            return mask
+        
+        source, target, positions = self._mask_alignment
+        if source is not mask_listings or target is not listings:
+            # Both lists keep their dicts alive, so their id()s cannot be reused
+            where = {id(listing): position for position, listing in enumerate(mask_listings)}
+            positions = np.fromiter(
+                (where.get(id(listing), -1) for listing in listings),
+                dtype=np.intp,
+                count=len(listings)
+            )
+            self._mask_alignment = (mask_listings, listings, positions)
+        
+        aligned = np.zeros(len(listings), dtype=bool)
+        found = positions >= 0
+        aligned[found] = mask[positions[found]]
+        return aligned
+    
+    @staticmethod
+    def _semantic_k(top_n: int, num_listings: int, candidates: Optional[np.ndarray]) -> int:
+        """
+        Number of FAISS neighbours to fetch for a hybrid search.
+        
+        Only the SEMANTIC_OVERSAMPLE * top_n nearest listings get a semantic
+        score (the rest score 0, as with ANN misses); listings that far down
+        contribute little to the top of the fused ranking. With a filter the
+        count is scaled by the inverse of the fraction of listings that pass,
+        so about as many neighbours survive the filter.
+        """
+        if config.SEMANTIC_OVERSAMPLE <= 0 or num_listings == 0:
+            return num_listings
+        k = top_n * config.SEMANTIC_OVERSAMPLE
+        if candidates is not None:
+            k = k * num_listings // max(1, len(candidates))
+        return max(1, min(num_listings, k))
+    
+    def get_recommendations(
+        self, 
+        listing_id: int, 
+        top_n: int = 5, 
+        sector_filter: bool = True,
+        id_index: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get similar franchise recommendations based on a listing ID.
+        
+        This method finds franchises similar to a given listing using semantic
+        similarity. Optionally filters results to the same sector.
+        
+        Args:
+            listing_id (int): ID of the base listing to find recommendations for.
+            top_n (int, optional): Number of recommendations to return. Defaults to 5.
+            sector_filter (bool, optional): If True, only return franchises in the
+                same sector. Defaults to True.
+            id_index (Dict[str, int], optional): str(listing id) -> position map
+                (DataService.id_index) used to find the base listing. It may run
+                ahead of the search snapshot; the listings are scanned instead
+                when the position does not match the snapshot.
+        
+        Returns:
+            List[Dict]: List of similar listings with similarity scores. The
+                list may be shared with other callers and must not be mutated.
+        
+        Raises:
+            ValueError: If the listing_id is not found.
+        
+        Example:
+            >>> recommendations = service.get_recommendations(listing_id=42, top_n=5)
+            >>> for rec in recommendations:
+            ...     print(f"{rec['title']}: {rec['similarity_score']:.3f}")
+        """
+        # Popular listings are viewed (and recommended from) over and over
+        key = (self.version, listing_id, top_n, sector_filter)
+        cached = self.recommend_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        listings = self.listings
+        idx = None if id_index is None else id_index.get(str(listing_id))
+        if idx is None or idx >= len(listings) or listings[idx].get("id") != listing_id:
+            idx = next(
+                (i for i, listing in enumerate(listings) if listing.get("id") == listing_id), 
+                None
+            )
+        if idx is None:
+            raise ValueError(f"Listing ID {listing_id} not found")
+        
+        try:
+            # Index and embedding come from the same published models
+            with self.model_manager.model_lock:
+                index = self.model_manager.faiss_index
+                query_emb = self.model_manager.get_embedding(idx)
+            sim_scores, indices = index.search(query_emb, top_n + 10)
+            
+            base_listing = listings[idx]
+            results = []
+            
+            for i, candidate_idx in enumerate(indices[0]):
+                # Skip the base listing itself, padding (-1) when the index
+                # returns fewer than k hits, and vectors of listings deleted
+                # since the index was built
+                if candidate_idx == idx or candidate_idx < 0 or candidate_idx >= len(listings):
+                    continue
+                
+                # Apply sector filter if enabled
+                if sector_filter and listings[candidate_idx].get('sector') != base_listing.get('sector'):
+                    continue
+                
+                result = listings[candidate_idx].copy()
+                result["similarity_score"] = float(sim_scores[0][i])
+                results.append(result)
+                
+                if len(results) >= top_n:
+                    break
+            
+            self.recommend_cache.put(key, results)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Recommendation failed: {e}", exc_info=True)
+            return []
+    
+    def autocomplete(self, query: str, max_suggestions: int = 8) -> List[Dict[str, str]]:
+        """
+        Generate autocomplete suggestions based on a partial query.
+        
+        This method looks up listing titles, sectors, and tags containing a word
+        that starts with the query string (see _build_autocomplete_index) and
+        returns them as autocomplete suggestions, in listing order.
+        
+        Args:
+            query (str): Partial query string to autocomplete.
+            max_suggestions (int, optional): Maximum number of suggestions to return.
+                Defaults to 8.
+        
+        Returns:
+            List[Dict]: List of suggestion dictionaries, each containing:
+                - text: The suggestion text
+                - type: Field type ('title', 'sector', or 'tags')
+                - category: The sector of the listing
+        
+        Example:
+            >>> suggestions = service.autocomplete("cof", max_suggestions=5)
+            >>> for suggestion in suggestions:
+            ...     print(f"{suggestion['text']} ({suggestion['type']})")
+            Coffee Shop (title)
+            Coffee & Beverages (sector)
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+        
+        # Typing users repeat the same prefixes; memoize them per (prefix, max)
+        key = (self.version, query, max_suggestions)
+        suggestions = self.autocomplete_cache.get(key)
+        if suggestions is None:
+            trie, all_suggestions = self._autocomplete
+            if trie is None:
+                return []
+            positions = _smallest_distinct(
+                (position for _, (position,) in trie.iteritems(query)), max_suggestions
+            )
+            suggestions = [all_suggestions[position] for position in positions]
+            self.autocomplete_cache.put(key, suggestions)
+        return suggestions
@@ -1,11 +1,12 @@
-"""
-Utility modules for the Semantic Search API.
-
-This package contains various utility functions and decorators used throughout
-the application, including logging and timing utilities.
-"""
-
-from .logging import setup_logging, get_logger
-from .timing import timing_decorator
-
-__all__ = ['setup_logging', 'get_logger', 'timing_decorator']
+"""
+Utility modules for the Semantic Search API.
+
+This package contains various utility functions and decorators used throughout
+the application, including logging, timing and JSON serialization utilities.
+"""
+
+from .logging import setup_logging, get_logger
+from .timing import timing_decorator, now_iso
+from .serialization import ojsonify, OrjsonProvider
+
+__all__ = ['setup_logging', 'get_logger', 'timing_decorator', 'now_iso', 'ojsonify', 'OrjsonProvider']
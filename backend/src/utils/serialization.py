@@ -0,0 +1,71 @@
+"""
+JSON Serialization Utilities Module
+
+This module provides the JSON response helper used by all API endpoints.
+Responses are encoded with orjson, which is considerably faster than the
+stdlib encoder behind Flask's jsonify and natively handles NumPy values
+and datetimes.
+
+Functions:
+    ojsonify: Build a JSON Flask response with orjson.
+
+Classes:
+    OrjsonProvider: Flask JSON provider backed by orjson, so jsonify(),
+        request.get_json() and Flask's own JSON responses use it too.
+
+Example:
+    >>> from backend.src.utils.serialization import ojsonify
+    >>> return ojsonify({"status": "ok"})
+    >>> return ojsonify({"error": "Not found"}, 404)
+"""
+
+import orjson
+from typing import Any
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+# NumPy arrays/scalars are serialized as-is; naive datetimes are treated as UTC
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+def ojsonify(obj: Any, status: int = 200) -> Response:
+    """
+    Serialize an object to a JSON response using orjson.
+    
+    Drop-in replacement for flask.jsonify for a single object.
+    
+    Args:
+        obj (Any): JSON-serializable object (dicts, lists, NumPy values, datetimes).
+        status (int, optional): HTTP status code. Defaults to 200.
+    
+    Returns:
+        Response: Flask response with an application/json body.
+    """
+    return Response(orjson.dumps(obj, option=ORJSON_OPTIONS), status=status, mimetype='application/json')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using orjson.
+    
+    Install with `app.json = OrjsonProvider(app)`. Types orjson does not
+    handle natively fall back to Flask's default conversions (Decimal,
+    objects with __html__). Non-string dict keys are allowed, as with the
+    stdlib encoder.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string."""
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response, as flask.jsonify() does."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_NON_STR_KEYS),
+            mimetype=self.mimetype
+        )
@@ -1,57 +1,87 @@
-"""
-Timing and Performance Utilities Module
-
-This module provides decorators and utilities for measuring function execution time
-and monitoring application performance.
-
-Functions:
-    timing_decorator: Decorator to measure and log function execution time.
-
-Example:
-    >>> from backend.src.utils.timing import timing_decorator
-    >>> @timing_decorator
-    ... def slow_function():
-    ...     time.sleep(1)
-    >>> slow_function()  # Logs: "slow_function took 1.000s"
-"""
-
-import time
-import logging
-from functools import wraps
-
-logger = logging.getLogger(__name__)
-
-
-def timing_decorator(f):
-    """
-    Decorator to measure and log the execution time of a function.
-    
-    This decorator wraps a function and logs the time it takes to execute,
-    which is useful for performance monitoring and optimization.
-    
-    Args:
-        f (callable): The function to be timed.
-    
-    Returns:
-        callable: Wrapped function that logs its execution time.
-        
-    Example:
-        >>> @timing_decorator
-        ... def process_data(data):
-        ...     # Process data
-        ...     return result
-        >>> result = process_data(my_data)
-        # Logs: "process_data took 0.123s"
-        
-    Note:
-        The timing includes the entire function execution, including any
-        nested function calls.
-    """
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = f(*args, **kwargs)
-        duration = time.time() - start
-        logger.info(f"{f.__name__} took {duration:.3f}s")
-        return result
-    return wrapper
+"""
+Timing and Performance Utilities Module
+
+This module provides decorators and utilities for measuring function execution time
+and monitoring application performance.
+
+Functions:
+    timing_decorator: Decorator to measure and log function execution time.
+    now_iso: Current UTC time as an ISO 8601 string, cached per second.
+
+Example:
+    >>> from backend.src.utils.timing import timing_decorator
+    >>> @timing_decorator
+    ... def slow_function():
+    ...     time.sleep(1)
+    >>> slow_function()  # Logs: "slow_function took 1.000s"
+"""
+
+import time
+import logging
+from functools import wraps
+from datetime import datetime, UTC
+
+logger = logging.getLogger(__name__)
+
+# (epoch second, formatted timestamp) of the last now_iso() call
+_iso_cache = (0, '')
+
+
+def now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string with second resolution.
+    
+    The formatted string is cached and only regenerated when the second
+    changes, so response timestamps cost one time.time() call. The cache
+    is replaced as a single tuple, so concurrent threads never see a torn
+    value.
+    
+    Returns:
+        str: Timestamp such as '2024-01-01T12:00:00+00:00'.
+    """
+    global _iso_cache
+    second = int(time.time())
+    cached = _iso_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, UTC).isoformat())
+        _iso_cache = cached
+    return cached[1]
+
+
+def timing_decorator(f):
+    """
+    Decorator to measure and log the execution time of a function.
+    
+    This decorator wraps a function and logs the time it takes to execute,
+    which is useful for performance monitoring and optimization.
+    
+    Args:
+        f (callable): The function to be timed.
+    
+    Returns:
+        callable: Wrapped function that logs its execution time.
+        
+    Example:
+        >>> @timing_decorator
+        ... def process_data(data):
+        ...     # Process data
+        ...     return result
+        >>> result = process_data(my_data)
+        # Logs: "process_data took 0.123s"
+        
+    Note:
+        The timing includes the entire function execution, including any
+        nested function calls. When INFO logging is disabled the function
+        is called without timing it.
+    """
+    name = f.__name__
+    
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not logger.isEnabledFor(logging.INFO):
+            return f(*args, **kwargs)
+        start = time.perf_counter()
+        result = f(*args, **kwargs)
+        logger.info("%s took %.3fs", name, time.perf_counter() - start)
+        return result
+    return wrapper
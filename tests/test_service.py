@@ -1,52 +1,288 @@
-import pytest
-import os, sys
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from services.search_service import SearchService
-from services.data_service import DataService
-from models.model_manager import ModelManager
-from config import config
-
-@pytest.fixture
-def data_service():
-    """Initialize data service"""
-    return DataService(config.DATA_PATH)
-
-@pytest.fixture
-def model_manager(data_service):
-    """Initialize model manager"""
-    mm = ModelManager()
-    texts = data_service.get_all_texts()
-    mm.initialize_models(texts)
-    return mm
-
-@pytest.fixture
-def search_service(model_manager, data_service):
-    """Initialize search service"""
-    return SearchService(model_manager, data_service.listings)
-
-class TestSearchService:
-    """Test search service"""
-    
-    def test_hybrid_search_returns_results(self, search_service):
-        """Test hybrid search returns results"""
-        results = search_service.hybrid_search("pizza", top_n=5)
-        assert isinstance(results, list)
-    
-    def test_hybrid_search_has_scores(self, search_service):
-        """Test results have similarity scores"""
-        results = search_service.hybrid_search("pizza", top_n=1)
-        
-        if len(results) > 0:
-            result = results[0]
-            assert 'similarity_score' in result
-            assert 'semantic_score' in result
-            assert 'keyword_score' in result
-    
-    def test_get_recommendations(self, search_service):
-        """Test recommendations"""
-        if len(search_service.listings) > 1:
-            listing_id = search_service.listings[0]['id']
-            results = search_service.get_recommendations(listing_id, top_n=5)
-            assert isinstance(results, list)
+import pytest
+import os, sys, json, threading, time, zlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import faiss
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+
+from backend.src.services.search_service import SearchService, _top_k
+from backend.src.services.data_service import DataService
+from backend.src.services.encoder_service import EncoderService
+from backend.src.services.query_batcher import QueryBatcher
+from backend.src.models.model_manager import ModelManager, TFIDF_HASHING_PARAMS
+from backend.src.core.config import config
+
+@pytest.fixture
+def data_service():
+    """Initialize data service"""
+    ds = DataService(config.DATA_PATH)
+    ds.load_data()
+    return ds
+
+@pytest.fixture
+def model_manager(data_service):
+    """Initialize model manager"""
+    mm = ModelManager()
+    texts = data_service.get_all_texts()
+    mm.initialize_models(texts)
+    return mm
+
+@pytest.fixture
+def search_service(model_manager, data_service):
+    """Initialize search service"""
+    return SearchService(model_manager, data_service.listings)
+
+class TestSearchService:
+    """Test search service"""
+
+    def test_hybrid_search_returns_results(self, search_service):
+        """Test hybrid search returns results"""
+        results = search_service.hybrid_search("pizza", top_n=5)
+        assert isinstance(results, list)
+
+    def test_hybrid_search_has_scores(self, search_service):
+        """Test results have similarity scores"""
+        results = search_service.hybrid_search("pizza", top_n=1)
+
+        if len(results) > 0:
+            result = results[0]
+            assert 'similarity_score' in result
+            assert 'semantic_score' in result
+            assert 'keyword_score' in result
+
+    def test_get_recommendations(self, search_service):
+        """Test recommendations"""
+        if len(search_service.listings) > 1:
+            listing_id = search_service.listings[0]['id']
+            results = search_service.get_recommendations(listing_id, top_n=5)
+            assert isinstance(results, list)
+
+
+# Unit tests below use small in-memory models instead of USE and a trained index
+
+SAMPLE_LISTINGS = [
+    {"id": 1, "title": "Bean Coffee", "sector": "Food & Beverage", "description": "coffee and pastries",
+     "location": "London", "tags": ["coffee"]},
+    {"id": 2, "title": "Corner Shop", "sector": "Retail", "description": "groceries and coffee beans",
+     "location": "Chennai", "tags": ["groceries"]},
+    {"id": 3, "title": "Pizza Place", "sector": "Food & Beverage", "description": "wood fired pizza",
+     "location": "New York", "tags": ["pizza"]},
+    {"id": 4, "title": "Book Nook", "sector": "Retail", "description": "books and coffee corner",
+     "location": "London", "tags": ["books", "coffee"]},
+    {"id": 5, "title": "Fit Gym", "sector": "Fitness", "description": "gym and yoga classes",
+     "location": "Chennai", "tags": ["gym"]},
+    {"id": 6, "title": "Toy Store", "sector": "Retail", "description": "toys for kids",
+     "location": "New York", "tags": ["kids"]},
+]
+
+
+def _embed(texts):
+    """Bag-of-words hash embedding standing in for USE (deterministic, 64-d)."""
+    out = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in str(text).lower().split():
+            out[row, zlib.crc32(word.encode()) % 64] += 1.0
+    return out
+
+
+class _Tensor:
+    def __init__(self, array):
+        self.array = array
+
+    def numpy(self):
+        return self.array
+
+
+class _StubModelManager:
+    """The parts of ModelManager that SearchService uses, over small in-memory models."""
+
+    def __init__(self, texts, monkeypatch):
+        monkeypatch.setattr(config, 'TFIDF_N_FEATURES', 2 ** 12)
+        self.model_lock = threading.Lock()
+        self.use_model = lambda batch: _Tensor(_embed(batch))
+        self.tfidf_vectorizer = ModelManager._fit_tfidf(texts)
+        self.embeddings = _embed(texts)
+        faiss.normalize_L2(self.embeddings)
+        self.faiss_index = faiss.IndexFlatIP(self.embeddings.shape[1])
+        self.faiss_index.add(self.embeddings)
+
+    def get_search_index(self):
+        return self.faiss_index
+
+    def get_embedding(self, idx):
+        return self.embeddings[idx:idx + 1].copy()
+
+
+@pytest.fixture
+def local_data(tmp_path):
+    """DataService over a temporary copy of SAMPLE_LISTINGS"""
+    path = tmp_path / 'dataset.json'
+    path.write_text(json.dumps(SAMPLE_LISTINGS))
+    ds = DataService(str(path))
+    assert ds.load_data()
+    return ds
+
+@pytest.fixture
+def local_search(local_data, monkeypatch):
+    """SearchService over local_data with stub models"""
+    return SearchService(_StubModelManager(local_data.get_all_texts(), monkeypatch), local_data.listings)
+
+
+class TestMicroBatching:
+    """Test query batching and encoding"""
+
+    def test_concurrent_queries_are_coalesced(self):
+        """Queries arriving while a batch runs are searched together, each gets its own row"""
+        batch_sizes = []
+
+        def search_fn(xq, k):
+            batch_sizes.append(len(xq))
+            time.sleep(0.05)
+            indices = xq[:, :1].astype(np.int64) + np.arange(k)
+            return indices.astype(np.float32), indices
+
+        batcher = QueryBatcher(search_fn, max_batch_size=16, max_wait_ms=20)
+        results = {}
+
+        def run(i):
+            results[i] = batcher.search(np.array([i, 0], dtype=np.float32), k=1 + i % 3)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(batch_sizes) == 8
+        assert max(batch_sizes) > 1
+        for i, (distances, indices) in results.items():
+            assert indices.shape == (1, 1 + i % 3)
+            assert indices[0, 0] == i
+
+    def test_lone_query_is_not_delayed(self):
+        """A single queued query does not wait for the batch window"""
+        batcher = QueryBatcher(lambda xq, k: (np.zeros((len(xq), k)), np.zeros((len(xq), k))), max_wait_ms=2000)
+        start = time.monotonic()
+        batcher.search(np.zeros(4, dtype=np.float32), k=1)
+        assert time.monotonic() - start < 1.0
+
+    def test_errors_reach_every_caller(self):
+        """An encoder failure is raised in every request of the batch"""
+        def encode_fn(texts):
+            time.sleep(0.05)
+            raise RuntimeError("encoder down")
+
+        encoder = EncoderService(encode_fn, max_wait_ms=20)
+        errors = []
+
+        def run():
+            try:
+                encoder.encode("coffee")
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
+
+    def test_encoder_returns_rows(self):
+        """Each text gets its own (1, d) float32 row"""
+        encoder = EncoderService(lambda texts: np.arange(len(texts) * 3).reshape(len(texts), 3))
+        embedding = encoder.encode("coffee")
+        assert embedding.shape == (1, 3)
+        assert embedding.dtype == np.float32
+
+
+class TestRanking:
+    """Test keyword model and top-k selection"""
+
+    def test_hashed_tfidf_matches_sklearn_pipeline(self, monkeypatch):
+        """HashedTfidf gives the same rows as HashingVectorizer + TfidfTransformer"""
+        monkeypatch.setattr(config, 'TFIDF_N_FEATURES', 2 ** 12)
+        texts = [f"{listing['title']} {listing['description']}" for listing in SAMPLE_LISTINGS]
+        model = ModelManager._fit_tfidf(texts)
+        pipeline = Pipeline([
+            ('hashing', HashingVectorizer(
+                n_features=2 ** 12,
+                ngram_range=tuple(TFIDF_HASHING_PARAMS['ngram_range']),
+                stop_words=TFIDF_HASHING_PARAMS['stop_words'],
+                lowercase=TFIDF_HASHING_PARAMS['lowercase'],
+                alternate_sign=False,
+                norm=None
+            )),
+            ('tfidf', TfidfTransformer())
+        ]).fit(texts)
+
+        queries = texts + ["coffee corner", "unknown words only"]
+        np.testing.assert_allclose(
+            model.transform(queries).toarray(), pipeline.transform(queries).toarray(), atol=1e-6
+        )
+
+    def test_top_k_breaks_ties_by_index(self):
+        """_top_k matches a stable descending argsort, ties included"""
+        scores = np.array([0.5, 0.9, 0.5, 0.1, 0.9, 0.5, 0.0, 0.5], dtype=np.float32)
+        expected = np.argsort(-scores, kind='stable')
+        for k in range(len(scores) + 2):
+            assert _top_k(scores, k).tolist() == expected[:k].tolist()
+
+
+class TestSearchConsistency:
+    """Test caching and filtering against a changing catalog"""
+
+    def test_refresh_invalidates_cached_results(self, local_data, local_search):
+        """Cached results are not served after the listings change"""
+        first = local_search.search("coffee", top_n=10)
+        assert local_search.search("coffee", top_n=10) is first
+
+        version = local_search.version
+        local_data.add_listing({"title": "Coffee Cart", "sector": "Food & Beverage",
+                                "description": "coffee to go"}, persist=False)
+        local_search.refresh(local_data.listings)
+
+        assert local_search.version == version + 1
+        refreshed = local_search.search("coffee", top_n=10)
+        assert refreshed is not first
+        assert "Coffee Cart" in [result["title"] for result in refreshed]
+
+    def test_search_normalizes_query(self, local_search):
+        """Spellings that share a cache entry get the same results"""
+        results = local_search.search("  Coffee   CORNER ")
+        assert local_search.search("coffee corner") is results
+
+    def test_filter_mask_after_delete(self, local_data, local_search):
+        """Filtered searches stay correct between a delete and the next refresh"""
+        local_data.delete_listing(1, persist=False)
+
+        mask_listings, mask = local_data.filter_listings(sector="retail")
+        results = local_search.search("coffee", top_n=10, mask=mask,
+                                      filters_key=(local_data.version, "retail"), mask_listings=mask_listings)
+        assert results
+        assert all(result["sector"] == "Retail" for result in results)
+        assert 1 not in [result["id"] for result in results]
+
+        local_search.refresh(local_data.listings)
+        mask_listings, mask = local_data.filter_listings(sector="food & beverage")
+        results = local_search.search("coffee", top_n=10, mask=mask,
+                                      filters_key=(local_data.version, "food & beverage"), mask_listings=mask_listings)
+        assert [result["id"] for result in results] == [3]
+
+    def test_empty_filter_returns_nothing(self, local_data, local_search):
+        """A filter that matches no listing returns no results"""
+        mask_listings, mask = local_data.filter_listings(sector="mining")
+        assert local_search.search("coffee", mask=mask, mask_listings=mask_listings) == []
+
+    def test_autocomplete_in_listing_order(self, local_data, local_search):
+        """Suggestions are the first matches in listing order, and follow refreshes"""
+        assert [s["text"] for s in local_search.autocomplete("co", max_suggestions=2)] == ["Bean Coffee", "coffee"]
+        assert len(local_search.autocomplete("co", max_suggestions=1)) == 1
+
+        local_data.delete_listing(1, persist=False)
+        local_search.refresh(local_data.listings)
+        assert "Bean Coffee" not in [s["text"] for s in local_search.autocomplete("co")]